@@ -0,0 +1,57 @@
+"""
+Client construction benchmark
+
+Measures the time and memory needed to construct ``OpenPaymentsClient``
+instances, e.g. one per tenant.
+
+    python -m benchmarks.bench_client
+"""
+import tracemalloc
+
+from benchmarks.harness import run_cases
+from open_payments_sdk.client.client import OpenPaymentsClient
+from open_payments_sdk.gnap_utils.keys import KeyManager
+
+
+def _client_kwargs() -> dict:
+    key_pair = KeyManager().generate_key_pair()
+    return {
+        "keyid": key_pair.jwks.keys[0].kid,
+        "private_key": key_pair.private_key_pem,
+        "client_wallet_address": "https://ilp.interledger-test.dev/tenant"
+    }
+
+
+def client_construction():
+    """
+    Construct a client
+    """
+    kwargs = _client_kwargs()
+    return lambda: OpenPaymentsClient(**kwargs)
+
+
+def bytes_per_client(clients: int = 200) -> float:
+    """
+    Return Python heap bytes retained per constructed client
+    """
+    kwargs = _client_kwargs()
+    OpenPaymentsClient(**kwargs)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    retained = [OpenPaymentsClient(**kwargs) for _ in range(clients)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del retained
+    return size / clients
+
+
+CASES = {
+    "client_construction": client_construction,
+}
+
+
+if __name__ == "__main__":
+    for name, rate in run_cases(CASES).items():
+        print(f"{name}: {rate:,.0f} ops/s")
+    print(f"memory: {bytes_per_client():,.0f} bytes/client")
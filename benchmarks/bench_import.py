@@ -0,0 +1,51 @@
+"""
+Import time benchmarks
+
+Each call imports a client module in a fresh interpreter, so rates are cold
+imports per second including interpreter startup. The main block also prints
+the modules with the largest cumulative import time, as reported by
+``python -X importtime``.
+
+    python -m benchmarks.bench_import
+"""
+import subprocess
+import sys
+from typing import Dict
+
+from benchmarks.harness import run_cases
+
+
+def import_times(module: str) -> Dict[str, int]:
+    """
+    Return the cumulative import time of every module imported by module, in microseconds
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or line.endswith("| imported package"):
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def _cold_import(module: str):
+    command = [sys.executable, "-c", f"import {module}"]
+    return lambda: subprocess.run(command, check=True)
+
+
+CASES = {
+    "import_client": lambda: _cold_import("open_payments_sdk.client.client"),
+    "import_async_client": lambda: _cold_import("open_payments_sdk.client.async_client"),
+}
+
+
+if __name__ == "__main__":
+    for name, rate in run_cases(CASES).items():
+        print(f"{name}: {1000 / rate:,.0f} ms/import")
+    times = import_times("open_payments_sdk.client.client")
+    for module, micros in sorted(times.items(), key=lambda item: item[1], reverse=True)[:15]:
+        print(f"{micros / 1000:8.1f} ms  {module}")
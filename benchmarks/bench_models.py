@@ -0,0 +1,59 @@
+"""
+Model validation benchmarks
+
+The ``parse_*`` cases compare the response parsing modes of ``ResponseParser``
+on a page of 100 incoming payments, consuming every item, or only the first
+ten in the ``_first_10`` cases. The union cases validate and dump the
+discriminated union models, choosing members that come last in their union.
+
+    python -m benchmarks.bench_models
+"""
+import httpx
+
+from benchmarks.harness import run_cases
+from benchmarks.payloads import (GRANT, INCOMING_PAYMENTS_PAGE, INTERACTIVE_GRANT,
+                                 OUTGOING_PAYMENT, OUTGOING_PAYMENT_REQUEST, QUOTE,
+                                 QUOTE_REQUEST)
+from open_payments_sdk.models.auth import Grant
+from open_payments_sdk.models.resource import (OutgoingPayment, OutgoingPaymentRequest,
+                                               PaginatedIncomingPayments, Quote,
+                                               QuoteRequest)
+from open_payments_sdk.utils.parsing import ResponseParser
+
+
+def _validate(model, payload):
+    return lambda: model.model_validate(payload)
+
+
+def _dump(model, payload):
+    instance = model.model_validate(payload)
+    return lambda: instance.model_dump(exclude_unset=True, mode="json")
+
+
+def _parse_page(items=None, **options):
+    parser = ResponseParser(**options)
+    response = httpx.Response(200, json=INCOMING_PAYMENTS_PAGE)
+    return lambda: list(parser.parse_page(PaginatedIncomingPayments, response).result[:items])
+
+
+CASES = {
+    "validate_grant": lambda: _validate(Grant, GRANT),
+    "validate_quote": lambda: _validate(Quote, QUOTE),
+    "validate_outgoing_payment": lambda: _validate(OutgoingPayment, OUTGOING_PAYMENT),
+    "validate_incoming_payments_page": lambda: _validate(PaginatedIncomingPayments, INCOMING_PAYMENTS_PAGE),
+    "validate_interactive_grant": lambda: _validate(Grant, INTERACTIVE_GRANT),
+    "validate_quote_request": lambda: _validate(QuoteRequest, QUOTE_REQUEST),
+    "validate_outgoing_payment_request": lambda: _validate(OutgoingPaymentRequest, OUTGOING_PAYMENT_REQUEST),
+    "dump_outgoing_payment_request": lambda: _dump(OutgoingPaymentRequest, OUTGOING_PAYMENT_REQUEST),
+    "parse_page_default": lambda: _parse_page(),
+    "parse_page_fast": lambda: _parse_page(fast=True),
+    "parse_page_fast_lazy": lambda: _parse_page(fast=True, lazy_pages=True),
+    "parse_page_fast_trusted": lambda: _parse_page(fast=True, trust_urls=True),
+    "parse_page_fast_first_10": lambda: _parse_page(10, fast=True),
+    "parse_page_fast_lazy_first_10": lambda: _parse_page(10, fast=True, lazy_pages=True),
+}
+
+
+if __name__ == "__main__":
+    for name, rate in run_cases(CASES).items():
+        print(f"{name}: {rate:,.0f} ops/s")
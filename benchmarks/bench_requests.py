@@ -0,0 +1,210 @@
+"""
+End-to-end request benchmarks against the bundled stub server
+
+    python -m benchmarks.bench_requests
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from benchmarks.harness import run_cases
+from open_payments_sdk.client.client import OpenPaymentsClient
+from open_payments_sdk.configuration import Configuration
+from open_payments_sdk.gnap_utils.keys import KeyManager
+from open_payments_sdk.models.auth import GrantRequest
+from open_payments_sdk.models.pipeline import PaymentIntent
+from open_payments_sdk.models.resource import OutgoingPaymentRequest, QuoteRequest
+from open_payments_sdk.testing.stub_server import StubOpenPaymentsServer
+from open_payments_sdk.utils.instrumentation import Instrumentation
+
+
+class _RoundTrip:
+    """
+    Create one outgoing payment per call: build, digest, sign, send and parse.
+    The stub verifies every signature, so its cost is included
+    """
+    def __init__(self, instrumentation: Optional[Instrumentation] = None):
+        key_pair = KeyManager().generate_key_pair()
+        self.server = StubOpenPaymentsServer()
+        self.server.serve()
+        sender = self.server.add_wallet_address("sender", jwks=key_pair.jwks)
+        cfg = Configuration()
+        cfg.instrumentation = instrumentation
+        self.client = OpenPaymentsClient(
+            keyid=key_pair.jwks.keys[0].kid,
+            private_key=key_pair.private_key_pem,
+            client_wallet_address=sender,
+            cfg=cfg
+        )
+        grant = self.client.grants.post_grant_request(
+            GrantRequest.model_validate({
+                "access_token": {"access": [
+                    {"type": "quote", "actions": ["create"]},
+                    {"type": "outgoing-payment", "actions": ["create"], "identifier": sender}
+                ]},
+                "client": sender
+            }),
+            self.server.auth_server
+        )
+        self.access_token = grant.root.access_token.value
+        quote = self.client.quotes.post_create_quote(
+            QuoteRequest.model_validate({
+                "walletAddress": sender,
+                "receiver": f"{self.server.resource_server}/incoming-payments/1",
+                "method": "ilp",
+                "debitAmount": {"value": "2500", "assetCode": "USD", "assetScale": 2}
+            }),
+            self.server.resource_server,
+            self.access_token
+        )
+        self.payment = OutgoingPaymentRequest.model_validate({
+            "walletAddress": sender,
+            "quoteId": str(quote.id),
+            "metadata": {"description": "Thank you for the coffee"}
+        })
+
+    def __call__(self):
+        return self.client.outgoing_payments.post_create_payment(
+            payment=self.payment,
+            resource_server_endpoint=self.server.resource_server,
+            access_token=self.access_token
+        )
+
+    def close(self) -> None:
+        self.client.close()
+        self.server.close()
+
+
+class _GrantRequest:
+    """
+    Request the same non-interactive grant on every call
+    """
+    def __init__(self, grant_cache_size: int = 0):
+        key_pair = KeyManager().generate_key_pair()
+        self.server = StubOpenPaymentsServer()
+        self.server.serve()
+        client_wallet = self.server.add_wallet_address("client", jwks=key_pair.jwks)
+        cfg = Configuration()
+        cfg.grant_cache_size = grant_cache_size
+        self.client = OpenPaymentsClient(
+            keyid=key_pair.jwks.keys[0].kid,
+            private_key=key_pair.private_key_pem,
+            client_wallet_address=client_wallet,
+            cfg=cfg
+        )
+        self.grant_request = GrantRequest.model_validate({
+            "access_token": {"access": [{"type": "quote", "actions": ["create", "read"]}]},
+            "client": client_wallet
+        })
+
+    def __call__(self):
+        return self.client.grants.post_grant_request(self.grant_request, self.server.auth_server)
+
+    def close(self) -> None:
+        self.client.close()
+        self.server.close()
+
+
+class _ConcurrentGet:
+    """
+    Eight threads fetch the same quote per call, with 5 ms of server latency
+    """
+    def __init__(self, coalesce: bool = False, threads: int = 8):
+        key_pair = KeyManager().generate_key_pair()
+        self.server = StubOpenPaymentsServer(latency=0.005)
+        self.server.serve()
+        sender = self.server.add_wallet_address("sender", jwks=key_pair.jwks)
+        cfg = Configuration()
+        cfg.coalesce_requests = coalesce
+        self.client = OpenPaymentsClient(
+            keyid=key_pair.jwks.keys[0].kid,
+            private_key=key_pair.private_key_pem,
+            client_wallet_address=sender,
+            cfg=cfg
+        )
+        grant = self.client.grants.post_grant_request(
+            GrantRequest.model_validate({
+                "access_token": {"access": [{"type": "quote", "actions": ["create", "read"]}]},
+                "client": sender
+            }),
+            self.server.auth_server
+        )
+        self.access_token = grant.root.access_token.value
+        quote = self.client.quotes.post_create_quote(
+            QuoteRequest.model_validate({
+                "walletAddress": sender,
+                "receiver": f"{self.server.resource_server}/incoming-payments/1",
+                "method": "ilp",
+                "debitAmount": {"value": "2500", "assetCode": "USD", "assetScale": 2}
+            }),
+            self.server.resource_server,
+            self.access_token
+        )
+        self.quote_id = str(quote.id).rpartition("/")[2]
+        self.threads = threads
+        self.executor = ThreadPoolExecutor(max_workers=threads)
+
+    def _get(self, _):
+        return self.client.quotes.get_quote(self.quote_id, self.server.resource_server, self.access_token)
+
+    def __call__(self):
+        return list(self.executor.map(self._get, range(self.threads)))
+
+    def close(self) -> None:
+        self.executor.shutdown()
+        self.client.close()
+        self.server.close()
+
+
+class _Pipeline:
+    """
+    Send 20 payment intents per call through the payment pipeline, with 5 ms of
+    server latency per request. Sequential runs one intent and one request at a time
+    """
+    def __init__(self, sequential: bool = False, intents: int = 20):
+        key_pair = KeyManager().generate_key_pair()
+        self.server = StubOpenPaymentsServer(latency=0.005, continue_wait=0)
+        self.server.serve()
+        cfg = Configuration()
+        cfg.grant_cache_size = 16
+        if sequential:
+            cfg.pipeline_stage_concurrency = {"wallets": 1, "incoming_payment": 1, "quote": 1, "outgoing_grant": 1, "outgoing_payment": 1}
+            cfg.pipeline_max_in_flight = 1
+        self.client = OpenPaymentsClient(
+            keyid=key_pair.jwks.keys[0].kid,
+            private_key=key_pair.private_key_pem,
+            client_wallet_address=self.server.add_wallet_address("client", jwks=key_pair.jwks),
+            cfg=cfg
+        )
+        sender = self.server.add_wallet_address("sender")
+        receiver = self.server.add_wallet_address("receiver")
+        self.intents = [
+            PaymentIntent(sender=sender, receiver=receiver, amount={"value": "100", "assetCode": "USD", "assetScale": 2})
+            for _ in range(intents)
+        ]
+
+    def _interact(self, intent, grant):
+        self.server.approve_grant(str(grant.cont.uri))
+
+    def __call__(self):
+        return self.client.pipeline.run(self.intents, self._interact)
+
+    def close(self) -> None:
+        self.client.close()
+        self.server.close()
+
+
+CASES = {
+    "post_create_payment_round_trip": _RoundTrip,
+    "post_create_payment_round_trip_instrumented": lambda: _RoundTrip(Instrumentation(hooks=[lambda call: None])),
+    "post_grant_request": _GrantRequest,
+    "post_grant_request_cached": lambda: _GrantRequest(grant_cache_size=16),
+    "get_quote_concurrent": _ConcurrentGet,
+    "get_quote_concurrent_coalesced": lambda: _ConcurrentGet(coalesce=True),
+    "payment_pipeline_sequential": lambda: _Pipeline(sequential=True),
+    "payment_pipeline": _Pipeline,
+}
+
+
+if __name__ == "__main__":
+    for name, rate in run_cases(CASES).items():
+        print(f"{name}: {rate:,.0f} ops/s")
@@ -0,0 +1,152 @@
+"""
+Signing benchmarks
+
+Measures ``SecurityBase.sign_request``, ``SecurityBase.set_content_digest`` and
+building complete signed requests, including the memory allocated per request.
+
+    python -m benchmarks.bench_signing
+"""
+import json
+import logging
+import tempfile
+
+from benchmarks.harness import peak_allocation, run_cases
+from benchmarks.payloads import OUTGOING_PAYMENT_REQUEST, RESOURCE_SERVER, WALLET_ADDRESS
+from open_payments_sdk.client.client import OpenPaymentsClient
+from open_payments_sdk.gnap_utils.keys import KeyManager
+from open_payments_sdk.gnap_utils.security import SecurityBase
+from open_payments_sdk.http import HttpClient
+from open_payments_sdk.models.resource import OutgoingPaymentRequest
+from open_payments_sdk.utils.utils import get_default_covered_components, get_default_headers
+
+
+def _security() -> SecurityBase:
+    key_pair = KeyManager().generate_key_pair()
+    return SecurityBase(
+        keyid=key_pair.jwks.keys[0].kid,
+        private_key=key_pair.private_key_pem,
+        logger=logging.getLogger(__name__)
+    )
+
+
+def sign_request():
+    """
+    Sign a GET request covering the authorization header
+    """
+    security = _security()
+    covered_components = ("authorization", *get_default_covered_components())
+    request = HttpClient(http_timeout=10.0).build_request(
+        method="GET",
+        url=f"{RESOURCE_SERVER}/quotes/1",
+        headers=security.get_auth_header(access_token="token")
+    )
+    return lambda: security.sign_request(request, covered_components)
+
+
+def set_content_digest():
+    """
+    Compute the Content-Digest of an outgoing payment request body
+    """
+    security = _security()
+    body = json.loads(json.dumps(OUTGOING_PAYMENT_REQUEST))
+    request = HttpClient(http_timeout=10.0).build_request(
+        method="POST",
+        url=f"{RESOURCE_SERVER}/outgoing-payments",
+        json=body,
+        headers=get_default_headers()
+    )
+    return lambda: security.set_content_digest(request)
+
+
+def _client() -> OpenPaymentsClient:
+    key_pair = KeyManager().generate_key_pair()
+    return OpenPaymentsClient(
+        keyid=key_pair.jwks.keys[0].kid,
+        private_key=key_pair.private_key_pem,
+        client_wallet_address=WALLET_ADDRESS
+    )
+
+
+def build_create_outgoing_payment():
+    """
+    Build a signed outgoing payment creation request: body, digest and signature
+    """
+    outgoing_payments = _client().outgoing_payments
+    payment = OutgoingPaymentRequest.model_validate(OUTGOING_PAYMENT_REQUEST)
+    return lambda: outgoing_payments._build_create_payment(payment, RESOURCE_SERVER, "token")
+
+
+def build_create_outgoing_payment_unsigned():
+    """
+    Build an unsigned outgoing payment creation request: body encoding and digest only
+    """
+    outgoing_payments = _client().outgoing_payments
+    payment = OutgoingPaymentRequest.model_validate(OUTGOING_PAYMENT_REQUEST)
+    return lambda: outgoing_payments._build_create_payment(payment, RESOURCE_SERVER, "token", sign=False)
+
+
+def build_get_quote():
+    """
+    Build a signed quote lookup request
+    """
+    quotes = _client().quotes
+    return lambda: quotes._build_get_quote("ab03296b-0c8b-4776-b94e-7ee27d868d4d", RESOURCE_SERVER, "token")
+
+
+_UPLOAD = json.dumps({"metadata": [{"line": i, "memo": "x" * 100} for i in range(8000)]}).encode("utf-8")
+
+
+def _upload_file():
+    fileobj = tempfile.TemporaryFile()
+    fileobj.write(_UPLOAD)
+    fileobj.seek(0)
+    return fileobj
+
+
+def _upload_template():
+    grants = _client().grants
+    template = grants._template(
+        "upload", RESOURCE_SERVER, "POST", "/metadata",
+        ("content-type", "content-digest", "content-length", "@method", "@target-uri")
+    )
+    return grants, template
+
+
+def build_buffered_upload():
+    """
+    Build a signed request for a ~1 MB file read into memory first
+    """
+    grants, template = _upload_template()
+    fileobj = _upload_file()
+
+    def build():
+        fileobj.seek(0)
+        return template.build(grants, content=fileobj.read())
+    return build
+
+
+def build_streamed_upload():
+    """
+    Build a signed request streaming a ~1 MB body from a file, hashed in chunks
+    """
+    grants, template = _upload_template()
+    fileobj = _upload_file()
+    return lambda: template.build(grants, content=fileobj)
+
+
+CASES = {
+    "sign_request": sign_request,
+    "set_content_digest": set_content_digest,
+    "build_create_outgoing_payment": build_create_outgoing_payment,
+    "build_create_outgoing_payment_unsigned": build_create_outgoing_payment_unsigned,
+    "build_get_quote": build_get_quote,
+    "build_buffered_upload": build_buffered_upload,
+    "build_streamed_upload": build_streamed_upload,
+}
+
+
+if __name__ == "__main__":
+    for name, rate in run_cases(CASES).items():
+        print(f"{name}: {rate:,.0f} ops/s")
+    for name in ("build_create_outgoing_payment", "build_get_quote", "build_buffered_upload", "build_streamed_upload"):
+        print(f"{name}: {peak_allocation(CASES[name]()):,.0f} bytes allocated at peak per request")
@@ -0,0 +1,66 @@
+"""
+Signing pool benchmark
+
+Signs batches of prepared quote lookups inline and on ``SigningPool`` worker
+processes. Rates are batches per second; the main block prints requests per
+second in total and per worker.
+
+    python -m benchmarks.bench_signing_pool
+"""
+import os
+
+from benchmarks.bench_signing import _client
+from benchmarks.harness import run_cases
+from benchmarks.payloads import RESOURCE_SERVER
+from open_payments_sdk.gnap_utils.signing_pool import SigningPool
+from open_payments_sdk.utils.utils import AUTHORIZED_COMPONENTS
+
+BATCH_SIZE = 256
+
+
+def _prepared():
+    quotes = _client().quotes
+    requests = [quotes._build_get_quote(str(i), RESOURCE_SERVER, "token") for i in range(BATCH_SIZE)]
+    return quotes, requests
+
+
+def sign_batch_inline():
+    """
+    Sign a batch in the calling thread
+    """
+    quotes, requests = _prepared()
+    template = quotes._templates[("get", RESOURCE_SERVER)]
+    return lambda: [template.sign(request, quotes.signing_context) for request in requests]
+
+
+class _PoolSign:
+    def __init__(self, workers: int):
+        quotes, self.requests = _prepared()
+        self.pool = SigningPool(quotes.signing_context, workers=workers)
+        self.pool.sign(self.requests, AUTHORIZED_COMPONENTS)
+
+    def __call__(self):
+        return self.pool.sign(self.requests, AUTHORIZED_COMPONENTS)
+
+    def close(self):
+        self.pool.close()
+
+
+def sign_batch_pool():
+    """
+    Sign a batch on one worker process per core
+    """
+    return _PoolSign(os.cpu_count() or 1)
+
+
+CASES = {
+    "sign_batch_inline": sign_batch_inline,
+    "sign_batch_pool": sign_batch_pool,
+}
+
+
+if __name__ == "__main__":
+    cores = os.cpu_count() or 1
+    for name, rate in run_cases(CASES).items():
+        workers = cores if name == "sign_batch_pool" else 1
+        print(f"{name}: {rate * BATCH_SIZE:,.0f} req/s, {rate * BATCH_SIZE / workers:,.0f} req/s per core ({workers} cores)")
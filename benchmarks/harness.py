@@ -0,0 +1,119 @@
+"""
+Minimal benchmark harness
+
+Each benchmark case is a function returning a zero-argument operation. The
+harness calls the operation in batches for at least ``min_time`` seconds,
+repeats that ``repeat`` times and keeps the best rate, which is the least
+affected by scheduling noise.
+"""
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict
+
+BASELINE_FILE = "benchmarks/baselines.json"
+
+
+def measure(operation: Callable[[], object], min_time: float = 0.2, repeat: int = 5) -> float:
+    """
+    Return the best observed rate of operation in calls per second
+    """
+    operation()
+    batch = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(batch):
+            operation()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / 10:
+            break
+        batch *= 2
+    best = 0.0
+    for _ in range(repeat):
+        calls = 0
+        start = time.perf_counter()
+        while True:
+            for _ in range(batch):
+                operation()
+            calls += batch
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        best = max(best, calls / elapsed)
+    return best
+
+
+def run_cases(cases: Dict[str, Callable[[], Callable[[], object]]], min_time: float = 0.2) -> Dict[str, float]:
+    """
+    Set up and measure every case, returning calls per second by case name
+    """
+    results = {}
+    for name, setup in cases.items():
+        operation = setup()
+        try:
+            results[name] = measure(operation, min_time=min_time)
+        finally:
+            close = getattr(operation, "close", None)
+            if close is not None:
+                close()
+    return results
+
+
+def peak_allocation(operation: Callable[[], object], calls: int = 200) -> float:
+    """
+    Return the mean peak of Python heap memory allocated while operation runs, in bytes
+    """
+    operation()
+    tracemalloc.start()
+    try:
+        total = 0
+        for _ in range(calls):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            operation()
+            total += tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+    return total / calls
+
+
+def environment() -> dict:
+    """
+    Describe the machine the numbers were taken on
+    """
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "system": platform.system()
+    }
+
+
+def save_baseline(results: Dict[str, float], path: str = BASELINE_FILE) -> None:
+    """
+    Store results as the reference for later comparisons
+    """
+    with open(path, "w", encoding="utf_8") as baseline_file:
+        json.dump({"environment": environment(), "results": results}, baseline_file, indent=2, sort_keys=True)
+        baseline_file.write("\n")
+
+
+def load_baseline(path: str = BASELINE_FILE) -> Dict[str, float]:
+    """
+    Load stored reference results
+    """
+    with open(path, "r", encoding="utf_8") as baseline_file:
+        return json.load(baseline_file)["results"]
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float]) -> Dict[str, float]:
+    """
+    Return the relative change of every case present in both result sets
+    """
+    return {
+        name: results[name] / baseline[name] - 1.0
+        for name in results
+        if name in baseline and baseline[name] > 0
+    }
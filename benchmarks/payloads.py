@@ -0,0 +1,97 @@
+"""
+Representative server responses used by the benchmarks
+"""
+
+RESOURCE_SERVER = "https://ilp.interledger-test.dev"
+WALLET_ADDRESS = f"{RESOURCE_SERVER}/alice"
+
+AMOUNT = {"value": "250", "assetCode": "USD", "assetScale": 2}
+
+GRANT = {
+    "access_token": {
+        "value": "2E6F040D518B6F1A0883",
+        "manage": "https://auth.interledger-test.dev/token/dad85db0-804d-4778-bf78-33eb5f81d86e",
+        "expires_in": 600,
+        "access": [
+            {"type": "incoming-payment", "actions": ["create", "read"], "identifier": WALLET_ADDRESS}
+        ]
+    },
+    "continue": {
+        "access_token": {"value": "3A088F83D39BDCDEC995"},
+        "uri": "https://auth.interledger-test.dev/continue/d2bb7a46-8cd9-4dde-83e2-821353b50579"
+    }
+}
+
+INTERACTIVE_GRANT = {
+    "interact": {
+        "redirect": "https://auth.interledger-test.dev/interact/4CF492MLVMSW9MKMXKHQ/4CF492ML",
+        "finish": "4105340a-05eb-4290-8739-f9e2b463bfa7"
+    },
+    "continue": GRANT["continue"]
+}
+
+QUOTE = {
+    "id": f"{RESOURCE_SERVER}/quotes/ab03296b-0c8b-4776-b94e-7ee27d868d4d",
+    "walletAddress": WALLET_ADDRESS,
+    "receiver": f"{RESOURCE_SERVER}/incoming-payments/37a0d0ee-26dc-4c66-89e0-01fbf93156f7",
+    "receiveAmount": AMOUNT,
+    "debitAmount": {"value": "256", "assetCode": "USD", "assetScale": 2},
+    "method": "ilp",
+    "createdAt": "2022-03-12T23:20:50.52Z",
+    "expiresAt": "2022-04-12T23:20:50.52Z"
+}
+
+OUTGOING_PAYMENT = {
+    "id": f"{RESOURCE_SERVER}/outgoing-payments/8c68d3cc-0a0f-4216-98b4-4fa44a6c88cf",
+    "walletAddress": WALLET_ADDRESS,
+    "quoteId": QUOTE["id"],
+    "failed": False,
+    "receiver": QUOTE["receiver"],
+    "receiveAmount": AMOUNT,
+    "debitAmount": {"value": "256", "assetCode": "USD", "assetScale": 2},
+    "sentAmount": {"value": "0", "assetCode": "USD", "assetScale": 2},
+    "metadata": {"description": "Thank you for the coffee"},
+    "createdAt": "2022-03-12T23:20:50.52Z",
+    "updatedAt": "2022-03-12T23:20:55.52Z"
+}
+
+
+def incoming_payment(index: int) -> dict:
+    """
+    Incoming payment list item
+    """
+    return {
+        "id": f"{RESOURCE_SERVER}/incoming-payments/{index:08d}-26dc-4c66-89e0-01fbf93156f7",
+        "walletAddress": WALLET_ADDRESS,
+        "completed": index % 2 == 0,
+        "incomingAmount": AMOUNT,
+        "receivedAmount": AMOUNT,
+        "expiresAt": "2022-04-12T23:20:50.52Z",
+        "metadata": {"description": f"Invoice {index}"},
+        "createdAt": "2022-03-12T23:20:50.52Z",
+        "updatedAt": "2022-03-12T23:20:55.52Z"
+    }
+
+
+INCOMING_PAYMENTS_PAGE = {
+    "pagination": {
+        "startCursor": "00000000-26dc-4c66-89e0-01fbf93156f7",
+        "endCursor": "00000099-26dc-4c66-89e0-01fbf93156f7",
+        "hasNextPage": True,
+        "hasPreviousPage": False
+    },
+    "result": [incoming_payment(index) for index in range(100)]
+}
+
+OUTGOING_PAYMENT_REQUEST = {
+    "walletAddress": WALLET_ADDRESS,
+    "quoteId": QUOTE["id"],
+    "metadata": {"description": "Thank you for the coffee"}
+}
+
+QUOTE_REQUEST = {
+    "walletAddress": WALLET_ADDRESS,
+    "receiver": QUOTE["receiver"],
+    "method": "ilp",
+    "receiveAmount": AMOUNT
+}
@@ -0,0 +1,55 @@
+"""
+Run the benchmark suite
+
+    python -m benchmarks.run                 # print results
+    python -m benchmarks.run --save          # store them in benchmarks/baselines.json
+    python -m benchmarks.run --compare       # fail on regressions against the baseline
+
+Everything runs offline; round trips go to a stub server on localhost.
+Compare only against baselines recorded on comparable hardware.
+"""
+import argparse
+import sys
+
+from benchmarks import (bench_client, bench_import, bench_models, bench_requests,
+                        bench_signing, bench_signing_pool)
+from benchmarks.harness import (BASELINE_FILE, compare, load_baseline,
+                                run_cases, save_baseline)
+
+SUITES = (bench_signing, bench_signing_pool, bench_models, bench_requests, bench_client, bench_import)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", dest="filter", default="", help="only run cases whose name contains this string")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per measurement round")
+    parser.add_argument("--save", action="store_true", help="store results as the new baseline")
+    parser.add_argument("--compare", action="store_true", help="compare results with the stored baseline")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="baseline file")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown")
+    args = parser.parse_args(argv)
+
+    cases = {}
+    for suite in SUITES:
+        cases.update({name: setup for name, setup in suite.CASES.items() if args.filter in name})
+    results = run_cases(cases, min_time=args.min_time)
+
+    baseline = load_baseline(args.baseline) if args.compare else {}
+    changes = compare(results, baseline)
+    regressions = []
+    for name, rate in results.items():
+        line = f"{name:<36} {rate:>14,.0f} ops/s"
+        if name in changes:
+            line += f"  {changes[name]:+7.1%}"
+            if changes[name] < -args.tolerance:
+                line += "  REGRESSION"
+                regressions.append(name)
+        print(line)
+
+    if args.save:
+        save_baseline(results, args.baseline)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,29 @@
+#!/usr/bin/env bash
+# Regenerate the schema models from the Open Payments OpenAPI specs.
+#
+# Generated classes derive from the deferred bases in models/base.py so that
+# their validators are built on first use. --base-class covers BaseModel
+# classes; datamodel-codegen ignores it for pydantic v2 root models, so the
+# RootModel template in templates/ names DeferredRootModel instead.
+
+set -euo pipefail
+
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+SPEC_DIR="$SCRIPT_DIR/../spec"
+MODELS_DIR="$SCRIPT_DIR/../src/open_payments_sdk/models"
+
+generate() {
+  datamodel-codegen \
+    --input "$SPEC_DIR/$1" \
+    --input-file-type openapi \
+    --output "$MODELS_DIR/$2" \
+    --output-model-type pydantic_v2.BaseModel \
+    --base-class open_payments_sdk.models.base.DeferredModel \
+    --additional-imports open_payments_sdk.models.base.DeferredRootModel \
+    --custom-template-dir "$SCRIPT_DIR/templates" \
+    --disable-timestamp
+}
+
+generate auth-server.yaml auth.py
+generate resource-server.yaml resource.py
+generate wallet-address-server.yaml wallet.py
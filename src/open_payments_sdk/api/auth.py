@@ -2,25 +2,56 @@
 Grants Module
 """
 from logging import Logger
+from typing import Optional
 
-from open_payments_sdk.gnap_utils.security import SecurityBase
-from open_payments_sdk.http import HttpClient
+from httpx import Request
+
+from open_payments_sdk.gnap_utils.security import SecurityBase, SigningContext
+from open_payments_sdk.http import AsyncHttpClient, HttpClient
 from open_payments_sdk.models.auth import AccessToken, Grant
 from open_payments_sdk.models.auth import (GrantContinueResponse, GrantRequest,
                                            InteractRef)
-from open_payments_sdk.utils.utils import get_default_covered_components, get_default_headers
+from open_payments_sdk.utils.grant_cache import GrantCache, grant_cache_key
+from open_payments_sdk.utils.instrumentation import Instrumentation, instrumented
+from open_payments_sdk.utils.parsing import ResponseParser
+from open_payments_sdk.utils.utils import (AUTHORIZED_BODY_COMPONENTS,
+                                          AUTHORIZED_COMPONENTS,
+                                          BODY_COMPONENTS)
 
 
 
 class Grants(SecurityBase):
     """
-    Class to handle Grants in the sdk
+    Class to handle Grants in the sdk.
+
+    With a ``grant_cache``, non-interactive grant requests for access that was
+    already granted reuse the cached grant while its access token is valid.
     """
-    def __init__(self, keyid: str, private_key: str ,logger: Logger,http_client: HttpClient):
-        super().__init__(keyid=keyid, private_key=private_key,logger=logger)
+    def __init__(self, keyid: str, private_key: str, logger: Logger, http_client: HttpClient, signing_context: SigningContext = None, parser: ResponseParser = None, instrumentation: Instrumentation = None, grant_cache: Optional[GrantCache] = None):
+        super().__init__(keyid=keyid, private_key=private_key, logger=logger, signing_context=signing_context, parser=parser, instrumentation=instrumentation)
         self.logger = logger
         self.http_client = http_client
+        self.grant_cache = grant_cache
+
+    def _build_grant_request(self, grant_request: GrantRequest, auth_server_endpoint: str) -> Request:
+        template = self._template("grant", auth_server_endpoint, "POST", "", BODY_COMPONENTS)
+        return template.build(self, json=grant_request)
 
+    def _build_grant_continuation_request(
+            self,
+            interact_ref: Optional[InteractRef],
+            continue_uri: str,
+            access_token: str
+        ) -> Request:
+        # continuation URIs are unique per grant, so one template serves them all
+        template = self._template("continue", "", "POST", "", AUTHORIZED_BODY_COMPONENTS)
+        return template.build(self, access_token, path=continue_uri, json=interact_ref if interact_ref is not None else {})
+
+    def _build_delete_grant(self, req_id: str, auth_server_endpoint: str, access_token: str) -> Request:
+        template = self._template("delete", auth_server_endpoint, "DELETE", "/continue/", AUTHORIZED_COMPONENTS)
+        return template.build(self, access_token, path=req_id)
+
+    @instrumented("grants.request")
     def post_grant_request(
             self,
             grant_request: GrantRequest,
@@ -29,47 +60,34 @@ class Grants(SecurityBase):
         """
         Grant Request
         """
-        data = grant_request.model_dump(exclude_unset=True, mode="json")
-
-        req_headers = {
-            **get_default_headers()
-        }
-        request = self.http_client.build_request(
-            method="POST",
-            url=auth_server_endpoint,
-            json=data,
-            headers=req_headers
-        )
-        request = self.set_content_digest(request=request)
-        request = self.sign_request(request,("content-type","content-digest","content-length",*get_default_covered_components()))
+        if self.grant_cache is not None:
+            return self.grant_cache.get_or_request(
+                grant_cache_key(grant_request, auth_server_endpoint),
+                lambda: self._request_grant(grant_request, auth_server_endpoint)
+            )
+        return self._request_grant(grant_request, auth_server_endpoint)
+
+    def _request_grant(self, grant_request: GrantRequest, auth_server_endpoint: str) -> Grant:
+        request = self._build_grant_request(grant_request, auth_server_endpoint)
         response = self.http_client.send(request=request)
-        return Grant.model_validate(response.json())
+        return self.parser.parse(Grant, response)
 
+    @instrumented("grants.continue")
     def post_grant_continuation_request(
             self,
-            interact_ref: InteractRef,
+            interact_ref: Optional[InteractRef],
             continue_uri: str,
             access_token: str
         ) -> GrantContinueResponse:
         """
-        Continue Grant Request
-        """
-        data = interact_ref.model_dump(exclude_unset=True, mode="json")
-        req_headers = {
-            **get_default_headers(),
-            **self.get_auth_header(access_token=access_token)
-        }
-        request = self.http_client.build_request(
-            method="POST",
-            url=continue_uri,
-            json=data,
-            headers=req_headers
-        )
-        request = self.set_content_digest(request=request)
-        request = self.sign_request(request,("content-type","content-digest","content-length","authorization",*get_default_covered_components()))
+        Continue Grant Request. Without interact_ref the grant is polled, and a
+        response without ``access_token`` means it is still pending
+        """
+        request = self._build_grant_continuation_request(interact_ref, continue_uri, access_token)
         response = self.http_client.send(request=request)
-        return GrantContinueResponse.model_validate(response.json())
+        return self.parser.parse(GrantContinueResponse, response)
 
+    @instrumented("grants.delete")
     def delete_grant(
             self,
             req_id: str,
@@ -79,27 +97,31 @@ class Grants(SecurityBase):
         """
         Delete Grant
         """
-        base_url = auth_server_endpoint.rstrip("/")
-        url = f"{base_url}/continue/{req_id}"
-        req_headers = {
-            **self.get_auth_header(access_token=access_token)
-        }
-        request = self.http_client.build_request(
-            method="DELETE",
-            url=url,
-            headers=req_headers
-        )
-        request = self.sign_request(request,("authorization",*get_default_covered_components()))
+        if self.grant_cache is not None:
+            self.grant_cache.invalidate_token(access_token)
+        request = self._build_delete_grant(req_id, auth_server_endpoint, access_token)
         self.http_client.send(request=request)
 
 class AccessTokens(SecurityBase):
     """
-    Access Token Class
+    Access Token Class. Rotated and revoked tokens are evicted from ``grant_cache``
     """
-    def __init__(self, keyid: str , private_key: str,logger: Logger, http_client: HttpClient ):
-        super().__init__(keyid=keyid, private_key=private_key, logger=logger)
+    def __init__(self, keyid: str, private_key: str, logger: Logger, http_client: HttpClient, signing_context: SigningContext = None, parser: ResponseParser = None, instrumentation: Instrumentation = None, grant_cache: Optional[GrantCache] = None):
+        super().__init__(keyid=keyid, private_key=private_key, logger=logger, signing_context=signing_context, parser=parser, instrumentation=instrumentation)
         self.http_client = http_client
+        self.grant_cache = grant_cache
+
+    def _build_token_request(
+            self,
+            method: str,
+            token_id: str,
+            auth_server_endpoint: str,
+            access_token: str
+        ) -> Request:
+        template = self._template(method, auth_server_endpoint, method, "/token/", AUTHORIZED_COMPONENTS)
+        return template.build(self, access_token, path=token_id)
 
+    @instrumented("access_tokens.rotate")
     def post_rotate_access_token(
             self,
             token_id: str,
@@ -109,20 +131,13 @@ class AccessTokens(SecurityBase):
         """
         Rotate Access Token
         """
-        base_url = auth_server_endpoint.rstrip("/")
-        url = f"{base_url}/token/{token_id}"
-        req_headers = {
-            **self.get_auth_header(access_token=access_token)
-        }
-        request = self.http_client.build_request(
-            method="POST",
-            url=url,
-            headers=req_headers
-        )
-        request = self.sign_request(request,("authorization",*get_default_covered_components()))
+        if self.grant_cache is not None:
+            self.grant_cache.invalidate_token(access_token)
+        request = self._build_token_request("POST", token_id, auth_server_endpoint, access_token)
         response = self.http_client.send(request=request)
-        return AccessToken.model_validate(response.json())
+        return AccessToken.model_validate(response.json()["access_token"])
 
+    @instrumented("access_tokens.delete")
     def delete_access_token(
             self,
             token_id: str,
@@ -132,16 +147,105 @@ class AccessTokens(SecurityBase):
         """
         Delete Access Token
         """
-        base_url = auth_server_endpoint.rstrip("/")
-        url = f"{base_url}/token/{token_id}"
-        req_headers = {
-            **self.get_auth_header(access_token=access_token)
-        }
-
-        request = self.http_client.build_request(
-            method="DELETE",
-            url=url,
-            headers=req_headers
-        )
-        request = self.sign_request(request,("authorization",*get_default_covered_components()))
-        self.http_client.send(request=request)
\ No newline at end of file
+        if self.grant_cache is not None:
+            self.grant_cache.invalidate_token(access_token)
+        request = self._build_token_request("DELETE", token_id, auth_server_endpoint, access_token)
+        self.http_client.send(request=request)
+
+
+class AsyncGrants(Grants):
+    """
+    asyncio variant of ``Grants``
+    """
+    def __init__(self, keyid: str, private_key: str, logger: Logger, http_client: AsyncHttpClient, signing_context: SigningContext = None, parser: ResponseParser = None, instrumentation: Instrumentation = None, grant_cache: Optional[GrantCache] = None):
+        super().__init__(keyid=keyid, private_key=private_key, logger=logger, http_client=http_client, signing_context=signing_context, parser=parser, instrumentation=instrumentation, grant_cache=grant_cache)
+
+    @instrumented("grants.request")
+    async def post_grant_request(
+            self,
+            grant_request: GrantRequest,
+            auth_server_endpoint: str,
+        ) -> Grant:
+        """
+        Grant Request
+        """
+        if self.grant_cache is not None:
+            return await self.grant_cache.aget_or_request(
+                grant_cache_key(grant_request, auth_server_endpoint),
+                lambda: self._request_grant(grant_request, auth_server_endpoint)
+            )
+        return await self._request_grant(grant_request, auth_server_endpoint)
+
+    async def _request_grant(self, grant_request: GrantRequest, auth_server_endpoint: str) -> Grant:
+        request = self._build_grant_request(grant_request, auth_server_endpoint)
+        response = await self.http_client.send(request=request)
+        return self.parser.parse(Grant, response)
+
+    @instrumented("grants.continue")
+    async def post_grant_continuation_request(
+            self,
+            interact_ref: Optional[InteractRef],
+            continue_uri: str,
+            access_token: str
+        ) -> GrantContinueResponse:
+        """
+        Continue Grant Request. Without interact_ref the grant is polled, and a
+        response without ``access_token`` means it is still pending
+        """
+        request = self._build_grant_continuation_request(interact_ref, continue_uri, access_token)
+        response = await self.http_client.send(request=request)
+        return self.parser.parse(GrantContinueResponse, response)
+
+    @instrumented("grants.delete")
+    async def delete_grant(
+            self,
+            req_id: str,
+            auth_server_endpoint: str,
+            access_token: str
+        ) -> None:
+        """
+        Delete Grant
+        """
+        if self.grant_cache is not None:
+            self.grant_cache.invalidate_token(access_token)
+        request = self._build_delete_grant(req_id, auth_server_endpoint, access_token)
+        await self.http_client.send(request=request)
+
+
+class AsyncAccessTokens(AccessTokens):
+    """
+    asyncio variant of ``AccessTokens``
+    """
+    def __init__(self, keyid: str, private_key: str, logger: Logger, http_client: AsyncHttpClient, signing_context: SigningContext = None, parser: ResponseParser = None, instrumentation: Instrumentation = None, grant_cache: Optional[GrantCache] = None):
+        super().__init__(keyid=keyid, private_key=private_key, logger=logger, http_client=http_client, signing_context=signing_context, parser=parser, instrumentation=instrumentation, grant_cache=grant_cache)
+
+    @instrumented("access_tokens.rotate")
+    async def post_rotate_access_token(
+            self,
+            token_id: str,
+            auth_server_endpoint: str,
+            access_token: str
+        ) -> AccessToken:
+        """
+        Rotate Access Token
+        """
+        if self.grant_cache is not None:
+            self.grant_cache.invalidate_token(access_token)
+        request = self._build_token_request("POST", token_id, auth_server_endpoint, access_token)
+        response = await self.http_client.send(request=request)
+        return AccessToken.model_validate(response.json()["access_token"])
+
+    @instrumented("access_tokens.delete")
+    async def delete_access_token(
+            self,
+            token_id: str,
+            auth_server_endpoint: str,
+            access_token: str
+        ) -> None:
+        """
+        Delete Access Token
+        """
+        if self.grant_cache is not None:
+            self.grant_cache.invalidate_token(access_token)
+        request = self._build_token_request("DELETE", token_id, auth_server_endpoint, access_token)
+        await self.http_client.send(request=request)
@@ -0,0 +1,269 @@
+"""
+Batch Module
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from open_payments_sdk.api.resource import (AsyncOutgoingPayments, AsyncQuotes,
+                                            OutgoingPayments, Quotes)
+from open_payments_sdk.gnap_utils.signing_pool import SigningPool
+from open_payments_sdk.models.batch import BatchItemResult, BatchResult, BatchStats
+from open_payments_sdk.models.resource import (OutgoingPayment,
+                                               OutgoingPaymentRequest, Quote,
+                                               QuoteRequest)
+from open_payments_sdk.utils.instrumentation import CURRENT_CALL, CallMetrics
+from open_payments_sdk.utils.utils import AUTHORIZED_BODY_COMPONENTS
+
+
+def summarize(items: List[BatchItemResult], elapsed: float) -> BatchResult:
+    """
+    Aggregate per-item results into a BatchResult
+    """
+    latencies = sorted(item.latency for item in items)
+    count = len(latencies)
+
+    def percentile(fraction: float) -> float:
+        if not latencies:
+            return 0.0
+        return latencies[min(count - 1, int(fraction * count))]
+
+    failed = sum(1 for item in items if not item.ok)
+    stats = BatchStats(
+        items=count,
+        succeeded=count - failed,
+        failed=failed,
+        elapsed=elapsed,
+        throughput=count / elapsed if elapsed > 0 else 0.0,
+        latency_mean=sum(latencies) / count if count else 0.0,
+        latency_p50=percentile(0.5),
+        latency_p95=percentile(0.95),
+        latency_max=latencies[-1] if latencies else 0.0
+    )
+    return BatchResult(items=items, stats=stats)
+
+
+class Batch:
+    """
+    Creates quotes and outgoing payments concurrently.
+
+    Items run on a bounded thread pool over the client's pooled connections.
+    Results and errors are returned per item, in input order. With a
+    ``signing_pool`` all requests are built first and signed together on the
+    pool's worker processes, then sent.
+    """
+    def __init__(self, quotes: Quotes, outgoing_payments: OutgoingPayments, max_concurrency: int = 10, signing_pool: Optional[SigningPool] = None):
+        self.quotes = quotes
+        self.outgoing_payments = outgoing_payments
+        self.max_concurrency = max_concurrency
+        self.signing_pool = signing_pool
+
+    @staticmethod
+    def _call(index: int, func: Callable, item) -> BatchItemResult:
+        start = time.perf_counter()
+        try:
+            result = func(item)
+            return BatchItemResult(index=index, result=result, latency=time.perf_counter() - start)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            return BatchItemResult(index=index, error=exc, latency=time.perf_counter() - start)
+
+    def run(self, func: Callable, items: Sequence, max_concurrency: Optional[int] = None) -> BatchResult:
+        """
+        Apply func to every item with at most max_concurrency calls in flight
+        """
+        workers = max(1, min(max_concurrency or self.max_concurrency, len(items) or 1))
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="open-payments-batch") as executor:
+            results = list(executor.map(self._call, range(len(items)), [func] * len(items), items))
+        return summarize(results, time.perf_counter() - start)
+
+    @staticmethod
+    def _build_unsigned(api, endpoint: str, build: Callable, items: Sequence) -> Tuple[list, List[Optional[CallMetrics]]]:
+        """
+        Build an unsigned request per item, starting its instrumented call when api has instrumentation.
+        Items that fail to build are returned as their exception
+        """
+        instrumentation = api.instrumentation
+        requests, calls = [], []
+        for item in items:
+            call, token = instrumentation.start(endpoint) if instrumentation is not None else (None, None)
+            try:
+                requests.append(build(item))
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                requests.append(exc)
+            finally:
+                if token is not None:
+                    CURRENT_CALL.reset(token)
+            calls.append(call)
+        return requests, calls
+
+    @staticmethod
+    def _signed(requests: list, calls: List[Optional[CallMetrics]]) -> list:
+        """
+        Pair signed requests with their calls, which spent the time until now signing
+        """
+        for call in calls:
+            if call is not None:
+                call.mark("sign")
+        return list(zip(requests, calls))
+
+    @staticmethod
+    def _sending(api, call: Optional[CallMetrics]):
+        return api.instrumentation.resume(call) if call is not None else nullcontext()
+
+    def _send_signed(self, api, endpoint: str, model, build: Callable, items: Sequence, max_concurrency: Optional[int]) -> BatchResult:
+        """
+        Build unsigned requests, sign them together on the signing pool, then send them and parse
+        the responses into model. Requests that could not be built or signed become failed items
+        """
+        requests, calls = self._build_unsigned(api, endpoint, build, items)
+        signed = self._signed(self.signing_pool.sign(requests, AUTHORIZED_BODY_COMPONENTS), calls)
+
+        def send(entry):
+            request, call = entry
+            with self._sending(api, call):
+                if isinstance(request, Exception):
+                    raise request
+                return api.parser.parse(model, api.http_client.send(request=request))
+        return self.run(send, signed, max_concurrency)
+
+    def create_quotes(
+            self,
+            quotes: Sequence[QuoteRequest],
+            resource_server_endpoint: str,
+            access_token: str,
+            max_concurrency: Optional[int] = None
+        ) -> BatchResult:
+        """
+        Create Quotes
+        """
+        if self.signing_pool is not None:
+            return self._send_signed(
+                self.quotes,
+                "quotes.create",
+                Quote,
+                lambda quote: self.quotes._build_create_quote(quote, resource_server_endpoint, access_token, sign=False),
+                quotes,
+                max_concurrency
+            )
+        return self.run(
+            lambda quote: self.quotes.post_create_quote(quote, resource_server_endpoint, access_token),
+            quotes,
+            max_concurrency
+        )
+
+    def create_outgoing_payments(
+            self,
+            payments: Sequence[OutgoingPaymentRequest],
+            resource_server_endpoint: str,
+            access_token: str,
+            max_concurrency: Optional[int] = None
+        ) -> BatchResult:
+        """
+        Create Outgoing Payments
+        """
+        if self.signing_pool is not None:
+            return self._send_signed(
+                self.outgoing_payments,
+                "outgoing_payments.create",
+                OutgoingPayment,
+                lambda payment: self.outgoing_payments._build_create_payment(payment, resource_server_endpoint, access_token, sign=False),
+                payments,
+                max_concurrency
+            )
+        return self.run(
+            lambda payment: self.outgoing_payments.post_create_payment(payment, resource_server_endpoint, access_token),
+            payments,
+            max_concurrency
+        )
+
+
+class AsyncBatch(Batch):
+    """
+    asyncio variant of ``Batch``; concurrency is bounded with a semaphore
+    """
+    def __init__(self, quotes: AsyncQuotes, outgoing_payments: AsyncOutgoingPayments, max_concurrency: int = 10, signing_pool: Optional[SigningPool] = None):
+        super().__init__(quotes, outgoing_payments, max_concurrency, signing_pool)
+
+    async def _send_signed(self, api, endpoint: str, model, build: Callable, items: Sequence, max_concurrency: Optional[int]) -> BatchResult:
+        requests, calls = self._build_unsigned(api, endpoint, build, items)
+        signed = self._signed(await self.signing_pool.sign_async(requests, AUTHORIZED_BODY_COMPONENTS), calls)
+
+        async def send(entry):
+            request, call = entry
+            with self._sending(api, call):
+                if isinstance(request, Exception):
+                    raise request
+                return api.parser.parse(model, await api.http_client.send(request=request))
+        return await self.run(send, signed, max_concurrency)
+
+    async def run(self, func: Callable, items: Sequence, max_concurrency: Optional[int] = None) -> BatchResult:
+        """
+        Await func for every item with at most max_concurrency calls in flight
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrency or self.max_concurrency))
+
+        async def call(index: int, item) -> BatchItemResult:
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    result = await func(item)
+                    return BatchItemResult(index=index, result=result, latency=time.perf_counter() - start)
+                except Exception as exc:  # pylint: disable=broad-exception-caught
+                    return BatchItemResult(index=index, error=exc, latency=time.perf_counter() - start)
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(call(index, item) for index, item in enumerate(items)))
+        return summarize(list(results), time.perf_counter() - start)
+
+    async def create_quotes(
+            self,
+            quotes: Sequence[QuoteRequest],
+            resource_server_endpoint: str,
+            access_token: str,
+            max_concurrency: Optional[int] = None
+        ) -> BatchResult:
+        """
+        Create Quotes
+        """
+        if self.signing_pool is not None:
+            return await self._send_signed(
+                self.quotes,
+                "quotes.create",
+                Quote,
+                lambda quote: self.quotes._build_create_quote(quote, resource_server_endpoint, access_token, sign=False),
+                quotes,
+                max_concurrency
+            )
+        return await self.run(
+            lambda quote: self.quotes.post_create_quote(quote, resource_server_endpoint, access_token),
+            quotes,
+            max_concurrency
+        )
+
+    async def create_outgoing_payments(
+            self,
+            payments: Sequence[OutgoingPaymentRequest],
+            resource_server_endpoint: str,
+            access_token: str,
+            max_concurrency: Optional[int] = None
+        ) -> BatchResult:
+        """
+        Create Outgoing Payments
+        """
+        if self.signing_pool is not None:
+            return await self._send_signed(
+                self.outgoing_payments,
+                "outgoing_payments.create",
+                OutgoingPayment,
+                lambda payment: self.outgoing_payments._build_create_payment(payment, resource_server_endpoint, access_token, sign=False),
+                payments,
+                max_concurrency
+            )
+        return await self.run(
+            lambda payment: self.outgoing_payments.post_create_payment(payment, resource_server_endpoint, access_token),
+            payments,
+            max_concurrency
+        )
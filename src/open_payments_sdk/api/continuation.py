@@ -0,0 +1,311 @@
+"""
+Grant Continuation Polling Module
+"""
+import asyncio
+import heapq
+import itertools
+import json
+import random
+import threading
+import time
+from concurrent.futures import Future
+from logging import Logger
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from httpx import HTTPStatusError, TransportError
+
+from open_payments_sdk.api.auth import AsyncGrants, Grants
+from open_payments_sdk.models.auth import Continue, GrantContinueResponse, InteractRef
+from open_payments_sdk.retry import CircuitOpenError
+
+RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+
+
+class GrantRejectedError(Exception):
+    """
+    Raised for a continuation the authorization server denied
+    """
+    def __init__(self, continue_uri: str, code: Optional[str]):
+        super().__init__(f"Grant {continue_uri} was rejected ({code})")
+        self.continue_uri = continue_uri
+        self.code = code
+
+
+class PendingContinuation:
+    """
+    State of one polled grant: current continuation, attempts and result future
+    """
+    __slots__ = ("cont", "interact_ref", "future", "failures", "polls")
+
+    def __init__(self, cont: Continue, interact_ref: Optional[InteractRef], future):
+        self.cont = cont
+        self.interact_ref = interact_ref
+        self.future = future
+        self.failures = 0
+        self.polls = 0
+
+
+class BaseContinuationPoller:
+    """
+    Scheduling shared by the sync and async pollers.
+
+    Pending grants are kept in a heap ordered by their next due time. A grant
+    is polled after ``Continue.wait`` seconds, or ``default_wait`` if the server
+    gave none, and again after every still-pending response. ``too_fast``
+    errors add five seconds to the wait as GNAP requires, and transient
+    failures back off exponentially, honouring ``Retry-After``.
+    """
+    def __init__(
+            self,
+            logger: Logger,
+            default_wait: float = 5.0,
+            backoff_factor: float = 1.0,
+            max_backoff: float = 60.0,
+            clock: Callable[[], float] = time.monotonic
+    ):
+        self.logger = logger
+        self.default_wait = default_wait
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.clock = clock
+        self._schedule: List[Tuple[float, int, PendingContinuation]] = []
+        self._counter = itertools.count()
+
+    def _wait(self, cont: Continue) -> float:
+        return float(cont.wait) if cont.wait is not None else self.default_wait
+
+    def _push(self, pending: PendingContinuation, delay: float) -> None:
+        heapq.heappush(self._schedule, (self.clock() + delay, next(self._counter), pending))
+
+    @property
+    def pending(self) -> int:
+        """
+        Number of grants waiting to be polled
+        """
+        return len(self._schedule)
+
+    def _handle_response(self, pending: PendingContinuation, response: GrantContinueResponse) -> Optional[float]:
+        """
+        Resolve pending with response, or return the delay before the next poll
+        """
+        if pending.future.done():
+            return None
+        pending.failures = 0
+        if response.access_token is not None:
+            pending.future.set_result(response)
+            return None
+        if response.cont is not None:
+            pending.cont = response.cont
+        return self._wait(pending.cont)
+
+    def _handle_error(self, pending: PendingContinuation, error: Exception) -> Optional[float]:
+        """
+        Fail pending with error, or return the delay before retrying it
+        """
+        if pending.future.done():
+            return None
+        if isinstance(error, HTTPStatusError):
+            status = error.response.status_code
+            code = self._error_code(error)
+            if code == "too_fast":
+                return self._wait(pending.cont) + 5.0
+            if status not in RETRY_STATUSES:
+                if code == "request_denied":
+                    error = GrantRejectedError(str(pending.cont.uri), code)
+                pending.future.set_exception(error)
+                return None
+            retry_after = error.response.headers.get("Retry-After")
+            if retry_after is not None and retry_after.isdigit():
+                pending.failures += 1
+                return float(retry_after)
+        elif not isinstance(error, (TransportError, CircuitOpenError)):
+            pending.future.set_exception(error)
+            return None
+        pending.failures += 1
+        delay = min(self.max_backoff, self.backoff_factor * 2 ** pending.failures)
+        self.logger.warning("Polling grant %s failed, retrying in %.1fs: %s", pending.cont.uri, delay, error)
+        return random.uniform(delay / 2, delay)
+
+    @staticmethod
+    def _error_code(error: HTTPStatusError) -> Optional[str]:
+        try:
+            body = json.loads(error.response.content or b"{}")
+        except ValueError:
+            return None
+        body = body.get("error", body) if isinstance(body, dict) else {}
+        if isinstance(body, dict):
+            return body.get("code")
+        return body if isinstance(body, str) else None
+
+
+class ContinuationPoller(BaseContinuationPoller):
+    """
+    Polls many pending interactive grants from one background thread.
+
+    ``poll`` returns a ``concurrent.futures.Future`` that resolves with the
+    ``GrantContinueResponse`` once the grant is approved, or fails with
+    ``GrantRejectedError``. Cancelling the future stops polling that grant.
+    """
+    def __init__(self, grants: Grants, logger: Logger, **kwargs):
+        super().__init__(logger, **kwargs)
+        self.grants = grants
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def poll(
+            self,
+            cont: Continue,
+            interact_ref: Optional[Union[InteractRef, str]] = None,
+            delay: Optional[float] = None
+        ) -> Future:
+        """
+        Start polling the grant continued at cont, e.g. ``grant.root.cont``
+        """
+        if isinstance(interact_ref, str):
+            interact_ref = InteractRef(interact_ref=interact_ref)
+        pending = PendingContinuation(cont, interact_ref, Future())
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Continuation poller is closed")
+            self._push(pending, self._wait(cont) if delay is None else delay)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="open-payments-continuation", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+        return pending.future
+
+    def _poll_once(self, pending: PendingContinuation) -> Optional[float]:
+        pending.polls += 1
+        try:
+            response = self.grants.post_grant_continuation_request(
+                pending.interact_ref, str(pending.cont.uri), pending.cont.access_token.value
+            )
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            return self._handle_error(pending, exc)
+        return self._handle_response(pending, response)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._closed and (not self._schedule or self._schedule[0][0] > self.clock()):
+                    timeout = self._schedule[0][0] - self.clock() if self._schedule else None
+                    self._condition.wait(timeout=timeout)
+                if self._closed:
+                    return
+                _, _, pending = heapq.heappop(self._schedule)
+            if pending.future.cancelled():
+                continue
+            delay = self._poll_once(pending)
+            if delay is not None:
+                with self._condition:
+                    if self._closed:
+                        pending.future.cancel()
+                        return
+                    self._push(pending, delay)
+
+    def close(self) -> None:
+        """
+        Stop polling and cancel the futures of grants still pending
+        """
+        with self._condition:
+            self._closed = True
+            pending = [entry[2] for entry in self._schedule]
+            self._schedule.clear()
+            self._condition.notify_all()
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join()
+        for entry in pending:
+            entry.future.cancel()
+
+
+class AsyncContinuationPoller(BaseContinuationPoller):
+    """
+    asyncio variant of ``ContinuationPoller``.
+
+    One task on the running loop dispatches due polls, with at most
+    ``max_concurrency`` continuation requests in flight. ``poll`` returns an
+    ``asyncio.Future``.
+    """
+    def __init__(self, grants: AsyncGrants, logger: Logger, max_concurrency: int = 10, **kwargs):
+        super().__init__(logger, **kwargs)
+        self.grants = grants
+        self.max_concurrency = max_concurrency
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._inflight: Dict[asyncio.Task, PendingContinuation] = {}
+        self._closed = False
+
+    def poll(
+            self,
+            cont: Continue,
+            interact_ref: Optional[Union[InteractRef, str]] = None,
+            delay: Optional[float] = None
+        ) -> asyncio.Future:
+        """
+        Start polling the grant continued at cont, e.g. ``grant.root.cont``
+        """
+        if isinstance(interact_ref, str):
+            interact_ref = InteractRef(interact_ref=interact_ref)
+        if self._closed:
+            raise RuntimeError("Continuation poller is closed")
+        loop = asyncio.get_running_loop()
+        pending = PendingContinuation(cont, interact_ref, loop.create_future())
+        self._push(pending, self._wait(cont) if delay is None else delay)
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = loop.create_task(self._run())
+        self._wakeup.set()
+        return pending.future
+
+    async def _poll_once(self, pending: PendingContinuation, semaphore: asyncio.Semaphore) -> None:
+        async with semaphore:
+            pending.polls += 1
+            try:
+                response = await self.grants.post_grant_continuation_request(
+                    pending.interact_ref, str(pending.cont.uri), pending.cont.access_token.value
+                )
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                delay = self._handle_error(pending, exc)
+            else:
+                delay = self._handle_response(pending, response)
+        if delay is not None:
+            self._push(pending, delay)
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        while not self._closed:
+            self._wakeup.clear()
+            while self._schedule and self._schedule[0][0] <= self.clock():
+                _, _, pending = heapq.heappop(self._schedule)
+                if pending.future.cancelled():
+                    continue
+                task = asyncio.create_task(self._poll_once(pending, semaphore))
+                self._inflight[task] = pending
+                task.add_done_callback(self._inflight.pop)
+            timeout = self._schedule[0][0] - self.clock() if self._schedule else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def aclose(self) -> None:
+        """
+        Stop polling and cancel the futures of grants still pending
+        """
+        self._closed = True
+        if self._wakeup is not None:
+            self._wakeup.set()
+        pending = list(self._inflight.values()) + [entry[2] for entry in self._schedule]
+        self._schedule.clear()
+        tasks = list(self._inflight)
+        if self._task is not None:
+            tasks.append(self._task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        for entry in pending:
+            entry.future.cancel()
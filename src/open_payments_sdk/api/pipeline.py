@@ -0,0 +1,447 @@
+"""
+Payment Pipeline Module
+"""
+import asyncio
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterable, Callable, Dict, Iterable, List, Optional, Union
+from urllib.parse import parse_qs, urlsplit
+
+from open_payments_sdk.api.batch import summarize
+from open_payments_sdk.models.auth import Grant, GrantRequest, GrantResponse, InteractionInstructionsResponse
+from open_payments_sdk.models.pipeline import PaymentIntent, PipelineItemResult, PipelineResult, PipelineStats, StageStats
+from open_payments_sdk.models.resource import IncomingPaymentRequest, OutgoingPaymentRequest, QuoteRequest
+
+STAGES = ("wallets", "incoming_payment", "quote", "outgoing_grant", "continuation", "outgoing_payment")
+# the continuation stage only waits for the user and the poller, which bounds its own requests
+DEFAULT_STAGE_CONCURRENCY = {
+    "wallets": 8,
+    "incoming_payment": 4,
+    "quote": 4,
+    "outgoing_grant": 4,
+    "continuation": None,
+    "outgoing_payment": 4,
+}
+
+Interact = Callable[[PaymentIntent, InteractionInstructionsResponse], Optional[str]]
+
+
+class InteractionRequiredError(Exception):
+    """
+    Raised when a grant the pipeline expects to be issued directly needs interaction
+    """
+    def __init__(self, auth_server_endpoint: str):
+        super().__init__(f"Grant from {auth_server_endpoint} requires interaction")
+        self.auth_server_endpoint = auth_server_endpoint
+
+
+class InteractionHashError(Exception):
+    """
+    Raised when the hash of an interaction finish redirect does not match the grant
+    """
+    def __init__(self, continue_uri: str):
+        super().__init__(f"Interaction finish hash for {continue_uri} does not match")
+        self.continue_uri = continue_uri
+
+
+class _PaymentState:
+    """
+    Resources created for one intent as it moves through the stages
+    """
+    __slots__ = ("intent", "sender", "receiver", "incoming_payment", "quote", "pending", "nonce", "interact_ref", "access_token", "outgoing_payment")
+
+    def __init__(self, intent: PaymentIntent):
+        self.intent = intent
+        self.sender = None
+        self.receiver = None
+        self.incoming_payment = None
+        self.quote = None
+        self.pending = None
+        self.nonce = None
+        self.interact_ref = None
+        self.access_token = None
+        self.outgoing_payment = None
+
+
+class _Stage:
+    """
+    One stage of a run: its function, concurrency limit and counters
+    """
+    __slots__ = ("name", "func", "limit", "semaphore", "completed", "failed", "busy", "queue_delay", "queue_delay_max", "first_start", "last_end", "_lock")
+
+    def __init__(self, name: str, func: Callable, limit: Optional[int], semaphore):
+        self.name = name
+        self.func = func
+        self.limit = limit
+        self.semaphore = semaphore
+        self.completed = 0
+        self.failed = 0
+        self.busy = 0.0
+        self.queue_delay = 0.0
+        self.queue_delay_max = 0.0
+        self.first_start = None
+        self.last_end = None
+        self._lock = threading.Lock()
+
+    def record(self, queued: float, started: float, finished: float, ok: bool) -> None:
+        with self._lock:
+            if ok:
+                self.completed += 1
+            else:
+                self.failed += 1
+            self.busy += finished - started
+            self.queue_delay += started - queued
+            self.queue_delay_max = max(self.queue_delay_max, started - queued)
+            self.first_start = started if self.first_start is None else min(self.first_start, started)
+            self.last_end = finished if self.last_end is None else max(self.last_end, finished)
+
+    def stats(self) -> StageStats:
+        with self._lock:
+            count = self.completed + self.failed
+            window = self.last_end - self.first_start if count else 0.0
+            return StageStats(
+                name=self.name,
+                concurrency=self.limit,
+                completed=self.completed,
+                failed=self.failed,
+                throughput=self.completed / window if window > 0 else 0.0,
+                latency_mean=self.busy / count if count else 0.0,
+                queue_delay_mean=self.queue_delay / count if count else 0.0,
+                queue_delay_max=self.queue_delay_max
+            )
+
+
+class BasePaymentPipeline:
+    """
+    Stages, requests and statistics shared by the sync and async pipelines.
+
+    Every payment intent goes through six stages: resolving the sender and
+    receiver wallet addresses, creating an incoming payment, creating a
+    quote, requesting an interactive outgoing payment grant, waiting for its
+    continuation and creating the outgoing payment. Each stage admits at most
+    its ``stage_concurrency`` intents at a time, so different intents overlap
+    in different stages, and at most ``max_in_flight`` intents are taken from
+    the input at once. Interaction happens in the continuation stage, so
+    intents waiting for consent do not hold grant request slots.
+
+    Incoming payment and quote grants ask for the same access for every
+    intent, so with a client ``grant_cache`` they are requested once and
+    shared; wallet addresses are shared through the wallet cache.
+
+    With ``finish_uri``, outgoing payment grants ask the authorization server
+    to redirect the user there once they have consented. ``interact`` then
+    returns the URL the user arrived at; its hash is checked and its
+    ``interact_ref`` continues the grant right away. Without it, no
+    interaction reference is issued, the value ``interact`` returns is
+    ignored, and the grant is polled until the user has consented.
+    """
+    def __init__(
+            self,
+            wallet,
+            grants,
+            incoming_payments,
+            quotes,
+            outgoing_payments,
+            continuation_poller,
+            client_wallet_address: str,
+            stage_concurrency: Optional[Dict[str, Optional[int]]] = None,
+            max_in_flight: int = 32,
+            finish_uri: Optional[str] = None,
+            clock: Callable[[], float] = time.perf_counter
+        ):
+        unknown = set(stage_concurrency or ()) - set(STAGES)
+        if unknown:
+            raise ValueError(f"Unknown pipeline stages {sorted(unknown)}, use {', '.join(STAGES)}")
+        invalid = {name: limit for name, limit in (stage_concurrency or {}).items() if limit is not None and limit < 1}
+        if invalid:
+            raise ValueError(f"Stage concurrency must be at least 1, or None for no limit: {invalid}")
+        self.wallet = wallet
+        self.grants = grants
+        self.incoming_payments = incoming_payments
+        self.quotes = quotes
+        self.outgoing_payments = outgoing_payments
+        self.continuation_poller = continuation_poller
+        self.client_wallet_address = client_wallet_address
+        self.stage_concurrency = {**DEFAULT_STAGE_CONCURRENCY, **(stage_concurrency or {})}
+        self.max_in_flight = max(1, max_in_flight)
+        self.finish_uri = finish_uri
+        self.clock = clock
+
+    def _grant_request(self, access: List[dict], interact: Optional[dict] = None) -> GrantRequest:
+        request = {"access_token": {"access": access}, "client": self.client_wallet_address}
+        if interact is not None:
+            request["interact"] = interact
+        return GrantRequest.model_validate(request)
+
+    @staticmethod
+    def _access_token(grant: Grant, auth_server_endpoint: str) -> str:
+        if not isinstance(grant.root, GrantResponse):
+            raise InteractionRequiredError(auth_server_endpoint)
+        return grant.root.access_token.value
+
+    @staticmethod
+    def _incoming_payment_request(state: _PaymentState) -> IncomingPaymentRequest:
+        return IncomingPaymentRequest(
+            walletAddress=str(state.receiver.id),
+            incomingAmount=state.intent.amount,
+            expiresAt=None,
+            metadata=None
+        )
+
+    @staticmethod
+    def _quote_request(state: _PaymentState) -> QuoteRequest:
+        return QuoteRequest.model_validate({
+            "walletAddress": str(state.sender.id),
+            "receiver": str(state.incoming_payment.id),
+            "method": "ilp"
+        })
+
+    def _outgoing_grant_request(self, state: _PaymentState) -> GrantRequest:
+        interact = {"start": ["redirect"]}
+        if self.finish_uri is not None:
+            state.nonce = secrets.token_urlsafe(16)
+            interact["finish"] = {"method": "redirect", "uri": self.finish_uri, "nonce": state.nonce}
+        return self._grant_request([{
+            "type": "outgoing-payment",
+            "actions": ["create", "read"],
+            "identifier": str(state.sender.id),
+            "limits": {"debitAmount": state.quote.debitAmount.model_dump(mode="json")}
+        }], interact=interact)
+
+    def _finish_interaction(self, state: _PaymentState, redirect: Optional[str]) -> None:
+        """
+        Take the interaction reference from the finish redirect URL after checking its hash
+        """
+        if self.finish_uri is None or redirect is None:
+            return
+        query = parse_qs(urlsplit(redirect).query)
+        interact_ref = query.get("interact_ref", [None])[0]
+        received_hash = query.get("hash", [None])[0]
+        if interact_ref is None or not self.grants.hash_manager.verify_hash(
+            state.nonce, state.pending.interact.finish, interact_ref, str(state.sender.authServer).rstrip("/"), received_hash
+        ):
+            raise InteractionHashError(str(state.pending.cont.uri))
+        state.interact_ref = interact_ref
+
+    @staticmethod
+    def _outgoing_payment_request(state: _PaymentState) -> OutgoingPaymentRequest:
+        return OutgoingPaymentRequest.model_validate({
+            "walletAddress": str(state.sender.id),
+            "quoteId": str(state.quote.id),
+            "metadata": state.intent.metadata
+        })
+
+    def _stages(self, funcs: Dict[str, Callable], semaphore_class) -> List[_Stage]:
+        stages = []
+        for name in STAGES:
+            limit = self.stage_concurrency[name]
+            stages.append(_Stage(name, funcs[name], limit, None if limit is None else semaphore_class(limit)))
+        return stages
+
+    @staticmethod
+    def _result(items: List[PipelineItemResult], stages: List[_Stage], elapsed: float) -> PipelineResult:
+        summary = summarize(items, elapsed)
+        return PipelineResult(items=items, stats=PipelineStats(**summary.stats.model_dump(), stages=[stage.stats() for stage in stages]))
+
+    @staticmethod
+    def _item_result(index: int, state: _PaymentState, latency: float, stage: Optional[str] = None, error: Optional[Exception] = None) -> PipelineItemResult:
+        return PipelineItemResult(
+            index=index,
+            intent=state.intent,
+            result=state.outgoing_payment,
+            error=error,
+            latency=latency,
+            stage=stage,
+            incoming_payment=state.incoming_payment,
+            quote=state.quote
+        )
+
+
+class PaymentPipeline(BasePaymentPipeline):
+    """
+    Sends payment intents through the stages on a pool of ``max_in_flight`` threads.
+
+    ``run`` returns per-intent results, in input order, with the outgoing
+    payment or the error and the stage it failed in, and per-stage
+    throughput and queueing delay. ``interact`` is called in the continuation
+    stage with each intent and its pending outgoing payment grant to send the
+    user to ``grant.interact.redirect``.
+    """
+    def _resolve_wallets(self, state: _PaymentState) -> None:
+        state.sender = self.wallet.get_wallet_address(state.intent.sender)
+        state.receiver = self.wallet.get_wallet_address(state.intent.receiver)
+
+    def _create_incoming_payment(self, state: _PaymentState) -> None:
+        auth_server = str(state.receiver.authServer)
+        grant = self.grants.post_grant_request(self._grant_request([{"type": "incoming-payment", "actions": ["create"]}]), auth_server)
+        state.incoming_payment = self.incoming_payments.post_create_payment(
+            self._incoming_payment_request(state), str(state.receiver.resourceServer), self._access_token(grant, auth_server)
+        )
+
+    def _create_quote(self, state: _PaymentState) -> None:
+        auth_server = str(state.sender.authServer)
+        grant = self.grants.post_grant_request(self._grant_request([{"type": "quote", "actions": ["create"]}]), auth_server)
+        state.quote = self.quotes.post_create_quote(
+            self._quote_request(state), str(state.sender.resourceServer), self._access_token(grant, auth_server)
+        )
+
+    def _request_outgoing_grant(self, state: _PaymentState) -> None:
+        grant = self.grants.post_grant_request(self._outgoing_grant_request(state), str(state.sender.authServer))
+        if isinstance(grant.root, GrantResponse):
+            state.access_token = grant.root.access_token.value
+            return
+        state.pending = grant.root
+
+    def _continue_grant(self, state: _PaymentState, interact: Interact) -> None:
+        if state.access_token is not None:
+            return
+        self._finish_interaction(state, interact(state.intent, state.pending))
+        # a returned interaction reference means consent was given, so continue right away
+        future = self.continuation_poller.poll(state.pending.cont, state.interact_ref, delay=0 if state.interact_ref else None)
+        state.access_token = future.result().access_token.value
+
+    def _create_outgoing_payment(self, state: _PaymentState) -> None:
+        state.outgoing_payment = self.outgoing_payments.post_create_payment(
+            self._outgoing_payment_request(state), str(state.sender.resourceServer), state.access_token
+        )
+
+    def _process(self, index: int, intent: PaymentIntent, stages: List[_Stage]) -> PipelineItemResult:
+        state = _PaymentState(intent)
+        start = self.clock()
+        for stage in stages:
+            queued = self.clock()
+            if stage.semaphore is not None:
+                stage.semaphore.acquire()
+            started = self.clock()
+            try:
+                stage.func(state)
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                stage.record(queued, started, self.clock(), ok=False)
+                return self._item_result(index, state, self.clock() - start, stage=stage.name, error=exc)
+            finally:
+                if stage.semaphore is not None:
+                    stage.semaphore.release()
+            stage.record(queued, started, self.clock(), ok=True)
+        return self._item_result(index, state, self.clock() - start)
+
+    def run(self, intents: Iterable[PaymentIntent], interact: Interact) -> PipelineResult:
+        """
+        Send every intent, taking at most ``max_in_flight`` intents from the input at once
+        """
+        stages = self._stages({
+            "wallets": self._resolve_wallets,
+            "incoming_payment": self._create_incoming_payment,
+            "quote": self._create_quote,
+            "outgoing_grant": self._request_outgoing_grant,
+            "continuation": lambda state: self._continue_grant(state, interact),
+            "outgoing_payment": self._create_outgoing_payment,
+        }, threading.Semaphore)
+        admitted = threading.Semaphore(self.max_in_flight)
+        futures = []
+        start = self.clock()
+        with ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix="open-payments-pipeline") as executor:
+            for index, intent in enumerate(intents):
+                admitted.acquire()
+                future = executor.submit(self._process, index, intent, stages)
+                future.add_done_callback(lambda _: admitted.release())
+                futures.append(future)
+        return self._result([future.result() for future in futures], stages, self.clock() - start)
+
+
+class AsyncPaymentPipeline(BasePaymentPipeline):
+    """
+    asyncio variant of ``PaymentPipeline``; stages are bounded with semaphores.
+    ``interact`` may be a plain function or a coroutine function
+    """
+    async def _resolve_wallets(self, state: _PaymentState) -> None:
+        state.sender, state.receiver = await asyncio.gather(
+            self.wallet.get_wallet_address(state.intent.sender),
+            self.wallet.get_wallet_address(state.intent.receiver)
+        )
+
+    async def _create_incoming_payment(self, state: _PaymentState) -> None:
+        auth_server = str(state.receiver.authServer)
+        grant = await self.grants.post_grant_request(self._grant_request([{"type": "incoming-payment", "actions": ["create"]}]), auth_server)
+        state.incoming_payment = await self.incoming_payments.post_create_payment(
+            self._incoming_payment_request(state), str(state.receiver.resourceServer), self._access_token(grant, auth_server)
+        )
+
+    async def _create_quote(self, state: _PaymentState) -> None:
+        auth_server = str(state.sender.authServer)
+        grant = await self.grants.post_grant_request(self._grant_request([{"type": "quote", "actions": ["create"]}]), auth_server)
+        state.quote = await self.quotes.post_create_quote(
+            self._quote_request(state), str(state.sender.resourceServer), self._access_token(grant, auth_server)
+        )
+
+    async def _request_outgoing_grant(self, state: _PaymentState) -> None:
+        grant = await self.grants.post_grant_request(self._outgoing_grant_request(state), str(state.sender.authServer))
+        if isinstance(grant.root, GrantResponse):
+            state.access_token = grant.root.access_token.value
+            return
+        state.pending = grant.root
+
+    async def _continue_grant(self, state: _PaymentState, interact: Interact) -> None:
+        if state.access_token is not None:
+            return
+        redirect = interact(state.intent, state.pending)
+        self._finish_interaction(state, await redirect if asyncio.iscoroutine(redirect) else redirect)
+        future = self.continuation_poller.poll(state.pending.cont, state.interact_ref, delay=0 if state.interact_ref else None)
+        state.access_token = (await future).access_token.value
+
+    async def _create_outgoing_payment(self, state: _PaymentState) -> None:
+        state.outgoing_payment = await self.outgoing_payments.post_create_payment(
+            self._outgoing_payment_request(state), str(state.sender.resourceServer), state.access_token
+        )
+
+    async def _process(self, index: int, intent: PaymentIntent, stages: List[_Stage]) -> PipelineItemResult:
+        state = _PaymentState(intent)
+        start = self.clock()
+        for stage in stages:
+            queued = self.clock()
+            if stage.semaphore is not None:
+                await stage.semaphore.acquire()
+            started = self.clock()
+            try:
+                await stage.func(state)
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                stage.record(queued, started, self.clock(), ok=False)
+                return self._item_result(index, state, self.clock() - start, stage=stage.name, error=exc)
+            finally:
+                if stage.semaphore is not None:
+                    stage.semaphore.release()
+            stage.record(queued, started, self.clock(), ok=True)
+        return self._item_result(index, state, self.clock() - start)
+
+    async def run(self, intents: Union[Iterable[PaymentIntent], AsyncIterable[PaymentIntent]], interact: Interact) -> PipelineResult:
+        """
+        Send every intent, taking at most ``max_in_flight`` intents from the input at once
+        """
+        stages = self._stages({
+            "wallets": self._resolve_wallets,
+            "incoming_payment": self._create_incoming_payment,
+            "quote": self._create_quote,
+            "outgoing_grant": self._request_outgoing_grant,
+            "continuation": lambda state: self._continue_grant(state, interact),
+            "outgoing_payment": self._create_outgoing_payment,
+        }, asyncio.Semaphore)
+        admitted = asyncio.Semaphore(self.max_in_flight)
+        tasks = []
+        start = self.clock()
+
+        async def admit(index: int, intent: PaymentIntent) -> None:
+            await admitted.acquire()
+            task = asyncio.create_task(self._process(index, intent, stages))
+            task.add_done_callback(lambda _: admitted.release())
+            tasks.append(task)
+
+        if isinstance(intents, AsyncIterable):
+            index = 0
+            async for intent in intents:
+                await admit(index, intent)
+                index += 1
+        else:
+            for index, intent in enumerate(intents):
+                await admit(index, intent)
+        return self._result(list(await asyncio.gather(*tasks)), stages, self.clock() - start)
@@ -2,8 +2,12 @@
 Resource Server Module
 """
 from logging import Logger
-from open_payments_sdk.gnap_utils.security import SecurityBase
-from open_payments_sdk.http import HttpClient
+from typing import AsyncIterator, Iterator, Optional
+
+from httpx import Request
+
+from open_payments_sdk.gnap_utils.security import SecurityBase, SigningContext
+from open_payments_sdk.http import AsyncHttpClient, HttpClient
 from open_payments_sdk.models.resource import (IncomingPayment,
                                                IncomingPaymentRequest,
                                                IncomingPaymentResponse,
@@ -13,44 +17,69 @@ from open_payments_sdk.models.resource import (IncomingPayment,
                                                PaginatedOutgoingPayments,
                                                PaymentListQuery, Quote,
                                                QuoteRequest)
-from open_payments_sdk.utils.utils import get_default_covered_components, get_default_headers
+from open_payments_sdk.utils.pagination import aiter_items, iter_items
+from open_payments_sdk.utils.instrumentation import Instrumentation, instrumented
+from open_payments_sdk.utils.parsing import ResponseParser
+from open_payments_sdk.utils.single_flight import SingleFlight, coalesced
+from open_payments_sdk.utils.utils import AUTHORIZED_BODY_COMPONENTS, AUTHORIZED_COMPONENTS
 
 
 class IncomingPayments(SecurityBase):
     """
     Class for handling incoming payments resources
     """
-    def __init__(self, keyid: str, private_key: str,logger: Logger, http_client: HttpClient):
-        super().__init__(keyid=keyid,private_key=private_key,logger=logger)
+    def __init__(self, keyid: str, private_key: str, logger: Logger, http_client: HttpClient, signing_context: SigningContext = None, parser: ResponseParser = None, instrumentation: Instrumentation = None, single_flight: Optional[SingleFlight] = None):
+        super().__init__(keyid=keyid, private_key=private_key, logger=logger, signing_context=signing_context, parser=parser, instrumentation=instrumentation)
         self.http_client = http_client
+        self.single_flight = single_flight
 
-    def post_create_payment(
+    def _build_create_payment(
             self,
             payment: IncomingPaymentRequest,
             resource_server_endpoint: str,
+            access_token: str,
+            idempotency_key: Optional[str] = None
+        ) -> Request:
+        template, headers = self._idempotent_template("create", resource_server_endpoint, "POST", "/incoming-payments", AUTHORIZED_BODY_COMPONENTS, idempotency_key)
+        return template.build(self, access_token, json=payment, headers=headers)
+
+    def _build_list_payments(
+            self,
+            query: PaymentListQuery,
+            resource_server_endpoint: str,
             access_token: str
+        ) -> Request:
+        template = self._template("list", resource_server_endpoint, "GET", "/incoming-payments", AUTHORIZED_COMPONENTS)
+        query_params = query.model_dump(exclude_unset=True, exclude_none=True, mode="json", by_alias=True)
+        return template.build(self, access_token, params=query_params)
+
+    def _build_payment_request(
+            self,
+            method: str,
+            path: str,
+            resource_server_endpoint: str,
+            access_token: str,
+            idempotency_key: Optional[str] = None
+        ) -> Request:
+        template, headers = self._idempotent_template(method, resource_server_endpoint, method, "/incoming-payments/", AUTHORIZED_COMPONENTS, idempotency_key)
+        return template.build(self, access_token, path=path, headers=headers)
+
+    @instrumented("incoming_payments.create")
+    def post_create_payment(
+            self,
+            payment: IncomingPaymentRequest,
+            resource_server_endpoint: str,
+            access_token: str,
+            idempotency_key: Optional[str] = None
         ) -> IncomingPayment:
         """
         Create Incoming Payment
         """
-        base_url = resource_server_endpoint.rstrip("/")
-        url = f"{base_url}/incoming-payments"
-        data = payment.model_dump(exclude_unset=True, mode="json")
-        req_headers = {
-            **get_default_headers(),
-            **self.get_auth_header(access_token=access_token)
-        }
-        request = self.http_client.build_request(
-            method="POST",
-            url=url,
-            json=data,
-            headers=req_headers
-        )
-        request = self.set_content_digest(request=request)
-        request = self.sign_request(request,("content-type","content-digest","content-length","authorization",*get_default_covered_components()))
+        request = self._build_create_payment(payment, resource_server_endpoint, access_token, idempotency_key)
         response = self.http_client.send(request=request)
-        return IncomingPayment.model_validate(response.json())
+        return self.parser.parse(IncomingPayment, response)
 
+    @instrumented("incoming_payments.list")
     def get_incoming_payments(
             self, query: PaymentListQuery,
             resource_server_endpoint: str,
@@ -59,22 +88,27 @@ class IncomingPayments(SecurityBase):
         """
         Get Incoming Payment
         """
-        base_url = resource_server_endpoint.rstrip("/")
-        url = f"{base_url}/incoming-payments"
-        query_params = query.model_dump(exclude_unset=True, mode="json")
-        req_headers = {
-            **self.get_auth_header(access_token=access_token)
-        }
-        request = self.http_client.build_request(
-            method="GET",
-            url=url,
-            headers=req_headers,
-            params=query_params
-        )
-        request = self.sign_request(request,("authorization",*get_default_covered_components()))
+        request = self._build_list_payments(query, resource_server_endpoint, access_token)
         response = self.http_client.send(request=request)
-        return PaginatedIncomingPayments.model_validate(response.json())
+        return self.parser.parse_page(PaginatedIncomingPayments, response)
 
+    def iter_incoming_payments(
+            self, query: PaymentListQuery,
+            resource_server_endpoint: str,
+            access_token: str,
+            prefetch: bool = True
+        ) -> Iterator[IncomingPayment]:
+        """
+        Iterate over Incoming Payments across all pages, starting at query.cursor
+        """
+        return iter_items(
+            lambda page_query: self.get_incoming_payments(page_query, resource_server_endpoint, access_token),
+            query,
+            prefetch=prefetch
+        )
+
+    @instrumented("incoming_payments.get")
+    @coalesced
     def get_incoming_payment(
             self,
             payment_id: str,
@@ -84,78 +118,82 @@ class IncomingPayments(SecurityBase):
         """
         Get Incoming Payment
         """
-        base_url = resource_server_endpoint.rstrip("/")
-        url = f"{base_url}/incoming-payments/{payment_id}"
-        req_headers = {
-            **self.get_auth_header(access_token=access_token)
-        }
-        request = self.http_client.build_request(
-            method="GET",
-            url=url,
-            headers=req_headers
-        )
-        request = self.sign_request(request,("authorization",*get_default_covered_components()))
+        request = self._build_payment_request("GET", payment_id, resource_server_endpoint, access_token)
         response = self.http_client.send(request=request)
-        return IncomingPaymentResponse.model_validate(response.json())
+        return self.parser.parse(IncomingPaymentResponse, response)
 
+    @instrumented("incoming_payments.complete")
     def post_complete_incoming_payment(
             self,
             payment_id: str,
             resource_server_endpoint: str,
-            access_token: str
+            access_token: str,
+            idempotency_key: Optional[str] = None
         ) -> IncomingPayment:
         """
         Complete Incoming Payment
         """
-        base_url = resource_server_endpoint.rstrip("/")
-        url = f"{base_url}/incoming-payments/{payment_id}/complete"
-        req_headers = {
-            **self.get_auth_header(access_token=access_token)
-        }
-        request = self.http_client.build_request(
-            method="POST",
-            url=url,
-            headers=req_headers
+        request = self._build_payment_request(
+            "POST", f"{payment_id}/complete", resource_server_endpoint, access_token, idempotency_key
         )
-        request = self.sign_request(request,("authorization",*get_default_covered_components()))
         response = self.http_client.send(request=request)
-        return IncomingPayment.model_validate(response.json())
+        return self.parser.parse(IncomingPayment, response)
 
 
 class OutgoingPayments(SecurityBase):
     """
     Class for handling outgoing payments resources
     """
-    def __init__(self, keyid: str, private_key: str, logger: Logger, http_client: HttpClient):
-        super().__init__(keyid=keyid,private_key=private_key,logger=logger)
+    def __init__(self, keyid: str, private_key: str, logger: Logger, http_client: HttpClient, signing_context: SigningContext = None, parser: ResponseParser = None, instrumentation: Instrumentation = None, single_flight: Optional[SingleFlight] = None):
+        super().__init__(keyid=keyid, private_key=private_key, logger=logger, signing_context=signing_context, parser=parser, instrumentation=instrumentation)
         self.http_client = http_client
+        self.single_flight = single_flight
+
+    def _build_create_payment(
+            self,
+            payment: OutgoingPaymentRequest,
+            resource_server_endpoint: str,
+            access_token: str,
+            idempotency_key: Optional[str] = None,
+            sign: bool = True
+        ) -> Request:
+        template, headers = self._idempotent_template("create", resource_server_endpoint, "POST", "/outgoing-payments", AUTHORIZED_BODY_COMPONENTS, idempotency_key)
+        return template.build(self, access_token, json=payment, headers=headers, sign=sign)
 
+    def _build_list_payments(
+            self,
+            query: PaymentListQuery,
+            resource_server_endpoint: str,
+            access_token: str
+        ) -> Request:
+        template = self._template("list", resource_server_endpoint, "GET", "/outgoing-payments", AUTHORIZED_COMPONENTS)
+        query_params = query.model_dump(exclude_unset=True, exclude_none=True, mode="json", by_alias=True)
+        return template.build(self, access_token, params=query_params)
+
+    def _build_get_payment(
+            self,
+            payment_id: str,
+            resource_server_endpoint: str,
+            access_token: str
+        ) -> Request:
+        template = self._template("get", resource_server_endpoint, "GET", "/outgoing-payments/", AUTHORIZED_COMPONENTS)
+        return template.build(self, access_token, path=payment_id)
+
+    @instrumented("outgoing_payments.create")
     def post_create_payment(
             self, payment: OutgoingPaymentRequest,
             resource_server_endpoint: str,
-            access_token: str
+            access_token: str,
+            idempotency_key: Optional[str] = None
         ) -> OutgoingPayment:
         """
         Create an Outgoing Payment Resource
         """
-        base_url = resource_server_endpoint.rstrip("/")
-        url = f"{base_url}/outgoing-payments"
-        data = payment.model_dump(exclude_unset=True, mode="json")
-        req_headers = {
-            **get_default_headers(),
-            **self.get_auth_header(access_token=access_token)
-        }
-        request = self.http_client.build_request(
-            method="POST",
-            url=url,
-            json=data,
-            headers=req_headers
-        )
-        request = self.set_content_digest(request=request)
-        request = self.sign_request(request,("content-type","content-digest","content-length","authorization",*get_default_covered_components()))
+        request = self._build_create_payment(payment, resource_server_endpoint, access_token, idempotency_key)
         response = self.http_client.send(request=request)
-        return OutgoingPayment.model_validate(response.json())
+        return self.parser.parse(OutgoingPayment, response)
 
+    @instrumented("outgoing_payments.list")
     def get_outgoing_payments(
         self,
         query: PaymentListQuery,
@@ -165,22 +203,28 @@ class OutgoingPayments(SecurityBase):
         """
         Get Outgoing Payments
         """
-        base_url = resource_server_endpoint.rstrip("/")
-        url = f"{base_url}/outgoing-payments"
-        query_params = query.model_dump(exclude_unset=True, mode="json")
-        req_headers = {
-            **self.get_auth_header(access_token=access_token)
-        }
-        request = self.http_client.build_request(
-            method="GET",
-            url=url,
-            headers=req_headers,
-            params=query_params
+        request = self._build_list_payments(query, resource_server_endpoint, access_token)
+        response = self.http_client.send(request=request)
+        return self.parser.parse_page(PaginatedOutgoingPayments, response)
+
+    def iter_outgoing_payments(
+        self,
+        query: PaymentListQuery,
+        resource_server_endpoint: str,
+        access_token: str,
+        prefetch: bool = True
+    ) -> Iterator[OutgoingPayment]:
+        """
+        Iterate over Outgoing Payments across all pages, starting at query.cursor
+        """
+        return iter_items(
+            lambda page_query: self.get_outgoing_payments(page_query, resource_server_endpoint, access_token),
+            query,
+            prefetch=prefetch
         )
-        response = request = self.sign_request(request,("authorization",*get_default_covered_components()))
-        self.http_client.send(request=request)
-        return PaginatedOutgoingPayments.model_validate(response.json())
 
+    @instrumented("outgoing_payments.get")
+    @coalesced
     def get_outgoing_payment(
             self, payment_id: str,
             resource_server_endpoint: str,
@@ -189,55 +233,56 @@ class OutgoingPayments(SecurityBase):
         """
         Get Outgoing Payment
         """
-        base_url = resource_server_endpoint
-        url = f"{base_url}/outgoing-payments/{payment_id}"
-        req_headers = {
-            **self.get_auth_header(access_token=access_token)
-        }
-        request = self.http_client.build_request(
-            method="GET",
-            url=url,
-            headers=req_headers
-        )
-        request = self.sign_request(request,("authorization",*get_default_covered_components()))
+        request = self._build_get_payment(payment_id, resource_server_endpoint, access_token)
         response = self.http_client.send(request=request)
-        return OutgoingPayment.model_validate(response.json())
+        return self.parser.parse(OutgoingPayment, response)
 
 
 class Quotes(SecurityBase):
     """
     Class for handling Quote resources
     """
-    def __init__(self, keyid: str, private_key: str,logger: Logger ,http_client: HttpClient):
-        super().__init__(keyid=keyid,private_key=private_key,logger=logger)
+    def __init__(self, keyid: str, private_key: str, logger: Logger, http_client: HttpClient, signing_context: SigningContext = None, parser: ResponseParser = None, instrumentation: Instrumentation = None, single_flight: Optional[SingleFlight] = None):
+        super().__init__(keyid=keyid, private_key=private_key, logger=logger, signing_context=signing_context, parser=parser, instrumentation=instrumentation)
         self.http_client = http_client
+        self.single_flight = single_flight
+
+    def _build_create_quote(
+            self,
+            quote: QuoteRequest,
+            resource_server_endpoint: str,
+            access_token: str,
+            idempotency_key: Optional[str] = None,
+            sign: bool = True
+        ) -> Request:
+        template, headers = self._idempotent_template("create", resource_server_endpoint, "POST", "/quotes", AUTHORIZED_BODY_COMPONENTS, idempotency_key)
+        return template.build(self, access_token, json=quote, headers=headers, sign=sign)
 
+    def _build_get_quote(
+            self,
+            quote_id: str,
+            resource_server_endpoint: str,
+            access_token: str
+        ) -> Request:
+        template = self._template("get", resource_server_endpoint, "GET", "/quotes/", AUTHORIZED_COMPONENTS)
+        return template.build(self, access_token, path=quote_id)
+
+    @instrumented("quotes.create")
     def post_create_quote(
             self, quote: QuoteRequest,
             resource_server_endpoint: str,
-            access_token: str
+            access_token: str,
+            idempotency_key: Optional[str] = None
         ) -> Quote:
         """
-        Create a Quote 
-        """
-        base_url = resource_server_endpoint.rstrip("/")
-        url = f"{base_url}/quotes"
-        data = quote.model_dump(exclude_unset=True, mode="json")
-        req_headers = {
-            **get_default_headers(),
-            **self.get_auth_header(access_token=access_token)
-        }
-        request = self.http_client.build_request(
-            method="POST",
-            url=url,
-            headers=req_headers,
-            json=data
-        )
-        request = self.set_content_digest(request=request)
-        request = self.sign_request(request,("content-type","content-digest","content-length","authorization",*get_default_covered_components()))
+        Create a Quote
+        """
+        request = self._build_create_quote(quote, resource_server_endpoint, access_token, idempotency_key)
         response = self.http_client.send(request=request)
-        return Quote.model_validate(response.json())
+        return self.parser.parse(Quote, response)
 
+    @instrumented("quotes.get")
+    @coalesced
     def get_quote(
             self,
             quote_id: str,
@@ -247,16 +292,192 @@ class Quotes(SecurityBase):
         """
         Get a Quote
         """
-        base_url = resource_server_endpoint.strip("/")
-        url = f"{base_url}/quotes/{quote_id}"
-        req_headers = {
-            **self.get_auth_header(access_token=access_token)
-        }
-        request = self.http_client.build_request(
-            method="GET",
-            url=url,
-            headers=req_headers
-        )
-        request = self.sign_request(request,("authorization",*get_default_covered_components()))
+        request = self._build_get_quote(quote_id, resource_server_endpoint, access_token)
         response = self.http_client.send(request=request)
-        return Quote.model_validate(response.json())
+        return self.parser.parse(Quote, response)
+
+
+class AsyncIncomingPayments(IncomingPayments):
+    """
+    asyncio variant of ``IncomingPayments``
+    """
+    def __init__(self, keyid: str, private_key: str, logger: Logger, http_client: AsyncHttpClient, signing_context: SigningContext = None, parser: ResponseParser = None, instrumentation: Instrumentation = None, single_flight: Optional[SingleFlight] = None):
+        super().__init__(keyid=keyid, private_key=private_key, logger=logger, http_client=http_client, signing_context=signing_context, parser=parser, instrumentation=instrumentation, single_flight=single_flight)
+
+    @instrumented("incoming_payments.create")
+    async def post_create_payment(
+            self,
+            payment: IncomingPaymentRequest,
+            resource_server_endpoint: str,
+            access_token: str,
+            idempotency_key: Optional[str] = None
+        ) -> IncomingPayment:
+        """
+        Create Incoming Payment
+        """
+        request = self._build_create_payment(payment, resource_server_endpoint, access_token, idempotency_key)
+        response = await self.http_client.send(request=request)
+        return self.parser.parse(IncomingPayment, response)
+
+    @instrumented("incoming_payments.list")
+    async def get_incoming_payments(
+            self, query: PaymentListQuery,
+            resource_server_endpoint: str,
+            access_token: str
+        ) -> PaginatedIncomingPayments:
+        """
+        Get Incoming Payment
+        """
+        request = self._build_list_payments(query, resource_server_endpoint, access_token)
+        response = await self.http_client.send(request=request)
+        return self.parser.parse_page(PaginatedIncomingPayments, response)
+
+    def iter_incoming_payments(
+            self, query: PaymentListQuery,
+            resource_server_endpoint: str,
+            access_token: str,
+            prefetch: bool = True
+        ) -> AsyncIterator[IncomingPayment]:
+        """
+        Iterate over Incoming Payments across all pages, starting at query.cursor
+        """
+        return aiter_items(
+            lambda page_query: self.get_incoming_payments(page_query, resource_server_endpoint, access_token),
+            query,
+            prefetch=prefetch
+        )
+
+    @instrumented("incoming_payments.get")
+    @coalesced
+    async def get_incoming_payment(
+            self,
+            payment_id: str,
+            resource_server_endpoint: str,
+            access_token: str
+        ) -> IncomingPayment:
+        """
+        Get Incoming Payment
+        """
+        request = self._build_payment_request("GET", payment_id, resource_server_endpoint, access_token)
+        response = await self.http_client.send(request=request)
+        return self.parser.parse(IncomingPaymentResponse, response)
+
+    @instrumented("incoming_payments.complete")
+    async def post_complete_incoming_payment(
+            self,
+            payment_id: str,
+            resource_server_endpoint: str,
+            access_token: str,
+            idempotency_key: Optional[str] = None
+        ) -> IncomingPayment:
+        """
+        Complete Incoming Payment
+        """
+        request = self._build_payment_request(
+            "POST", f"{payment_id}/complete", resource_server_endpoint, access_token, idempotency_key
+        )
+        response = await self.http_client.send(request=request)
+        return self.parser.parse(IncomingPayment, response)
+
+
+class AsyncOutgoingPayments(OutgoingPayments):
+    """
+    asyncio variant of ``OutgoingPayments``
+    """
+    def __init__(self, keyid: str, private_key: str, logger: Logger, http_client: AsyncHttpClient, signing_context: SigningContext = None, parser: ResponseParser = None, instrumentation: Instrumentation = None, single_flight: Optional[SingleFlight] = None):
+        super().__init__(keyid=keyid, private_key=private_key, logger=logger, http_client=http_client, signing_context=signing_context, parser=parser, instrumentation=instrumentation, single_flight=single_flight)
+
+    @instrumented("outgoing_payments.create")
+    async def post_create_payment(
+            self, payment: OutgoingPaymentRequest,
+            resource_server_endpoint: str,
+            access_token: str,
+            idempotency_key: Optional[str] = None
+        ) -> OutgoingPayment:
+        """
+        Create an Outgoing Payment Resource
+        """
+        request = self._build_create_payment(payment, resource_server_endpoint, access_token, idempotency_key)
+        response = await self.http_client.send(request=request)
+        return self.parser.parse(OutgoingPayment, response)
+
+    @instrumented("outgoing_payments.list")
+    async def get_outgoing_payments(
+        self,
+        query: PaymentListQuery,
+        resource_server_endpoint: str,
+        access_token: str
+    ) -> PaginatedOutgoingPayments:
+        """
+        Get Outgoing Payments
+        """
+        request = self._build_list_payments(query, resource_server_endpoint, access_token)
+        response = await self.http_client.send(request=request)
+        return self.parser.parse_page(PaginatedOutgoingPayments, response)
+
+    def iter_outgoing_payments(
+        self,
+        query: PaymentListQuery,
+        resource_server_endpoint: str,
+        access_token: str,
+        prefetch: bool = True
+    ) -> AsyncIterator[OutgoingPayment]:
+        """
+        Iterate over Outgoing Payments across all pages, starting at query.cursor
+        """
+        return aiter_items(
+            lambda page_query: self.get_outgoing_payments(page_query, resource_server_endpoint, access_token),
+            query,
+            prefetch=prefetch
+        )
+
+    @instrumented("outgoing_payments.get")
+    @coalesced
+    async def get_outgoing_payment(
+            self, payment_id: str,
+            resource_server_endpoint: str,
+            access_token: str
+        ) -> OutgoingPayment:
+        """
+        Get Outgoing Payment
+        """
+        request = self._build_get_payment(payment_id, resource_server_endpoint, access_token)
+        response = await self.http_client.send(request=request)
+        return self.parser.parse(OutgoingPayment, response)
+
+
+class AsyncQuotes(Quotes):
+    """
+    asyncio variant of ``Quotes``
+    """
+    def __init__(self, keyid: str, private_key: str, logger: Logger, http_client: AsyncHttpClient, signing_context: SigningContext = None, parser: ResponseParser = None, instrumentation: Instrumentation = None, single_flight: Optional[SingleFlight] = None):
+        super().__init__(keyid=keyid, private_key=private_key, logger=logger, http_client=http_client, signing_context=signing_context, parser=parser, instrumentation=instrumentation, single_flight=single_flight)
+
+    @instrumented("quotes.create")
+    async def post_create_quote(
+            self, quote: QuoteRequest,
+            resource_server_endpoint: str,
+            access_token: str,
+            idempotency_key: Optional[str] = None
+        ) -> Quote:
+        """
+        Create a Quote
+        """
+        request = self._build_create_quote(quote, resource_server_endpoint, access_token, idempotency_key)
+        response = await self.http_client.send(request=request)
+        return self.parser.parse(Quote, response)
+
+    @instrumented("quotes.get")
+    @coalesced
+    async def get_quote(
+            self,
+            quote_id: str,
+            resource_server_endpoint: str,
+            access_token: str
+        ) -> Quote:
+        """
+        Get a Quote
+        """
+        request = self._build_get_quote(quote_id, resource_server_endpoint, access_token)
+        response = await self.http_client.send(request=request)
+        return self.parser.parse(Quote, response)
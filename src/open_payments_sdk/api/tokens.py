@@ -0,0 +1,380 @@
+"""
+Access Token Management Module
+"""
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future
+from logging import Logger
+from typing import Callable, List, Optional, Tuple, Union
+
+from open_payments_sdk.api.auth import AccessTokens, AsyncAccessTokens
+from open_payments_sdk.models.auth import AccessToken
+
+
+class ManagedAccessToken:
+    """
+    Handle to an access token kept fresh by an ``AccessTokenManager``.
+
+    The handle can be passed wherever an ``access_token`` string is expected;
+    its string value is always the current, non-expired token value.
+    """
+    def __init__(self, manager: "BaseAccessTokenManager", access_token: AccessToken, issued_at: float):
+        self._manager = manager
+        self._lock = threading.Lock()
+        self._rotation: Optional[Union[Future, asyncio.Future]] = None
+        self.access_token = access_token
+        self.expires_at = self._expiry(access_token, issued_at)
+        self.generation = 0
+        self.revoked = False
+
+    @staticmethod
+    def _expiry(access_token: AccessToken, issued_at: float) -> Optional[float]:
+        if access_token.expires_in is None:
+            return None
+        return issued_at + access_token.expires_in
+
+    def _update(self, access_token: AccessToken, issued_at: float) -> None:
+        self.access_token = access_token
+        self.expires_at = self._expiry(access_token, issued_at)
+        self.generation += 1
+
+    @property
+    def manage(self) -> str:
+        """
+        Management URI of the current token
+        """
+        return str(self.access_token.manage)
+
+    @property
+    def value(self) -> str:
+        """
+        Current token value. The sync manager rotates first if the token is about to expire
+        """
+        return self._manager.value_of(self)
+
+    def __str__(self) -> str:
+        return self.value
+
+
+class BaseAccessTokenManager:
+    """
+    Rotation schedule shared by the sync and async token managers.
+
+    Each rotation of a handle bumps its ``generation``. Callers record the
+    generation before deciding to rotate, so a caller that loses the race to
+    another rotation gets the token that rotation stored instead of rotating
+    the new token again.
+    """
+    def __init__(
+            self,
+            logger: Logger,
+            rotate_before: float = 30.0,
+            retry_interval: float = 5.0,
+            clock: Callable[[], float] = time.monotonic
+    ):
+        self.logger = logger
+        self.rotate_before = rotate_before
+        self.retry_interval = retry_interval
+        self.clock = clock
+        self._schedule: List[Tuple[float, int, ManagedAccessToken, int]] = []
+        self._counter = itertools.count()
+        self._closed = False
+
+    def register(self, access_token: AccessToken) -> ManagedAccessToken:
+        """
+        Start managing an access token, e.g. ``grant.root.access_token``
+        """
+        handle = ManagedAccessToken(self, access_token, self.clock())
+        self._schedule_rotation(handle)
+        return handle
+
+    def value_of(self, handle: ManagedAccessToken) -> str:
+        """
+        Return the current token value of the handle without rotating it
+        """
+        if handle.revoked:
+            raise ValueError("Access token has been revoked")
+        return handle.access_token.value
+
+    @staticmethod
+    def _split_manage_url(manage: str) -> Tuple[str, str]:
+        auth_server_endpoint, separator, token_id = manage.rstrip("/").rpartition("/token/")
+        if not separator or not token_id:
+            raise ValueError(f"Unsupported access token management URI: {manage}")
+        return auth_server_endpoint, token_id
+
+    def _refresh_at(self, handle: ManagedAccessToken) -> Optional[float]:
+        if handle.expires_at is None:
+            return None
+        # short-lived tokens are refreshed half way through their lifetime
+        margin = min(self.rotate_before, handle.access_token.expires_in / 2)
+        return handle.expires_at - margin
+
+    def _needs_rotation(self, handle: ManagedAccessToken) -> bool:
+        refresh_at = self._refresh_at(handle)
+        return refresh_at is not None and self.clock() >= refresh_at
+
+    def _claim_rotation(self, handle: ManagedAccessToken, generation: Optional[int], new_future: Callable[[], Future]):
+        """
+        Under the handle's lock, return ``(None, None)`` if the token was rotated since
+        generation, else the rotation future and whether the caller owns it
+        """
+        with handle._lock:
+            if generation is not None and handle.generation != generation:
+                return None, None
+            future = handle._rotation
+            owner = future is None
+            if owner:
+                future = handle._rotation = new_future()
+            return future, owner
+
+    def _store_rotation(self, handle: ManagedAccessToken, rotated: Optional[AccessToken]) -> None:
+        with handle._lock:
+            if rotated is not None:
+                handle._update(rotated, self.clock())
+            handle._rotation = None
+
+    def _push(self, handle: ManagedAccessToken, due: Optional[float]) -> bool:
+        """
+        Add the handle's next rotation to the schedule, returning whether it was added
+        """
+        if due is None:
+            due = self._refresh_at(handle)
+        if due is None or self._closed:
+            return False
+        heapq.heappush(self._schedule, (due, next(self._counter), handle, handle.generation))
+        return True
+
+    def _schedule_rotation(self, handle: ManagedAccessToken, due: Optional[float] = None) -> None:
+        raise NotImplementedError
+
+    def _pop_due(self) -> Optional[Tuple[ManagedAccessToken, int]]:
+        if not self._schedule or self._schedule[0][0] > self.clock():
+            return None
+        _, _, handle, generation = heapq.heappop(self._schedule)
+        return handle, generation
+
+    def _retry_later(self, handle: ManagedAccessToken) -> None:
+        self.logger.exception("Failed to rotate access token %s", handle.manage)
+        retry_at = self.clock() + self.retry_interval
+        if retry_at < handle.expires_at:
+            self._schedule_rotation(handle, retry_at)
+
+
+class AccessTokenManager(BaseAccessTokenManager):
+    """
+    Tracks access tokens and rotates them ahead of expiry.
+
+    Rotations run on a background thread ``rotate_before`` seconds before a
+    token expires. A token that is used after its refresh point is rotated on
+    demand, and concurrent rotations of the same token are coalesced into a
+    single ``AccessTokens.post_rotate_access_token`` call.
+    """
+    def __init__(self, access_tokens: AccessTokens, logger: Logger, **kwargs):
+        super().__init__(logger, **kwargs)
+        self.access_tokens = access_tokens
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def get_value(self, handle: ManagedAccessToken) -> str:
+        """
+        Return a fresh token value for the handle
+        """
+        if handle.revoked:
+            raise ValueError("Access token has been revoked")
+        generation = handle.generation
+        if self._needs_rotation(handle):
+            self.rotate(handle, generation)
+        return handle.access_token.value
+
+    value_of = get_value
+
+    def rotate(self, handle: ManagedAccessToken, generation: Optional[int] = None) -> AccessToken:
+        """
+        Rotate the token now. Callers arriving while a rotation of the same token
+        is in flight wait for its result instead of issuing another request.
+        With generation, the token is only rotated if it has not been since
+        """
+        future, owner = self._claim_rotation(handle, generation, Future)
+        if future is None:
+            return handle.access_token
+        if not owner:
+            return future.result()
+        try:
+            auth_server_endpoint, token_id = self._split_manage_url(handle.manage)
+            rotated = self.access_tokens.post_rotate_access_token(
+                token_id=token_id,
+                auth_server_endpoint=auth_server_endpoint,
+                access_token=handle.access_token.value
+            )
+        except BaseException as exc:
+            self._store_rotation(handle, None)
+            future.set_exception(exc)
+            raise
+        # store the new token before waiters read it from the handle
+        self._store_rotation(handle, rotated)
+        future.set_result(rotated)
+        self._schedule_rotation(handle)
+        return rotated
+
+    def revoke(self, handle: ManagedAccessToken) -> None:
+        """
+        Stop managing the token and revoke it at the authorization server
+        """
+        handle.revoked = True
+        auth_server_endpoint, token_id = self._split_manage_url(handle.manage)
+        self.access_tokens.delete_access_token(
+            token_id=token_id,
+            auth_server_endpoint=auth_server_endpoint,
+            access_token=handle.access_token.value
+        )
+
+    def close(self) -> None:
+        """
+        Stop the background rotation thread
+        """
+        with self._condition:
+            self._closed = True
+            self._schedule.clear()
+            self._condition.notify_all()
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join()
+
+    def _schedule_rotation(self, handle: ManagedAccessToken, due: Optional[float] = None) -> None:
+        with self._condition:
+            if not self._push(handle, due):
+                return
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="open-payments-token-rotation", daemon=True
+                )
+                self._thread.start()
+            self._condition.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._closed and (due := self._pop_due()) is None:
+                    timeout = self._schedule[0][0] - self.clock() if self._schedule else None
+                    self._condition.wait(timeout=timeout)
+                if self._closed:
+                    return
+            handle, generation = due
+            if handle.revoked or handle.generation != generation:
+                # revoked, or already rotated on demand and rescheduled
+                continue
+            try:
+                self.rotate(handle, generation)
+            except Exception:  # pylint: disable=broad-exception-caught
+                self._retry_later(handle)
+
+
+class AsyncAccessTokenManager(BaseAccessTokenManager):
+    """
+    asyncio variant of ``AccessTokenManager``.
+
+    Rotations run in a task on the running loop. Handles used as strings
+    return the current value, since ``str`` cannot await a rotation; await
+    ``get_value`` to rotate on demand a token used after its refresh point.
+    """
+    def __init__(self, access_tokens: AsyncAccessTokens, logger: Logger, **kwargs):
+        super().__init__(logger, **kwargs)
+        self.access_tokens = access_tokens
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def get_value(self, handle: ManagedAccessToken) -> str:
+        """
+        Return a fresh token value for the handle
+        """
+        if handle.revoked:
+            raise ValueError("Access token has been revoked")
+        generation = handle.generation
+        if self._needs_rotation(handle):
+            await self.rotate(handle, generation)
+        return handle.access_token.value
+
+    async def rotate(self, handle: ManagedAccessToken, generation: Optional[int] = None) -> AccessToken:
+        """
+        Rotate the token now, sharing a rotation already in flight
+        """
+        future, owner = self._claim_rotation(handle, generation, asyncio.get_running_loop().create_future)
+        if future is None:
+            return handle.access_token
+        if not owner:
+            return await asyncio.shield(future)
+        try:
+            auth_server_endpoint, token_id = self._split_manage_url(handle.manage)
+            rotated = await self.access_tokens.post_rotate_access_token(
+                token_id=token_id,
+                auth_server_endpoint=auth_server_endpoint,
+                access_token=handle.access_token.value
+            )
+        except BaseException as exc:
+            self._store_rotation(handle, None)
+            if isinstance(exc, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(exc)
+                # retrieve the exception so an unawaited future does not log it
+                future.exception()
+            raise
+        self._store_rotation(handle, rotated)
+        future.set_result(rotated)
+        self._schedule_rotation(handle)
+        return rotated
+
+    async def revoke(self, handle: ManagedAccessToken) -> None:
+        """
+        Stop managing the token and revoke it at the authorization server
+        """
+        handle.revoked = True
+        auth_server_endpoint, token_id = self._split_manage_url(handle.manage)
+        await self.access_tokens.delete_access_token(
+            token_id=token_id,
+            auth_server_endpoint=auth_server_endpoint,
+            access_token=handle.access_token.value
+        )
+
+    async def aclose(self) -> None:
+        """
+        Stop the background rotation task
+        """
+        self._closed = True
+        self._schedule.clear()
+        task, self._task = self._task, None
+        if task is not None:
+            # wait_for may swallow a cancellation that races with a wakeup,
+            # so the loop also stops when it sees the manager closed
+            self._wakeup.set()
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    def _schedule_rotation(self, handle: ManagedAccessToken, due: Optional[float] = None) -> None:
+        if not self._push(handle, due):
+            return
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        while not self._closed:
+            self._wakeup.clear()
+            while (due := self._pop_due()) is not None:
+                handle, generation = due
+                if handle.revoked or handle.generation != generation:
+                    continue
+                try:
+                    await self.rotate(handle, generation)
+                except Exception:  # pylint: disable=broad-exception-caught
+                    self._retry_later(handle)
+            timeout = self._schedule[0][0] - self.clock() if self._schedule else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
@@ -1,30 +1,150 @@
-from open_payments_sdk.http import HttpClient
+from typing import Optional
+
+from httpx import HTTPStatusError, Request, Response
+
+from open_payments_sdk.http import AsyncHttpClient, HttpClient
 from open_payments_sdk.models.wallet import JsonWebKeySet, WalletAddress
+from open_payments_sdk.utils.cache import CacheEntry, TTLCache
+from open_payments_sdk.utils.instrumentation import Instrumentation, instrumented, mark
+from open_payments_sdk.utils.parsing import DEFAULT_PARSER, ResponseParser
+from open_payments_sdk.utils.single_flight import SingleFlight, coalesced
 
 
 class Wallet:
     """
     Class for handling Wallet resource
+
+    When a ``TTLCache`` is given, wallet addresses and key sets are served from
+    it while fresh and revalidated with ``If-None-Match`` once stale. With a
+    ``single_flight``, concurrent lookups of the same wallet address share one request.
     """
-    def __init__(self, http_client: HttpClient):
+    def __init__(self, http_client: HttpClient, cache: Optional[TTLCache] = None, parser: Optional[ResponseParser] = None, instrumentation: Optional[Instrumentation] = None, single_flight: Optional[SingleFlight] = None):
         self.http_client = http_client
+        self.cache = cache
+        self.parser = parser or DEFAULT_PARSER
+        self.instrumentation = instrumentation
+        self.single_flight = single_flight
 
-    def get_wallet_address(self, wallet_address_server_endpoint: str) -> WalletAddress:
-        """Get wallet address from address server"""
-        request = self.http_client.build_request(
+    def _build_get_wallet_address(self, wallet_address_server_endpoint: str) -> Request:
+        return self.http_client.build_request(
             method="GET",
             url=wallet_address_server_endpoint
         )
-        response = self.http_client.send(request=request)
-        return WalletAddress.model_validate(response.json())
 
-    def get_keys(self, wallet_address_server_endpoint: str) -> JsonWebKeySet:
-        """Get keys from address server"""
+    def _build_get_keys(self, wallet_address_server_endpoint: str) -> Request:
         base_url = wallet_address_server_endpoint.rstrip("/")
         url = f"{base_url}/jwks.json"
-        request = self.http_client.build_request(
+        return self.http_client.build_request(
             method="GET",
             url=url
         )
-        response = self.http_client.send(request=request)
-        return JsonWebKeySet.model_validate(response.json())
+
+    def _lookup(self, key: tuple) -> Optional[CacheEntry]:
+        """
+        Return the cache entry for key, fresh or stale
+        """
+        if self.cache is None:
+            return None
+        return self.cache.lookup(key)
+
+    def _build_conditional(self, build, endpoint: str, entry: Optional[CacheEntry]) -> Request:
+        """
+        Build the request, revalidating a stale entry with If-None-Match
+        """
+        request = build(endpoint)
+        if entry is not None and entry.etag:
+            request.headers["If-None-Match"] = entry.etag
+        mark("build")
+        return request
+
+    def _store(self, key: tuple, entry: Optional[CacheEntry], response: Response, model):
+        """
+        Parse response into model, refreshing the cache entry
+        """
+        if response.status_code == 304 and entry is not None:
+            self.cache.revalidated(entry, response)
+            return entry.value
+        value = self.parser.parse(model, response)
+        if self.cache is not None:
+            self.cache.store(key, value, response)
+        return value
+
+    def _send(self, request: Request) -> Response:
+        try:
+            return self.http_client.send(request=request)
+        except HTTPStatusError as exc:
+            if exc.response.status_code == 304:
+                return exc.response
+            raise
+
+    def _get_cached(self, key: tuple, build, endpoint: str, model):
+        entry = self._lookup(key)
+        if entry is not None and self.cache.is_fresh(entry):
+            return entry.value
+        response = self._send(self._build_conditional(build, endpoint, entry))
+        return self._store(key, entry, response, model)
+
+    @instrumented("wallet.get_wallet_address")
+    @coalesced
+    def get_wallet_address(self, wallet_address_server_endpoint: str) -> WalletAddress:
+        """Get wallet address from address server"""
+        return self._get_cached(
+            ("wallet", wallet_address_server_endpoint),
+            self._build_get_wallet_address,
+            wallet_address_server_endpoint,
+            WalletAddress
+        )
+
+    @instrumented("wallet.get_keys")
+    def get_keys(self, wallet_address_server_endpoint: str) -> JsonWebKeySet:
+        """Get keys from address server"""
+        return self._get_cached(
+            ("jwks", wallet_address_server_endpoint),
+            self._build_get_keys,
+            wallet_address_server_endpoint,
+            JsonWebKeySet
+        )
+
+
+class AsyncWallet(Wallet):
+    """
+    asyncio variant of ``Wallet``
+    """
+    def __init__(self, http_client: AsyncHttpClient, cache: Optional[TTLCache] = None, parser: Optional[ResponseParser] = None, instrumentation: Optional[Instrumentation] = None, single_flight: Optional[SingleFlight] = None):
+        super().__init__(http_client, cache, parser, instrumentation, single_flight)
+
+    async def _send(self, request: Request) -> Response:
+        try:
+            return await self.http_client.send(request=request)
+        except HTTPStatusError as exc:
+            if exc.response.status_code == 304:
+                return exc.response
+            raise
+
+    async def _get_cached(self, key: tuple, build, endpoint: str, model):
+        entry = self._lookup(key)
+        if entry is not None and self.cache.is_fresh(entry):
+            return entry.value
+        response = await self._send(self._build_conditional(build, endpoint, entry))
+        return self._store(key, entry, response, model)
+
+    @instrumented("wallet.get_wallet_address")
+    @coalesced
+    async def get_wallet_address(self, wallet_address_server_endpoint: str) -> WalletAddress:
+        """Get wallet address from address server"""
+        return await self._get_cached(
+            ("wallet", wallet_address_server_endpoint),
+            self._build_get_wallet_address,
+            wallet_address_server_endpoint,
+            WalletAddress
+        )
+
+    @instrumented("wallet.get_keys")
+    async def get_keys(self, wallet_address_server_endpoint: str) -> JsonWebKeySet:
+        """Get keys from address server"""
+        return await self._get_cached(
+            ("jwks", wallet_address_server_endpoint),
+            self._build_get_keys,
+            wallet_address_server_endpoint,
+            JsonWebKeySet
+        )
@@ -0,0 +1,49 @@
+"""
+Open Payments asyncio API Client Module
+"""
+
+from open_payments_sdk.api.auth import AsyncAccessTokens, AsyncGrants
+from open_payments_sdk.api.resource import AsyncIncomingPayments, AsyncOutgoingPayments, AsyncQuotes
+from open_payments_sdk.api.wallet import AsyncWallet
+from open_payments_sdk.client.base import BaseOpenPaymentsClient
+from open_payments_sdk.http import AsyncHttpClient
+
+
+class AsyncOpenPaymentsClient(BaseOpenPaymentsClient):
+    """
+    Open Payments API Client for asyncio applications.
+
+    Mirrors ``OpenPaymentsClient`` but every API method is a coroutine and all
+    requests share one ``httpx.AsyncClient`` connection pool.
+    """
+    http_client_class = AsyncHttpClient
+    grants_class = AsyncGrants
+    access_tokens_class = AsyncAccessTokens
+    wallet_class = AsyncWallet
+    incoming_payments_class = AsyncIncomingPayments
+    outgoing_payments_class = AsyncOutgoingPayments
+    quotes_class = AsyncQuotes
+    lazy_classes = {
+        "token_manager": ("open_payments_sdk.api.tokens", "AsyncAccessTokenManager"),
+        "continuation_poller": ("open_payments_sdk.api.continuation", "AsyncContinuationPoller"),
+        "signature_verifier": ("open_payments_sdk.gnap_utils.verification", "AsyncSignatureVerifier"),
+        "batch": ("open_payments_sdk.api.batch", "AsyncBatch"),
+        "pipeline": ("open_payments_sdk.api.pipeline", "AsyncPaymentPipeline"),
+    }
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """
+        Stop token rotation, continuation polling and signing workers and release
+        pooled connections. An http client passed in by the caller is left open
+        """
+        for component in self._started():
+            await component.aclose()
+        self._close_signing_pool()
+        if self._owns_http_client:
+            await self.http_client.aclose()
@@ -0,0 +1,185 @@
+"""
+Construction shared by the sync and asyncio Open Payments API clients
+"""
+
+import importlib
+import logging
+from functools import cached_property
+from typing import Dict, Optional, Tuple
+
+from open_payments_sdk import configuration
+from open_payments_sdk.gnap_utils.security import SigningContext
+from open_payments_sdk.http import BaseHttpClient
+from open_payments_sdk.models.http import HttpClientStats
+from open_payments_sdk.utils.cache import TTLCache
+from open_payments_sdk.utils.grant_cache import GrantCache
+from open_payments_sdk.utils.parsing import ResponseParser
+from open_payments_sdk.utils.single_flight import SingleFlight
+
+
+class BaseOpenPaymentsClient:
+    """
+    Builds and wires the API classes of a client from its configuration.
+
+    Subclasses name the sync or asyncio classes of every component and add
+    closing; everything else is shared. Components in ``lazy_classes`` are
+    given as ``(module, class)`` and only imported on first access.
+    """
+    http_client_class = None
+    grants_class = None
+    access_tokens_class = None
+    wallet_class = None
+    incoming_payments_class = None
+    outgoing_payments_class = None
+    quotes_class = None
+    lazy_classes: Dict[str, Tuple[str, str]] = {}
+
+    def __init__(self, keyid: str, private_key: str, client_wallet_address: str,cfg: configuration.Configuration = None,  http_client: Optional[BaseHttpClient] = None):
+        if not cfg:
+            cfg = configuration.Configuration()
+        self._owns_http_client = http_client is None
+        if not http_client :
+            http_client = self.http_client_class(
+                http_timeout=cfg.http_timeout,
+                max_connections=cfg.max_connections,
+                max_keepalive_connections=cfg.max_keepalive_connections,
+                keepalive_expiry=cfg.keepalive_expiry,
+                http2=cfg.http2,
+                per_host_limits=cfg.per_host_limits,
+                retry_policy=cfg.retry_policy,
+                circuit_breaker=cfg.circuit_breaker,
+                transport=cfg.transport,
+                per_host_transports=cfg.per_host_transports
+            )
+        self.http_client = http_client
+        self.logger = logging.getLogger(type(self).__module__)
+        self.logger.addHandler(cfg.get_log_handler())
+        self.user_agent = cfg.user_agent
+        self.client_wallet_address = client_wallet_address
+        self.keyid = keyid
+        self.private_key = private_key
+        self._cfg = cfg
+        self.signing_context = SigningContext(
+            keyid=keyid,
+            private_key=private_key,
+            digest_algorithms=cfg.content_digest_algorithms,
+            json_encoder=cfg.json_encoder
+        )
+        self.response_parser = ResponseParser(
+            fast=cfg.fast_parsing,
+            lazy_pages=cfg.lazy_pages,
+            trust_urls=cfg.trust_server_urls
+        )
+        self.grant_cache = GrantCache(max_size=cfg.grant_cache_size) if cfg.grant_cache_size else None
+        self.grants = self.grants_class(
+            keyid=keyid,
+            private_key=private_key,
+            logger=self.logger,
+            http_client=self.http_client,
+            signing_context=self.signing_context,
+            parser=self.response_parser,
+            grant_cache=self.grant_cache,
+            instrumentation=cfg.instrumentation
+        )
+        self.access_tokens = self.access_tokens_class(
+            keyid=keyid,
+            private_key=private_key,
+            logger=self.logger,
+            http_client=self.http_client,
+            signing_context=self.signing_context,
+            parser=self.response_parser,
+            grant_cache=self.grant_cache,
+            instrumentation=cfg.instrumentation
+        )
+        self.single_flight = SingleFlight() if cfg.coalesce_requests else None
+        self.wallet_cache = TTLCache(max_size=cfg.wallet_cache_size, default_ttl=cfg.wallet_cache_ttl) if cfg.wallet_cache_size else None
+        self.wallet = self.wallet_class(
+            self.http_client,
+            cache=self.wallet_cache,
+            parser=self.response_parser,
+            instrumentation=cfg.instrumentation,
+            single_flight=self.single_flight
+        )
+        self.incoming_payments = self._resource_api(self.incoming_payments_class)
+        self.outgoing_payments = self._resource_api(self.outgoing_payments_class)
+        self.quotes = self._resource_api(self.quotes_class)
+
+    def _resource_api(self, api_class):
+        return api_class(
+            keyid=self.keyid,
+            private_key=self.private_key,
+            logger=self.logger,
+            http_client=self.http_client,
+            signing_context=self.signing_context,
+            parser=self.response_parser,
+            instrumentation=self._cfg.instrumentation,
+            single_flight=self.single_flight
+        )
+
+    # Components below are built, and their modules imported, on first access
+    # so that constructing a client only pays for the core API classes
+
+    def _lazy_class(self, component: str):
+        module, name = self.lazy_classes[component]
+        return getattr(importlib.import_module(module), name)
+
+    @cached_property
+    def token_manager(self):
+        return self._lazy_class("token_manager")(self.access_tokens, logger=self.logger)
+
+    @cached_property
+    def continuation_poller(self):
+        return self._lazy_class("continuation_poller")(self.grants, logger=self.logger)
+
+    @cached_property
+    def signature_verifier(self):
+        from open_payments_sdk.gnap_utils.verification import PublicKeyCache  # pylint: disable=import-outside-toplevel
+        return self._lazy_class("signature_verifier")(self.wallet, PublicKeyCache(ttl=self._cfg.wallet_cache_ttl))
+
+    @cached_property
+    def signing_pool(self):
+        if not self._cfg.signing_workers:
+            return None
+        from open_payments_sdk.gnap_utils.signing_pool import SigningPool  # pylint: disable=import-outside-toplevel
+        return SigningPool(self.signing_context, workers=self._cfg.signing_workers)
+
+    @cached_property
+    def batch(self):
+        return self._lazy_class("batch")(
+            quotes=self.quotes,
+            outgoing_payments=self.outgoing_payments,
+            max_concurrency=self._cfg.batch_max_concurrency,
+            signing_pool=self.signing_pool
+        )
+
+    @cached_property
+    def pipeline(self):
+        return self._lazy_class("pipeline")(
+            wallet=self.wallet,
+            grants=self.grants,
+            incoming_payments=self.incoming_payments,
+            quotes=self.quotes,
+            outgoing_payments=self.outgoing_payments,
+            continuation_poller=self.continuation_poller,
+            client_wallet_address=self.client_wallet_address,
+            stage_concurrency=self._cfg.pipeline_stage_concurrency,
+            max_in_flight=self._cfg.pipeline_max_in_flight,
+            finish_uri=self._cfg.pipeline_finish_uri
+        )
+
+    def pool_stats(self) -> HttpClientStats:
+        """
+        Return connection pool statistics of the underlying http client
+        """
+        return self.http_client.pool_stats()
+
+    def _started(self) -> list:
+        """
+        Background components created so far, which closing must stop
+        """
+        created = self.__dict__
+        return [created[name] for name in ("token_manager", "continuation_poller") if name in created]
+
+    def _close_signing_pool(self) -> None:
+        if self.__dict__.get("signing_pool") is not None:
+            self.signing_pool.close()
@@ -5,6 +5,32 @@ class Configuration:
     def __init__(self):
         self.logging_formatter = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
         self.user_agent = "open-payments-sdk/python"
+        self.http_timeout = 10.0
+        self.max_connections = 100
+        self.max_keepalive_connections = 20
+        self.keepalive_expiry = 5.0
+        self.http2 = False
+        self.per_host_limits = {}
+        self.transport = None
+        self.per_host_transports = {}
+        self.wallet_cache_size = 0
+        self.wallet_cache_ttl = 60.0
+        self.coalesce_requests = False
+        self.grant_cache_size = 0
+        self.batch_max_concurrency = 10
+        self.pipeline_stage_concurrency = {}
+        self.pipeline_max_in_flight = 32
+        self.pipeline_finish_uri = None
+        self.signing_workers = 0
+        self.retry_policy = None
+        self.circuit_breaker = None
+        self.fast_parsing = False
+        # list pages only; works with or without fast_parsing and pays off when pages are partly read
+        self.lazy_pages = False
+        self.trust_server_urls = False
+        self.content_digest_algorithms = ("sha-512",)
+        self.json_encoder = None
+        self.instrumentation = None
 
     def get_log_handler(self) -> logging.Handler:
         """
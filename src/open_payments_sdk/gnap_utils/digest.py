@@ -0,0 +1,81 @@
+"""
+Content-Digest computation (RFC 9530)
+
+Digests are computed incrementally so that file bodies can be hashed while
+they are read, without first loading the whole file into memory.
+"""
+import hashlib
+import json
+from typing import IO, Any, Callable, Optional, Sequence, Tuple
+
+import http_sfv
+from pydantic import BaseModel
+
+DIGEST_ALGORITHMS = {"sha-256": hashlib.sha256, "sha-512": hashlib.sha512}
+DEFAULT_DIGEST_ALGORITHMS = ("sha-512",)
+CHUNK_SIZE = 64 * 1024
+
+
+class ContentDigest:
+    """
+    Incremental Content-Digest over one or more algorithms
+    """
+    __slots__ = ("algorithms", "length", "_hashes")
+
+    def __init__(self, algorithms: Sequence[str] = DEFAULT_DIGEST_ALGORITHMS):
+        unknown = [name for name in algorithms if name not in DIGEST_ALGORITHMS]
+        if unknown or not algorithms:
+            raise ValueError(f"Unsupported digest algorithms {unknown or algorithms}, use sha-256 or sha-512")
+        self.algorithms = tuple(algorithms)
+        self.length = 0
+        self._hashes = [DIGEST_ALGORITHMS[name]() for name in self.algorithms]
+
+    def update(self, chunk: bytes) -> None:
+        for digest in self._hashes:
+            digest.update(chunk)
+        self.length += len(chunk)
+
+    def header(self) -> str:
+        """
+        Serialized Content-Digest header value
+        """
+        return str(http_sfv.Dictionary({
+            name: digest.digest() for name, digest in zip(self.algorithms, self._hashes)
+        }))
+
+
+def digest_bytes(content: bytes, algorithms: Sequence[str] = DEFAULT_DIGEST_ALGORITHMS) -> str:
+    """
+    Content-Digest header value for a buffered body
+    """
+    digest = ContentDigest(algorithms)
+    digest.update(content)
+    return digest.header()
+
+
+def digest_file(fileobj: IO[bytes], algorithms: Sequence[str] = DEFAULT_DIGEST_ALGORITHMS) -> Tuple[str, int]:
+    """
+    Hash a seekable binary file from its current position in chunks and rewind it.
+    Returns the Content-Digest header value and the number of bytes hashed
+    """
+    start = fileobj.tell()
+    digest = ContentDigest(algorithms)
+    for chunk in iter(lambda: fileobj.read(CHUNK_SIZE), b""):
+        digest.update(chunk)
+    fileobj.seek(start)
+    return digest.header(), digest.length
+
+
+def encode_json(data: Any, encoder: Optional[Callable[[Any], bytes]] = None) -> bytes:
+    """
+    Serialize a model, without its unset fields, or JSON data to the compact body bytes.
+    Models are serialized by pydantic directly, without an intermediate dict,
+    unless encoder, e.g. ``orjson.dumps``, is given
+    """
+    if isinstance(data, BaseModel):
+        if encoder is None:
+            return data.model_dump_json(exclude_unset=True).encode()
+        data = data.model_dump(exclude_unset=True, mode="json")
+    if encoder is None:
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":"), allow_nan=False).encode()
+    return encoder(data)
@@ -1,7 +1,9 @@
 """
 HTTP Signatures Helper functions
 """
+from typing import Union
 
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
 from http_message_signatures import HTTPSignatureKeyResolver
 from http_message_signatures.resolvers import HTTPSignatureComponentResolver
 from http_message_signatures.structures import CaseInsensitiveDict
@@ -11,18 +13,25 @@ from open_payments_sdk.gnap_utils.keys import KeyManager
 class OPKeyResolver(HTTPSignatureKeyResolver):
     """
     Key Resolver Class
+
+    The private key is given as PEM, parsed once at construction, or as an
+    already parsed key object. The resolved key objects are handed to the
+    signer as is, so signing never re-parses PEM.
     """
-    def __init__(self, keyid: str, private_key: str):
+    def __init__(self, keyid: str, private_key: Union[str, Ed25519PrivateKey]):
         super().__init__()
-        self.keys = {keyid: private_key.encode("utf-8")}
+        if isinstance(private_key, Ed25519PrivateKey):
+            parsed_key = private_key
+        else:
+            parsed_key = KeyManager().load_ed25519_private_key_from_pem(private_key)
+        self.keys = {keyid: parsed_key}
+        self.public_keys = {keyid: parsed_key.public_key()}
 
     def resolve_public_key(self, key_id: str):
         """
         Get Public Key
         """
-        key_manager = KeyManager()
-        private_key = key_manager.load_ed25519_private_key_from_pem(self.keys[key_id])
-        return private_key.public_key()
+        return self.public_keys[key_id]
 
     def resolve_private_key(self, key_id: str):
         """
@@ -2,28 +2,121 @@
 Shared class for making secure requests
 """
 
-import hashlib
+from functools import cached_property
 from logging import Logger
-from typing import Sequence
-from http_message_signatures import HTTPMessageSigner, algorithms
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
 import http_sfv
 from httpx import Request
+from open_payments_sdk.gnap_utils.digest import DEFAULT_DIGEST_ALGORITHMS, ContentDigest, digest_bytes
 from open_payments_sdk.gnap_utils.hash import HashManager
-from open_payments_sdk.gnap_utils.http_signatures import OPKeyResolver, PatchedHTTPSignatureComponentResolver
 from open_payments_sdk.gnap_utils.keys import KeyManager
+from open_payments_sdk.gnap_utils.templates import RequestTemplate
+from open_payments_sdk.utils.instrumentation import Instrumentation
+from open_payments_sdk.utils.parsing import DEFAULT_PARSER, ResponseParser
+from open_payments_sdk.utils.utils import get_default_headers
 
 
-class SecurityBase():
+class SigningContext:
     """
-    Base class to provide shared functionality for making authenticated requests
+    Key material and HTTP message signer shared by all API classes of a client.
+
+    The context holds no per-request state, so a single instance can be used
+    from several threads at once. ``digest_algorithms`` selects the
+    Content-Digest algorithms (sha-256 and/or sha-512).
+    ``json_encoder``, e.g. ``orjson.dumps``, replaces pydantic's serializer for
+    request bodies.
+
+    Requests are signed by their templates, so the ``http_message_signatures``
+    signer and key resolver are only imported and built when first used.
     """
-    def __init__(self, keyid: str, private_key: str, logger: Logger):
+    def __init__(self, keyid: str, private_key: str, digest_algorithms: Sequence[str] = DEFAULT_DIGEST_ALGORITHMS, json_encoder: Optional[Callable[[Any], bytes]] = None):
+        self.keyid = keyid
+        self.private_key = private_key
+        self.digest_algorithms = ContentDigest(digest_algorithms).algorithms
+        self.json_encoder = json_encoder
         self.key_manager = KeyManager()
         self.hash_manager = HashManager()
-        self.http_signatures = HTTPMessageSigner(signature_algorithm=algorithms.ED25519, key_resolver=OPKeyResolver(keyid=keyid,private_key=private_key),component_resolver_class=PatchedHTTPSignatureComponentResolver)
+        self.private_key_object = self.key_manager.load_ed25519_private_key_from_pem(private_key)
+        self.keyid_param = str(http_sfv.Item(keyid))
+
+    @cached_property
+    def key_resolver(self):
+        # pylint: disable=import-outside-toplevel
+        from open_payments_sdk.gnap_utils.http_signatures import OPKeyResolver
+        return OPKeyResolver(keyid=self.keyid, private_key=self.private_key_object)
+
+    @cached_property
+    def http_signatures(self):
+        # pylint: disable=import-outside-toplevel
+        from http_message_signatures import HTTPMessageSigner, algorithms
+        from open_payments_sdk.gnap_utils.http_signatures import PatchedHTTPSignatureComponentResolver
+        return HTTPMessageSigner(signature_algorithm=algorithms.ED25519, key_resolver=self.key_resolver,component_resolver_class=PatchedHTTPSignatureComponentResolver)
+
+
+class SecurityBase():
+    """
+    Base class to provide shared functionality for making authenticated requests
+    """
+    max_templates = 256
+
+    def __init__(self, keyid: str, private_key: str, logger: Logger, signing_context: SigningContext = None, parser: ResponseParser = None, instrumentation: Instrumentation = None):
+        if signing_context is None:
+            signing_context = SigningContext(keyid=keyid, private_key=private_key)
+        self.signing_context = signing_context
+        self.key_manager = signing_context.key_manager
+        self.hash_manager = signing_context.hash_manager
         self.keyid = keyid
         self.private_key = private_key
         self.logger = logger
+        self.parser = parser or DEFAULT_PARSER
+        self.instrumentation = instrumentation
+        self._templates: Dict[tuple, RequestTemplate] = {}
+
+    @property
+    def http_signatures(self):
+        return self.signing_context.http_signatures
+
+    def _template(
+            self,
+            name: str,
+            endpoint: str,
+            method: str,
+            path: str,
+            covered_components: Sequence[str]
+        ) -> RequestTemplate:
+        """
+        Return the request template for name at endpoint, compiling it on first use.
+        Templates covering content-type send the default JSON headers. Without a path
+        the endpoint is requested exactly as given, e.g. an advertised auth server URL
+        """
+        key = (name, endpoint)
+        template = self._templates.get(key)
+        if template is None:
+            if len(self._templates) >= self.max_templates:
+                self._templates.clear()
+            headers = get_default_headers() if "content-type" in covered_components else None
+            url = endpoint.rstrip("/") + path if path else endpoint
+            template = RequestTemplate(method, url, covered_components, headers)
+            self._templates[key] = template
+        return template
+
+    def _idempotent_template(
+            self,
+            name: str,
+            endpoint: str,
+            method: str,
+            path: str,
+            covered_components: Sequence[str],
+            idempotency_key: Optional[str]
+        ) -> Tuple[RequestTemplate, Optional[Dict[str, str]]]:
+        """
+        Return the request template and the headers for a request with an optional idempotency key.
+        A given key is sent in the Idempotency-Key header, which the signature then covers
+        """
+        if not idempotency_key:
+            return self._template(name, endpoint, method, path, covered_components), None
+        template = self._template(f"{name}+idempotency-key", endpoint, method, path, (*covered_components, "idempotency-key"))
+        return template, {"Idempotency-Key": idempotency_key}
 
     def get_auth_header(self, access_token: str) -> dict:
         """
@@ -49,6 +142,6 @@ class SecurityBase():
         """
         Compute Digest
         """
-        request.headers["Content-Digest"] = str(http_sfv.Dictionary({"sha-512": hashlib.sha512(request.content).digest()}))
+        request.headers["Content-Digest"] = digest_bytes(request.content, self.signing_context.digest_algorithms)
         return request
     
\ No newline at end of file
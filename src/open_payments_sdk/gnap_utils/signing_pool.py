@@ -0,0 +1,155 @@
+"""
+Parallel request signing
+
+Ed25519 signing in ``cryptography`` holds the GIL, so signing from more
+threads does not use more cores. ``SigningPool`` signs on worker processes
+instead: each worker loads the private key once, and batches of signature
+bases are sent to it in chunks so that one round trip covers many requests.
+"""
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from httpx import Request
+
+from open_payments_sdk.gnap_utils.keys import KeyManager
+from open_payments_sdk.gnap_utils.templates import RequestTemplate
+
+_worker_key = None
+
+
+def _load_key(private_key: str) -> None:
+    global _worker_key  # pylint: disable=global-statement
+    _worker_key = KeyManager().load_ed25519_private_key_from_pem(private_key)
+
+
+def _sign_chunk(bases: List[bytes]) -> List[Union[bytes, Exception]]:
+    signatures: List[Union[bytes, Exception]] = []
+    for base in bases:
+        try:
+            signatures.append(_worker_key.sign(base))
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            signatures.append(exc)
+    return signatures
+
+
+class SigningPool:
+    """
+    Signs prepared requests on a pool of worker processes.
+
+    Requests are built unsigned, e.g. with ``template.build(..., sign=False)``,
+    and signed in one call. Signature bases are computed in the calling process
+    and only the Ed25519 signatures are computed by the workers. A request that
+    cannot be signed is returned as the exception that stopped it, so one failure
+    does not discard the rest of the batch.
+
+    Experimental: on a single core the pool is slower than signing inline, and
+    it only pays off when several cores are free for the workers. Measure with
+    ``benchmarks.bench_signing_pool`` before enabling it.
+    """
+    def __init__(self, signing_context, workers: Optional[int] = None, chunk_size: int = 256, start_method: str = "spawn"):
+        self.signing_context = signing_context
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self._templates: Dict[tuple, RequestTemplate] = {}
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context(start_method),
+            initializer=_load_key,
+            initargs=(signing_context.private_key,)
+        )
+
+    def _template(self, covered_components: Sequence[str]) -> RequestTemplate:
+        key = tuple(covered_components)
+        template = self._templates.get(key)
+        if template is None:
+            template = self._templates[key] = RequestTemplate("", "", key)
+        return template
+
+    def _submit(self, requests: Sequence[Request], covered_components: Sequence[str]) -> Tuple[List[Union[str, Exception]], List[Tuple[List[int], Future]]]:
+        """
+        Compute signature bases and submit them in chunks; requests whose base fails get their exception as params
+        """
+        template = self._template(covered_components)
+        params: List[Union[str, Exception]] = []
+        indexes: List[int] = []
+        bases: List[bytes] = []
+        for index, request in enumerate(requests):
+            if isinstance(request, Exception):
+                # a request that failed to build is passed through
+                params.append(request)
+                continue
+            try:
+                signature_params, base = template.signature_base(request, self.signing_context)
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                params.append(exc)
+                continue
+            params.append(signature_params)
+            indexes.append(index)
+            bases.append(base)
+        size = max(1, min(self.chunk_size, -(-len(bases) // self.workers)))
+        chunks = [
+            (indexes[i:i + size], self._executor.submit(_sign_chunk, bases[i:i + size]))
+            for i in range(0, len(bases), size)
+        ]
+        return params, chunks
+
+    @staticmethod
+    def _apply(
+            requests: Sequence[Request],
+            params: List[Union[str, Exception]],
+            chunks: List[Tuple[List[int], Union[List[Union[bytes, Exception]], Exception]]]
+        ) -> List[Union[Request, Exception]]:
+        signatures: List[Union[bytes, Exception, None]] = [None] * len(requests)
+        for indexes, chunk in chunks:
+            for position, index in enumerate(indexes):
+                # a chunk that failed as a whole, e.g. a crashed worker, fails each of its requests
+                signatures[index] = chunk if isinstance(chunk, Exception) else chunk[position]
+        signed: List[Union[Request, Exception]] = []
+        for request, signature_params, signature in zip(requests, params, signatures):
+            if isinstance(signature_params, Exception):
+                signed.append(signature_params)
+            elif isinstance(signature, Exception):
+                signed.append(signature)
+            else:
+                signed.append(RequestTemplate.apply_signature(request, signature_params, signature))
+        return signed
+
+    def sign(self, requests: Sequence[Request], covered_components: Sequence[str]) -> List[Union[Request, Exception]]:
+        """
+        Sign requests over covered_components, returning them in order.
+        Requests that could not be signed are replaced by their exception
+        """
+        params, chunks = self._submit(requests, covered_components)
+        results = []
+        for indexes, future in chunks:
+            try:
+                results.append((indexes, future.result()))
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                results.append((indexes, exc))
+        return self._apply(requests, params, results)
+
+    async def sign_async(self, requests: Sequence[Request], covered_components: Sequence[str]) -> List[Union[Request, Exception]]:
+        """
+        Sign requests over covered_components without blocking the event loop
+        """
+        params, chunks = self._submit(requests, covered_components)
+        results = await asyncio.gather(*(asyncio.wrap_future(future) for _, future in chunks), return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException) and not isinstance(result, Exception):
+                raise result
+        return self._apply(requests, params, [(indexes, result) for (indexes, _), result in zip(chunks, results)])
+
+    def close(self) -> None:
+        """
+        Stop the worker processes
+        """
+        self._executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
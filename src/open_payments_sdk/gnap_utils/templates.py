@@ -0,0 +1,155 @@
+"""
+Precompiled request templates
+
+A template fixes everything about an endpoint's requests that does not change
+between calls: method, URL prefix, static headers and the covered
+components, whose signature base keys and ``Signature-Input`` prefix are
+serialized once. Building a request only fills in the path suffix, body,
+access token and signature.
+
+Bodies given as seekable files are hashed chunk by chunk and sent as a
+stream with an explicit ``Content-Length`` so that ``content-length`` stays
+signable. The stream can be sent by both the sync and the async client.
+"""
+import asyncio
+import base64
+import time
+from typing import IO, AsyncIterator, Dict, Iterator, Optional, Sequence, Tuple
+
+import http_sfv
+from httpx import AsyncByteStream, Request, SyncByteStream
+
+from open_payments_sdk.gnap_utils.digest import CHUNK_SIZE, digest_bytes, digest_file, encode_json
+from open_payments_sdk.utils.instrumentation import CURRENT_CALL
+
+SIGNATURE_LABEL = "sig1"
+SIGNATURE_ALGORITHM = "ed25519"
+
+
+class FileBodyStream(SyncByteStream, AsyncByteStream):
+    """
+    Request body read from a binary file in chunks. Every iteration starts from
+    the position the file had when the stream was created, so retried attempts
+    send the same bytes that were digested. Async reads run in a worker thread
+    so that they do not block the event loop
+    """
+    def __init__(self, fileobj: IO[bytes], chunk_size: int = CHUNK_SIZE):
+        self.fileobj = fileobj
+        self.chunk_size = chunk_size
+        self.start = fileobj.tell()
+
+    def __iter__(self) -> Iterator[bytes]:
+        self.fileobj.seek(self.start)
+        for chunk in iter(lambda: self.fileobj.read(self.chunk_size), b""):
+            yield chunk
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        await asyncio.to_thread(self.fileobj.seek, self.start)
+        while True:
+            chunk = await asyncio.to_thread(self.fileobj.read, self.chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+class RequestTemplate:
+    """
+    Method, URL prefix, static headers and covered components of one endpoint
+    """
+    __slots__ = ("method", "url", "headers", "covered_components", "digest", "_component_keys", "_signature_params")
+
+    def __init__(self, method: str, url: str, covered_components: Sequence[str], headers: Optional[Dict[str, str]] = None):
+        self.method = method
+        self.url = url
+        self.headers = dict(headers or {})
+        self.covered_components = tuple(covered_components)
+        self.digest = "content-digest" in self.covered_components
+        self._component_keys = tuple(str(http_sfv.List([http_sfv.Item(component)])) for component in self.covered_components)
+        self._signature_params = str(http_sfv.InnerList([http_sfv.Item(component) for component in self.covered_components]))
+
+    def build(
+            self,
+            signer,
+            access_token: Optional[str] = None,
+            path: str = "",
+            json=None,
+            params: Optional[dict] = None,
+            headers: Optional[Dict[str, str]] = None,
+            content=None,
+            sign: bool = True
+    ) -> Request:
+        """
+        Build, digest and sign a request with signer, a ``SecurityBase``.
+        json may be a model, sent without its unset fields, or JSON data; it is
+        encoded once and the same bytes are hashed and sent.
+        content may be bytes or a seekable binary file.
+        With sign=False the request is returned unsigned, e.g. for a ``SigningPool``
+        """
+        signing_context = signer.signing_context
+        req_headers = self.headers.copy()
+        if access_token is not None:
+            req_headers["Authorization"] = f"GNAP {access_token}"
+        if headers:
+            req_headers.update(headers)
+        if json is not None:
+            req_headers.setdefault("Content-Type", "application/json")
+            content = encode_json(json, signing_context.json_encoder)
+        call = CURRENT_CALL.get()
+        if content is None or isinstance(content, bytes):
+            request = Request(self.method, self.url + path, headers=req_headers, content=content, params=params)
+            if call is not None:
+                call.mark("build")
+            if self.digest:
+                # hash the encoded body itself rather than reading it back from the request
+                request.headers["Content-Digest"] = digest_bytes(content or b"", signing_context.digest_algorithms)
+        else:
+            digest_header, length = digest_file(content, signing_context.digest_algorithms)
+            req_headers["Content-Length"] = str(length)
+            if self.digest:
+                req_headers["Content-Digest"] = digest_header
+            request = Request(self.method, self.url + path, headers=req_headers, stream=FileBodyStream(content), params=params)
+            # httpx only adds default headers to requests built from content
+            request.headers.setdefault("Host", request.url.netloc.decode("ascii"))
+        if call is not None:
+            call.mark("digest" if self.digest else "build")
+        if not sign:
+            return request
+        self.sign(request, signing_context)
+        if call is not None:
+            call.mark("sign")
+        return request
+
+    def _component_value(self, request: Request, component: str) -> str:
+        if component == "@method":
+            return request.method
+        if component == "@target-uri":
+            return str(request.url)
+        return request.headers[component]
+
+    def signature_base(self, request: Request, signing_context) -> Tuple[str, bytes]:
+        """
+        Return the ``Signature-Input`` parameters and the signature base of request
+        """
+        signature_params = f"{self._signature_params};created={int(time.time())};keyid={signing_context.keyid_param};alg=\"{SIGNATURE_ALGORITHM}\""
+        lines = [
+            f"{key}: {self._component_value(request, component)}"
+            for key, component in zip(self._component_keys, self.covered_components)
+        ]
+        lines.append(f'"@signature-params": {signature_params}')
+        return signature_params, "\n".join(lines).encode()
+
+    @staticmethod
+    def apply_signature(request: Request, signature_params: str, signature: bytes) -> Request:
+        """
+        Set the ``Signature-Input`` and ``Signature`` headers
+        """
+        request.headers["Signature-Input"] = f"{SIGNATURE_LABEL}={signature_params}"
+        request.headers["Signature"] = f"{SIGNATURE_LABEL}=:{base64.b64encode(signature).decode()}:"
+        return request
+
+    def sign(self, request: Request, signing_context) -> Request:
+        """
+        Add ``Signature-Input`` and ``Signature`` headers for the template's covered components
+        """
+        signature_params, base = self.signature_base(request, signing_context)
+        return self.apply_signature(request, signature_params, signing_context.private_key_object.sign(base))
@@ -0,0 +1,263 @@
+"""
+Verification of HTTP message signatures on responses and inbound requests
+"""
+import base64
+import hmac
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Callable, Optional, Tuple, Union
+
+import http_sfv
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
+from http_message_signatures import HTTPMessageVerifier, HTTPSignatureKeyResolver, algorithms
+from http_message_signatures.exceptions import InvalidSignature
+from http_message_signatures.structures import VerifyResult
+from httpx import Request, Response
+
+from open_payments_sdk.gnap_utils.digest import DIGEST_ALGORITHMS
+from open_payments_sdk.gnap_utils.http_signatures import PatchedHTTPSignatureComponentResolver
+
+
+def load_public_key(jwk) -> Ed25519PublicKey:
+    """
+    Decode the Ed25519 public key of a JSON web key, given as a model or dict
+    """
+    x = jwk["x"] if isinstance(jwk, dict) else jwk.x
+    return Ed25519PublicKey.from_public_bytes(base64.urlsafe_b64decode(x + "=" * (-len(x) % 4)))
+
+
+def signature_key_id(message: Union[Request, Response]) -> str:
+    """
+    Return the keyid parameter of the message's Signature-Input header
+    """
+    sig_inputs = _parse_signature_input(message)
+    keyid = next(iter(sig_inputs.values())).params.get("keyid")
+    if not keyid:
+        raise InvalidSignature("Signature-Input has no keyid parameter")
+    return keyid
+
+
+def _parse_signature_input(message: Union[Request, Response]) -> http_sfv.Dictionary:
+    header = message.headers.get("Signature-Input")
+    if not header:
+        raise InvalidSignature('Expected "Signature-Input" header field to be present')
+    sig_inputs = http_sfv.Dictionary()
+    try:
+        sig_inputs.parse(header.encode("utf-8"))
+    except ValueError as exc:
+        raise InvalidSignature('Malformed structured header field "Signature-Input"') from exc
+    if len(sig_inputs) != 1:
+        raise InvalidSignature("Multiple signatures are not supported")
+    return sig_inputs
+
+
+def verify_content_digest(message: Union[Request, Response]) -> None:
+    """
+    Check every supported digest in the Content-Digest header against the message body
+    """
+    header = message.headers.get("Content-Digest")
+    if not header:
+        raise InvalidSignature("Message with a body has no Content-Digest header")
+    digests = http_sfv.Dictionary()
+    try:
+        digests.parse(header.encode("utf-8"))
+    except ValueError as exc:
+        raise InvalidSignature('Malformed structured header field "Content-Digest"') from exc
+    supported = [name for name in digests if name in DIGEST_ALGORITHMS]
+    if not supported:
+        raise InvalidSignature("Content-Digest uses no supported algorithm")
+    for name in supported:
+        if not hmac.compare_digest(digests[name].value, DIGEST_ALGORITHMS[name](message.content).digest()):
+            raise InvalidSignature("Content-Digest does not match the message body")
+
+
+class PublicKeyCache(HTTPSignatureKeyResolver):
+    """
+    Decoded Ed25519 public keys by wallet address and ``kid``.
+
+    Keys are added from ``JsonWebKeySet`` documents and kept in a bounded LRU,
+    so verifying a message from a known key needs no parsing and no network.
+    A ``kid`` only names a key within the key set of one wallet address, so
+    keys fetched for one wallet never verify messages attributed to another.
+    Keys added without a wallet address are trusted for messages that name
+    none. Entries expire ttl seconds after they were added, like the key sets
+    of the wallet cache, so rotated or revoked keys are fetched again.
+    """
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self._keys: "OrderedDict[Tuple[Optional[str], str], Tuple[Ed25519PublicKey, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, key: Tuple[Optional[str], str]) -> bool:
+        with self._lock:
+            return self._get(key) is not None
+
+    def _get(self, key: Tuple[Optional[str], str]) -> Optional[Ed25519PublicKey]:
+        entry = self._keys.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= self.clock():
+            del self._keys[key]
+            return None
+        self._keys.move_to_end(key)
+        return entry[0]
+
+    def add_key(self, jwk, wallet_address: Optional[str] = None) -> None:
+        """
+        Decode and store a single JSON web key of wallet_address.
+        Raises ``ValueError`` for keys that are not OKP/Ed25519
+        """
+        kty, crv = (_jwk_field(jwk, "kty"), _jwk_field(jwk, "crv"))
+        if (kty, crv) != ("OKP", "Ed25519"):
+            raise ValueError(f"Unsupported key type {kty}/{crv}, expected OKP/Ed25519")
+        key = (wallet_address, _jwk_field(jwk, "kid"))
+        public_key = load_public_key(jwk)
+        expires = self.clock() + self.ttl if self.ttl is not None else float("inf")
+        with self._lock:
+            self._keys[key] = (public_key, expires)
+            self._keys.move_to_end(key)
+            while len(self._keys) > self.max_size:
+                self._keys.popitem(last=False)
+
+    def add_key_set(self, jwks, wallet_address: Optional[str] = None) -> None:
+        """
+        Store the Ed25519 keys of the key set of wallet_address, given as a ``JsonWebKeySet`` or dict.
+        Keys of other types cannot verify signatures and are skipped
+        """
+        for jwk in (jwks["keys"] if isinstance(jwks, dict) else jwks.keys):
+            try:
+                self.add_key(jwk, wallet_address)
+            except ValueError:
+                continue
+
+    def discard(self, key_id: str, wallet_address: Optional[str] = None) -> None:
+        with self._lock:
+            self._keys.pop((wallet_address, key_id), None)
+
+    def resolve(self, wallet_address: Optional[str], key_id: str) -> Ed25519PublicKey:
+        """
+        Return the key key_id of wallet_address
+        """
+        with self._lock:
+            public_key = self._get((wallet_address, key_id))
+        if public_key is None:
+            raise InvalidSignature(f"Unknown key id {key_id}")
+        return public_key
+
+    def for_wallet(self, wallet_address: Optional[str]) -> HTTPSignatureKeyResolver:
+        """
+        Key resolver limited to the keys of wallet_address
+        """
+        return _WalletKeyResolver(self, wallet_address)
+
+    def resolve_public_key(self, key_id: str) -> Ed25519PublicKey:
+        return self.resolve(None, key_id)
+
+    def resolve_private_key(self, key_id: str):
+        raise NotImplementedError("PublicKeyCache only holds public keys")
+
+
+class _WalletKeyResolver(HTTPSignatureKeyResolver):
+    def __init__(self, cache: PublicKeyCache, wallet_address: Optional[str]):
+        self.cache = cache
+        self.wallet_address = wallet_address
+
+    def resolve_public_key(self, key_id: str) -> Ed25519PublicKey:
+        return self.cache.resolve(self.wallet_address, key_id)
+
+    def resolve_private_key(self, key_id: str):
+        raise NotImplementedError("PublicKeyCache only holds public keys")
+
+
+def _jwk_field(jwk, name: str) -> Optional[str]:
+    value = jwk.get(name) if isinstance(jwk, dict) else getattr(jwk, name)
+    return getattr(value, "value", value)
+
+
+class SignatureVerifier:
+    """
+    Verify ``Signature``/``Signature-Input`` on httpx responses and inbound requests.
+
+    Keys are looked up in a ``PublicKeyCache`` under the sender's wallet
+    address. On a miss, the key set of that wallet address is fetched with
+    ``Wallet.get_keys`` and cached. A wallet's key set is fetched at most once
+    per ``refetch_interval`` seconds, so messages naming unknown keys cannot
+    make the verifier fetch it on every message. The body of a message, if
+    any, must match its ``Content-Digest``, and the signature must cover that
+    header.
+
+    Failures raise ``http_message_signatures.InvalidSignature``.
+    """
+    def __init__(
+            self,
+            wallet=None,
+            key_cache: Optional[PublicKeyCache] = None,
+            max_age: timedelta = timedelta(minutes=5),
+            refetch_interval: float = 30.0
+        ):
+        self.wallet = wallet
+        self.key_cache = key_cache if key_cache is not None else PublicKeyCache()
+        self.max_age = max_age
+        self.refetch_interval = refetch_interval
+        self._fetched_at: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _check(self, message: Union[Request, Response], wallet_address: Optional[str]) -> VerifyResult:
+        if message.content:
+            covered = [item.value for item in next(iter(_parse_signature_input(message).values()))]
+            if "content-digest" not in covered:
+                raise InvalidSignature("Signature does not cover the Content-Digest header")
+            verify_content_digest(message)
+        verifier = HTTPMessageVerifier(
+            signature_algorithm=algorithms.ED25519,
+            key_resolver=self.key_cache.for_wallet(wallet_address),
+            component_resolver_class=PatchedHTTPSignatureComponentResolver
+        )
+        return verifier.verify(message, max_age=self.max_age)[0]
+
+    def _missing_key(self, message: Union[Request, Response], wallet_address: Optional[str]) -> bool:
+        """
+        Whether the signing key must be fetched from wallet_address first. Claims the
+        wallet's fetch for refetch_interval seconds, even if the fetch then fails
+        """
+        if wallet_address is None or self.wallet is None:
+            return False
+        if (wallet_address, signature_key_id(message)) in self.key_cache:
+            return False
+        now = self.key_cache.clock()
+        with self._lock:
+            fetched_at = self._fetched_at.get(wallet_address)
+            if fetched_at is not None and now - fetched_at < self.refetch_interval:
+                return False
+            self._fetched_at[wallet_address] = now
+            self._fetched_at.move_to_end(wallet_address)
+            while len(self._fetched_at) > self.key_cache.max_size:
+                self._fetched_at.popitem(last=False)
+        return True
+
+    def verify(self, message: Union[Request, Response], wallet_address: Optional[str] = None) -> VerifyResult:
+        """
+        Verify the message signature with the keys of wallet_address, fetching them on a cache miss.
+        Without wallet_address, only keys added to the cache without one are used
+        """
+        if self._missing_key(message, wallet_address):
+            self.key_cache.add_key_set(self.wallet.get_keys(wallet_address), wallet_address)
+        return self._check(message, wallet_address)
+
+
+class AsyncSignatureVerifier(SignatureVerifier):
+    """
+    asyncio variant of ``SignatureVerifier`` for use with ``AsyncWallet``
+    """
+
+    async def verify(self, message: Union[Request, Response], wallet_address: Optional[str] = None) -> VerifyResult:
+        """
+        Verify the message signature with the keys of wallet_address, fetching them on a cache miss
+        """
+        if self._missing_key(message, wallet_address):
+            self.key_cache.add_key_set(await self.wallet.get_keys(wallet_address), wallet_address)
+        return self._check(message, wallet_address)
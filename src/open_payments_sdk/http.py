@@ -1,16 +1,172 @@
 """
-HTTP Client 
+HTTP Client
 """
-from httpx import Request, Response, Client
+import asyncio
+import threading
+import time
+from typing import Dict, Optional, Union
 
-class HttpClient:
+from httpx import (AsyncBaseTransport, AsyncClient, AsyncHTTPTransport,
+                   BaseTransport, Client, HTTPTransport, Limits, Request,
+                   Response, TransportError)
+
+from open_payments_sdk.models.http import ConnectionPoolStats, HttpClientStats
+from open_payments_sdk.retry import CircuitBreaker, RetryPolicy
+from open_payments_sdk.utils.instrumentation import CURRENT_CALL
+
+
+Transport = Union[BaseTransport, AsyncBaseTransport]
+
+
+class BaseHttpClient:
     """
-    HTTP Client
+    Shared configuration, request building and pool statistics for the
+    sync and async HTTP clients.
+
+    Requests go through pooled HTTP transports built from ``limits`` and
+    ``http2``, or through ``transport`` when one is given, e.g. an
+    ``httpx.MockTransport`` in tests. ``per_host_transports`` routes hosts to
+    their own transports, and ``per_host_limits`` builds them from limits, where
+    an ``"http2"`` key overrides ``http2`` for that host. Transports passed in
+    are closed together with the client.
     """
     http_timeout: float
 
-    def __init__(self, http_timeout: float):
+    def __init__(
+            self,
+            http_timeout: float,
+            max_connections: Optional[int] = 100,
+            max_keepalive_connections: Optional[int] = 20,
+            keepalive_expiry: Optional[float] = 5.0,
+            http2: bool = False,
+            per_host_limits: Optional[Dict[str, dict]] = None,
+            retry_policy: Optional[RetryPolicy] = None,
+            circuit_breaker: Optional[CircuitBreaker] = None,
+            transport: Optional[Transport] = None,
+            per_host_transports: Optional[Dict[str, Transport]] = None
+    ):
         self.http_timeout = http_timeout
+        self.limits = Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.http2 = http2
+        self.per_host_limits = per_host_limits or {}
+        self.transport = transport
+        self.per_host_transports = per_host_transports or {}
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self._client = None
+        self._transports: dict = {}
+        self._lock = threading.Lock()
+        self._requests_sent = 0
+        self._requests_in_flight = 0
+
+    def _build_transport(self, limits: Limits, http2: bool):
+        """
+        Build a pooled transport with the given limits
+        """
+        raise NotImplementedError
+
+    def _build_client(self, transport, mounts: dict):
+        """
+        Build the underlying httpx client
+        """
+        raise NotImplementedError
+
+    def _get_client(self):
+        """
+        Return the pooled client, opening it on first use
+        """
+        client = self._client
+        if client is not None:
+            return client
+        with self._lock:
+            if self._client is None:
+                default = self.transport if self.transport is not None else self._build_transport(self.limits, self.http2)
+                transports = {"default": default}
+                for host, host_limits in self.per_host_limits.items():
+                    options = dict(host_limits)
+                    http2 = options.pop("http2", self.http2)
+                    transports[host] = self._build_transport(Limits(**options), http2)
+                transports.update(self.per_host_transports)
+                mounts = {f"all://{host}": transport for host, transport in transports.items() if host != "default"}
+                self._transports = transports
+                self._client = self._build_client(transports["default"], mounts)
+            return self._client
+
+    def _detach_client(self):
+        """
+        Forget the pooled client so that the next request opens a new one
+        """
+        with self._lock:
+            client, self._client = self._client, None
+            self._transports = {}
+        return client
+
+    def _request_started(self) -> None:
+        with self._lock:
+            self._requests_in_flight += 1
+
+    def _request_finished(self) -> None:
+        with self._lock:
+            self._requests_in_flight -= 1
+            self._requests_sent += 1
+
+    def _before_attempt(self, request: Request) -> bool:
+        """
+        Fail fast if the circuit for the request's host is open.
+        Return whether the attempt is the circuit's half-open trial
+        """
+        if self.circuit_breaker is not None:
+            return self.circuit_breaker.before_request(request.url.host)
+        return False
+
+    def _after_attempt(self, request: Request, trial: bool) -> None:
+        """
+        Release the trial slot held by an attempt, whether or not it recorded an outcome
+        """
+        self._request_finished()
+        if trial:
+            self.circuit_breaker.release_trial(request.url.host)
+
+    @staticmethod
+    def _record_call(request: Request, attempt: int, response: Optional[Response] = None) -> None:
+        """
+        Complete the send phase of the instrumented call in progress, if any
+        """
+        call = CURRENT_CALL.get()
+        if call is not None:
+            call.method = request.method
+            call.host = request.url.host
+            call.attempts = attempt + 1
+            if response is not None:
+                call.status = response.status_code
+            call.mark("send")
+
+    def _on_error(self, request: Request, attempt: int, error: Exception) -> Optional[float]:
+        """
+        Record a transport error and return the delay before retrying, or None to give up
+        """
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.record_failure(request.url.host)
+        if self.retry_policy is not None and self.retry_policy.should_retry(request, attempt, error=error):
+            return self.retry_policy.backoff(attempt)
+        return None
+
+    def _on_response(self, request: Request, attempt: int, response: Response) -> Optional[float]:
+        """
+        Record a response and return the delay before retrying, or None to accept it
+        """
+        if self.circuit_breaker is not None:
+            if response.status_code >= 500:
+                self.circuit_breaker.record_failure(request.url.host)
+            else:
+                self.circuit_breaker.record_success(request.url.host)
+        if self.retry_policy is not None and self.retry_policy.should_retry(request, attempt, response=response):
+            return self.retry_policy.backoff(attempt, response)
+        return None
 
     def build_request(
             self,
@@ -33,11 +189,140 @@ class HttpClient:
             params=params
         )
 
+    def pool_stats(self) -> HttpClientStats:
+        """
+        Return a snapshot of request counters and connection pool usage
+        """
+        pools = {}
+        for name, transport in self._transports.items():
+            # httpx does not expose the underlying httpcore pool publicly
+            pool = getattr(transport, "_pool", None)
+            connections = list(pool.connections) if pool is not None else []
+            idle = sum(1 for connection in connections if connection.is_idle())
+            pools[name] = ConnectionPoolStats(
+                connections=len(connections),
+                idle_connections=idle,
+                active_connections=len(connections) - idle
+            )
+        with self._lock:
+            return HttpClientStats(
+                requests_sent=self._requests_sent,
+                requests_in_flight=self._requests_in_flight,
+                pools=pools
+            )
+
+
+class HttpClient(BaseHttpClient):
+    """
+    HTTP Client
+
+    Owns a long-lived connection pool so that consecutive requests to the same
+    auth, resource or wallet address server reuse TCP/TLS connections. The pool
+    is opened on first use and released with ``close()``.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _build_transport(self, limits: Limits, http2: bool) -> HTTPTransport:
+        return HTTPTransport(limits=limits, http2=http2)
+
+    def _build_client(self, transport, mounts: dict) -> Client:
+        return Client(timeout=self.http_timeout, transport=transport, mounts=mounts)
+
     def send(self, request: Request) -> Response:
         """
         Make an http request
-        """ 
-        with Client(timeout=self.http_timeout) as client:
-            res = client.send(request=request)
-        res.raise_for_status()
-        return res
+        """
+        client = self._get_client()
+        attempt = 0
+        while True:
+            trial = self._before_attempt(request)
+            self._request_started()
+            try:
+                res = client.send(request=request)
+            except TransportError as exc:
+                delay = self._on_error(request, attempt, exc)
+                if delay is None:
+                    self._record_call(request, attempt)
+                    raise
+            else:
+                delay = self._on_response(request, attempt, res)
+                if delay is None:
+                    self._record_call(request, attempt, res)
+                    res.raise_for_status()
+                    return res
+                res.close()
+            finally:
+                self._after_attempt(request, trial)
+            time.sleep(delay)
+            attempt += 1
+
+    def close(self) -> None:
+        """
+        Close the connection pool. A new pool is opened if the client is used again
+        """
+        client = self._detach_client()
+        if client is not None:
+            client.close()
+
+
+class AsyncHttpClient(BaseHttpClient):
+    """
+    Async HTTP Client
+
+    asyncio counterpart of ``HttpClient`` backed by ``httpx.AsyncClient``. All
+    requests issued from one event loop are multiplexed over a shared pool,
+    released with ``aclose()``.
+    """
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
+    def _build_transport(self, limits: Limits, http2: bool) -> AsyncHTTPTransport:
+        return AsyncHTTPTransport(limits=limits, http2=http2)
+
+    def _build_client(self, transport, mounts: dict) -> AsyncClient:
+        return AsyncClient(timeout=self.http_timeout, transport=transport, mounts=mounts)
+
+    async def send(self, request: Request) -> Response:
+        """
+        Make an http request
+        """
+        client = self._get_client()
+        attempt = 0
+        while True:
+            trial = self._before_attempt(request)
+            self._request_started()
+            try:
+                res = await client.send(request=request)
+            except TransportError as exc:
+                delay = self._on_error(request, attempt, exc)
+                if delay is None:
+                    self._record_call(request, attempt)
+                    raise
+            else:
+                delay = self._on_response(request, attempt, res)
+                if delay is None:
+                    self._record_call(request, attempt, res)
+                    res.raise_for_status()
+                    return res
+                await res.aclose()
+            finally:
+                self._after_attempt(request, trial)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def aclose(self) -> None:
+        """
+        Close the connection pool. A new pool is opened if the client is used again
+        """
+        client = self._detach_client()
+        if client is not None:
+            await client.aclose()
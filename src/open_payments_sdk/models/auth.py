@@ -1,7 +1,9 @@
 from enum import Enum
-from typing import Any, List, Optional, Union
+from typing import Annotated, Any, List, Optional, Union
 
-from pydantic import AnyUrl, BaseModel, ConfigDict, Field, RootModel, conint, model_validator, root_validator
+from pydantic import AnyUrl, ConfigDict, Discriminator, Field, Tag, conint, model_validator, root_validator
+
+from open_payments_sdk.models.base import DeferredModel, DeferredRootModel, field_is_set
 
 
 class TypeIncoming(Enum):
@@ -17,7 +19,7 @@ class ActionIncoming(Enum):
     list_all = "list-all"
 
 
-class AccessIncoming(BaseModel):
+class AccessIncoming(DeferredModel):
     type: TypeIncoming = Field(
         ...,
         description="The type of resource request as a string.  This field defines which other fields are allowed in the request object.",
@@ -54,7 +56,7 @@ class ActionQuote(Enum):
     read_all = "read-all"
 
 
-class AccessQuote(BaseModel):
+class AccessQuote(DeferredModel):
     type: TypeQuote = Field(
         ...,
         description="The type of resource request as a string.  This field defines which other fields are allowed in the request object.",
@@ -65,7 +67,7 @@ class AccessQuote(BaseModel):
     )
 
 
-class Client(RootModel[str]):
+class Client(DeferredRootModel[str]):
     root: str = Field(
         ...,
         description="Wallet address of the client instance that is making this request.\n\nWhen sending a non-continuation request to the AS, the client instance MUST identify itself by including the client field of the request and by signing the request.\n\nA JSON Web Key Set document, including the public key that the client instance will use to protect this request and any continuation requests at the AS and any user-facing information about the client instance used in interactions, MUST be available at the wallet address + `/jwks.json` url.\n\nIf sending a grant initiation request that requires RO interaction, the wallet address MUST serve necessary client display information.",
@@ -73,11 +75,11 @@ class Client(RootModel[str]):
     )
 
 
-class AccessTokenContinue(BaseModel):
+class AccessTokenContinue(DeferredModel):
     value: str
 
 
-class Continue(BaseModel):
+class Continue(DeferredModel):
     access_token: AccessTokenContinue = Field(
         ...,
         description='A unique access token for continuing the request, called the "continuation access token".',
@@ -100,7 +102,7 @@ class Method(Enum):
     redirect = "redirect"
 
 
-class Finish(BaseModel):
+class Finish(DeferredModel):
     method: Method = Field(
         ...,
         description="The callback method that the AS will use to contact the client instance.",
@@ -115,7 +117,7 @@ class Finish(BaseModel):
     )
 
 
-class InteractRequest(BaseModel):
+class InteractRequest(DeferredModel):
     start: List[StartEnum] = Field(
         ..., description="Indicates how the client instance can start an interaction."
     )
@@ -125,12 +127,12 @@ class InteractRequest(BaseModel):
     )
 
 
-class InteractResponse(BaseModel):
+class InteractResponse(DeferredModel):
     redirect: AnyUrl = Field(..., description="The URI to direct the end user to.")
     finish: str = Field(..., description="Unique key to secure the callback.")
 
 
-class Interval(RootModel[str]):
+class Interval(DeferredRootModel[str]):
     root: str = Field(
         ...,
         description="[ISO8601 repeating interval](https://en.wikipedia.org/wiki/ISO_8601#Repeating_intervals)",
@@ -143,7 +145,7 @@ class Interval(RootModel[str]):
     )
 
 
-class Receiver(RootModel[AnyUrl]):
+class Receiver(DeferredRootModel[AnyUrl]):
     root: AnyUrl = Field(
         ...,
         description="The URL of the incoming payment that is being paid.",
@@ -156,7 +158,7 @@ class Receiver(RootModel[AnyUrl]):
     )
 
 
-class AssetCode(RootModel[str]):
+class AssetCode(DeferredRootModel[str]):
     root: str = Field(
         ...,
         description="The assetCode is a code that indicates the underlying asset. This SHOULD be an ISO4217 currency code.",
@@ -164,7 +166,7 @@ class AssetCode(RootModel[str]):
     )
 
 
-class AssetScale(RootModel[conint(ge=0, le=255)]):
+class AssetScale(DeferredRootModel[conint(ge=0, le=255)]):
     root: conint(ge=0, le=255) = Field(
         ...,
         description="The scale of amounts denoted in the corresponding asset code.",
@@ -172,7 +174,7 @@ class AssetScale(RootModel[conint(ge=0, le=255)]):
     )
 
 
-class WalletAddress(RootModel[AnyUrl]):
+class WalletAddress(DeferredRootModel[AnyUrl]):
     root: AnyUrl = Field(
         ...,
         description="URL of a wallet address hosted by a Rafiki instance.",
@@ -180,7 +182,7 @@ class WalletAddress(RootModel[AnyUrl]):
     )
 
 
-class Amount(BaseModel):
+class Amount(DeferredModel):
     value: str = Field(
         ...,
         description="The value is an unsigned 64-bit integer amount, represented as a string.",
@@ -189,7 +191,7 @@ class Amount(BaseModel):
     assetScale: AssetScale
 
 
-class LimitsOutgoing1(BaseModel):
+class LimitsOutgoing1(DeferredModel):
     receiver: Optional[Receiver] = None
     debitAmount: Optional[Amount] = Field(
         None,
@@ -202,7 +204,7 @@ class LimitsOutgoing1(BaseModel):
     interval: Optional[Interval] = None
 
 
-class LimitsOutgoing2(BaseModel):
+class LimitsOutgoing2(DeferredModel):
     receiver: Optional[Receiver] = None
     debitAmount: Amount = Field(
         ...,
@@ -215,7 +217,7 @@ class LimitsOutgoing2(BaseModel):
     interval: Optional[Interval] = None
 
 
-class LimitsOutgoing3(BaseModel):
+class LimitsOutgoing3(DeferredModel):
     receiver: Optional[Receiver] = None
     debitAmount: Optional[Amount] = Field(
         None,
@@ -228,17 +230,31 @@ class LimitsOutgoing3(BaseModel):
     interval: Optional[Interval] = None
 
 
-class LimitsOutgoing(
-    RootModel[Union[LimitsOutgoing1, LimitsOutgoing2, LimitsOutgoing3]]
-):
-    root: Union[LimitsOutgoing1, LimitsOutgoing2, LimitsOutgoing3] = Field(
+def _limits_outgoing_tag(value: Any) -> str:
+    if field_is_set(value, "debitAmount"):
+        return "debit"
+    return "receive" if field_is_set(value, "receiveAmount") else "any"
+
+
+LimitsOutgoingUnion = Annotated[
+    Union[
+        Annotated[LimitsOutgoing1, Tag("any")],
+        Annotated[LimitsOutgoing2, Tag("debit")],
+        Annotated[LimitsOutgoing3, Tag("receive")],
+    ],
+    Discriminator(_limits_outgoing_tag),
+]
+
+
+class LimitsOutgoing(DeferredRootModel[LimitsOutgoingUnion]):
+    root: LimitsOutgoingUnion = Field(
         ...,
         description="Open Payments specific property that defines the limits under which outgoing payments can be created.",
         title="limits-outgoing",
     )
 
 
-class AccessOutgoing(BaseModel):
+class AccessOutgoing(DeferredModel):
     type: TypeOutgoing = Field(
         ...,
         description="The type of resource request as a string.  This field defines which other fields are allowed in the request object.",
@@ -253,14 +269,29 @@ class AccessOutgoing(BaseModel):
     limits: Optional[LimitsOutgoing] = None
 
 
-class AccessItem(RootModel[Union[AccessIncoming, AccessOutgoing, AccessQuote]]):
-    root: Union[AccessIncoming, AccessOutgoing, AccessQuote] = Field(
+def _access_item_tag(value: Any) -> Optional[str]:
+    access_type = value.get("type") if isinstance(value, dict) else getattr(value, "type", None)
+    return getattr(access_type, "value", access_type)
+
+
+AccessItemUnion = Annotated[
+    Union[
+        Annotated[AccessIncoming, Tag(TypeIncoming.incoming_payment.value)],
+        Annotated[AccessOutgoing, Tag(TypeOutgoing.outgoing_payment.value)],
+        Annotated[AccessQuote, Tag(TypeQuote.quote.value)],
+    ],
+    Discriminator(_access_item_tag),
+]
+
+
+class AccessItem(DeferredRootModel[AccessItemUnion]):
+    root: AccessItemUnion = Field(
         ...,
         description="The access associated with the access token is described using objects that each contain multiple dimensions of access.",
     )
 
 
-class Access(RootModel[List[AccessItem]]):
+class Access(DeferredRootModel[List[AccessItem]]):
     root: List[AccessItem] = Field(
         ...,
         description="A description of the rights associated with this access token.",
@@ -268,7 +299,7 @@ class Access(RootModel[List[AccessItem]]):
     )
 
 
-class AccessToken(BaseModel):
+class AccessToken(DeferredModel):
     model_config = ConfigDict(
         extra="forbid",
     )
@@ -287,16 +318,16 @@ class AccessToken(BaseModel):
     access: Access
 
 
-class GrantRequestAccessToken(BaseModel):
+class GrantRequestAccessToken(DeferredModel):
     access: Access
 
 
-class GrantRequest(BaseModel):
+class GrantRequest(DeferredModel):
     access_token: GrantRequestAccessToken
     client: Client
     interact: Optional[InteractRequest] = None
 
-class ReservedKeyMappingModel(BaseModel):
+class ReservedKeyMappingModel(DeferredModel):
     """
     Base class that maps 'continue' to 'cont' in incoming data.
     """
@@ -321,21 +352,34 @@ class GrantResponse(ReservedKeyMappingModel):
     cont: Continue
 
 
-class Grant(RootModel[Union[InteractionInstructionsResponse, GrantResponse]]):
-    root: Union[InteractionInstructionsResponse, GrantResponse] = Field(
+def _grant_tag(value: Any) -> str:
+    return "grant" if field_is_set(value, "access_token") else "interaction"
+
+
+GrantUnion = Annotated[
+    Union[
+        Annotated[InteractionInstructionsResponse, Tag("interaction")],
+        Annotated[GrantResponse, Tag("grant")],
+    ],
+    Discriminator(_grant_tag),
+]
+
+
+class Grant(DeferredRootModel[GrantUnion]):
+    root: GrantUnion = Field(
         ...,
         description="The grant object, either interaction instructions or grant response",
         title="grant",
     )
 
 
-class InteractRef(BaseModel):
+class InteractRef(DeferredModel):
     interact_ref: str = Field(
         ...,
         description="The interaction reference generated for this interaction by the AS."
     )
 
 
-class GrantContinueResponse(BaseModel):
-    access_token: AccessToken
+class GrantContinueResponse(ReservedKeyMappingModel):
+    access_token: Optional[AccessToken] = None
     cont: Optional[Continue] = None
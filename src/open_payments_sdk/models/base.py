@@ -0,0 +1,34 @@
+"""
+Base classes of the Open Payments schema models
+
+Building the validators of every schema model at import time is the largest
+part of importing the SDK. Models derived from these bases build their
+validators on first use instead, so only the models an application actually
+touches are ever built.
+"""
+from typing import Any, Generic
+
+from pydantic import BaseModel, ConfigDict, RootModel
+from pydantic.root_model import RootModelRootType
+
+
+class DeferredModel(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
+
+class DeferredRootModel(RootModel[RootModelRootType], Generic[RootModelRootType]):
+    # parametrizing RootModel itself, e.g. RootModel[List[Item]], would build
+    # the intermediate generic class eagerly
+    model_config = ConfigDict(defer_build=True)
+
+
+def field_is_set(value: Any, name: str) -> bool:
+    """
+    Whether name is set on value, a raw dict or a model instance.
+
+    Used by the callable discriminators of union models, which see raw input
+    when validating and model instances when serializing.
+    """
+    # a missing attribute on a model raises from __getattr__, which is slow
+    fields = value if isinstance(value, dict) else getattr(value, "__dict__", None) or {}
+    return fields.get(name) is not None
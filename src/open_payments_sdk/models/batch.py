@@ -0,0 +1,43 @@
+from typing import Any, List, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class BatchItemResult(BaseModel):
+    index: int
+    result: Optional[Any] = None
+    error: Optional[Exception] = None
+    latency: float
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class BatchStats(BaseModel):
+    items: int
+    succeeded: int
+    failed: int
+    elapsed: float
+    throughput: float
+    latency_mean: float
+    latency_p50: float
+    latency_p95: float
+    latency_max: float
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class BatchResult(BaseModel):
+    items: List[BatchItemResult]
+    stats: BatchStats
+
+    @property
+    def results(self) -> List[Any]:
+        return [item.result for item in self.items]
+
+    @property
+    def errors(self) -> List[BatchItemResult]:
+        return [item for item in self.items if not item.ok]
@@ -0,0 +1,47 @@
+from typing import Dict
+
+from pydantic import BaseModel, ConfigDict
+
+
+class ConnectionPoolStats(BaseModel):
+    connections: int
+    idle_connections: int
+    active_connections: int
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class HttpClientStats(BaseModel):
+    requests_sent: int
+    requests_in_flight: int
+    pools: Dict[str, ConnectionPoolStats]
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class CacheStats(BaseModel):
+    hits: int
+    misses: int
+    revalidations: int
+    evictions: int
+    size: int
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class GrantCacheStats(BaseModel):
+    hits: int
+    misses: int
+    coalesced: int
+    evictions: int
+    size: int
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class SingleFlightStats(BaseModel):
+    calls: int
+    coalesced: int
+    in_flight: int
+
+    model_config = ConfigDict(extra="forbid")
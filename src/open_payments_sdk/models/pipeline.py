@@ -0,0 +1,42 @@
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+from open_payments_sdk.models.batch import BatchItemResult, BatchResult, BatchStats
+from open_payments_sdk.models.resource import Amount, IncomingPayment, Quote
+
+
+class PaymentIntent(BaseModel):
+    sender: str
+    receiver: str
+    amount: Amount
+    metadata: Optional[Dict[str, Any]] = None
+
+
+class PipelineItemResult(BatchItemResult):
+    intent: PaymentIntent
+    stage: Optional[str] = None
+    incoming_payment: Optional[IncomingPayment] = None
+    quote: Optional[Quote] = None
+
+
+class StageStats(BaseModel):
+    name: str
+    concurrency: Optional[int]
+    completed: int
+    failed: int
+    throughput: float
+    latency_mean: float
+    queue_delay_mean: float
+    queue_delay_max: float
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class PipelineStats(BatchStats):
+    stages: List[StageStats]
+
+
+class PipelineResult(BatchResult):
+    items: List[PipelineItemResult]
+    stats: PipelineStats
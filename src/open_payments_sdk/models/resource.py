@@ -2,11 +2,13 @@ from datetime import datetime
 from enum import Enum
 from typing import Annotated, Any, Dict, List, Literal, Optional, Union
 
-from pydantic import (AnyUrl, BaseModel, ConfigDict, Field, HttpUrl, RootModel,
-                      StringConstraints, conint, constr, field_validator)
+from pydantic import (AnyUrl, ConfigDict, Discriminator, Field, HttpUrl,
+                      StringConstraints, Tag, conint, constr, field_validator)
 
+from open_payments_sdk.models.base import DeferredModel, DeferredRootModel, field_is_set
 
-class AssetCode(RootModel[str]):
+
+class AssetCode(DeferredRootModel[str]):
     root: str = Field(
         ...,
         description="The assetCode is a code that indicates the underlying asset. This SHOULD be an ISO4217 currency code.",
@@ -14,7 +16,7 @@ class AssetCode(RootModel[str]):
     )
 
 
-class AssetScale(RootModel[conint(ge=0, le=255)]):
+class AssetScale(DeferredRootModel[conint(ge=0, le=255)]):
     root: conint(ge=0, le=255) = Field(
         ...,
         description="The scale of amounts denoted in the corresponding asset code.",
@@ -22,7 +24,7 @@ class AssetScale(RootModel[conint(ge=0, le=255)]):
     )
 
 
-class Receiver(RootModel[AnyUrl]):
+class Receiver(DeferredRootModel[AnyUrl]):
     root: AnyUrl = Field(
         ...,
         description="The URL of the incoming payment that is being paid.",
@@ -35,7 +37,7 @@ class Receiver(RootModel[AnyUrl]):
     )
 
 
-class WalletAddress(RootModel[AnyUrl]):
+class WalletAddress(DeferredRootModel[AnyUrl]):
     root: AnyUrl = Field(
         ...,
         description="URL of a wallet address hosted by a Rafiki instance.",
@@ -43,7 +45,7 @@ class WalletAddress(RootModel[AnyUrl]):
     )
 
 
-class PageInfo(BaseModel):
+class PageInfo(DeferredModel):
     model_config = ConfigDict(
         extra="forbid",
     )
@@ -71,7 +73,7 @@ class Type(Enum):
     ilp = "ilp"
 
 
-class IlpPaymentMethod(BaseModel):
+class IlpPaymentMethod(DeferredModel):
     model_config = ConfigDict(
         extra="forbid",
     )
@@ -88,7 +90,7 @@ class IlpPaymentMethod(BaseModel):
     )
 
 
-class Amount(BaseModel):
+class Amount(DeferredModel):
     value: str = Field(
         ...,
         description="The value is an unsigned 64-bit integer amount, represented as a string.",
@@ -97,7 +99,7 @@ class Amount(BaseModel):
     assetScale: AssetScale
 
 
-class PublicIncomingPayment(BaseModel):
+class PublicIncomingPayment(DeferredModel):
     receivedAmount: Optional[Amount] = None
     authServer: AnyUrl = Field(
         ...,
@@ -105,7 +107,7 @@ class PublicIncomingPayment(BaseModel):
     )
 
 
-class OutgoingPayment(BaseModel):
+class OutgoingPayment(DeferredModel):
     model_config = ConfigDict(
         extra="forbid",
     )
@@ -148,7 +150,7 @@ class OutgoingPayment(BaseModel):
     )
 
 
-class OutgoingPaymentWithSpentAmounts(BaseModel):
+class OutgoingPaymentWithSpentAmounts(DeferredModel):
     id: AnyUrl = Field(..., description="The URL identifying the outgoing payment.")
     walletAddress: AnyUrl = Field(
         ...,
@@ -196,7 +198,7 @@ class OutgoingPaymentWithSpentAmounts(BaseModel):
     )
 
 
-class Quote(BaseModel):
+class Quote(DeferredModel):
     model_config = ConfigDict(
         extra="forbid",
     )
@@ -227,7 +229,7 @@ class Quote(BaseModel):
     )
 
 
-class IncomingPayment(BaseModel):
+class IncomingPayment(DeferredModel):
     id: AnyUrl = Field(..., description="The URL identifying the incoming payment.")
     walletAddress: AnyUrl = Field(
         ...,
@@ -269,62 +271,77 @@ class IncomingPaymentWithMethods(IncomingPayment):
     )
 
 
-class IncomingPaymentRequest(BaseModel):
+class IncomingPaymentRequest(DeferredModel):
     walletAddress: WalletAddress
     incomingAmount: Optional[Amount]
     expiresAt: Optional[datetime]
     metadata: Optional[Dict[str, Any]]
 
 
-class IncomingPaymentResponse(
-    RootModel[Union[PublicIncomingPayment, IncomingPaymentWithMethods]]
-):
-    pass
+def _incoming_payment_response_tag(value: Any) -> str:
+    return "methods" if field_is_set(value, "methods") else "public"
 
-class PaymentListQuery(BaseModel):
-    walletAddress: WalletAddress
-    cursor: Optional[str] = Field(min_length=1)
-    first: Optional[int] = Field(ge=1, le=100)
-    last: Optional[int] = Field(ge=1, le=100)
 
+IncomingPaymentResponseUnion = Annotated[
+    Union[
+        Annotated[PublicIncomingPayment, Tag("public")],
+        Annotated[IncomingPaymentWithMethods, Tag("methods")],
+    ],
+    Discriminator(_incoming_payment_response_tag),
+]
+
+
+class IncomingPaymentResponse(DeferredRootModel[IncomingPaymentResponseUnion]):
+    pass
 
-class Pagination(BaseModel):
-    startCursor: str = Field(min_length=1)
-    endCursor: str = Field(min_length=1)
-    hasNextPage: Optional[bool]
-    hasPrevPage: Optional[bool]
+class PaymentListQuery(DeferredModel):
+    walletAddress: WalletAddress = Field(serialization_alias="wallet-address")
+    cursor: Optional[str] = Field(None, min_length=1)
+    first: Optional[int] = Field(None, ge=1, le=100)
+    last: Optional[int] = Field(None, ge=1, le=100)
 
 
-class PaginatedIncomingPayments(BaseModel):
-    pagination: Pagination
+class PaginatedIncomingPayments(DeferredModel):
+    pagination: PageInfo
     result: List[IncomingPayment]
 
 
-class OutgoingPaymentRequestWithQuote(BaseModel):
+class OutgoingPaymentRequestWithQuote(DeferredModel):
     walletAddress: WalletAddress
     quoteId: AnyUrl
     metadata: Optional[Dict[str, Any]]
 
 
-class OutgoingPaymentRequestWithIncoming(BaseModel):
+class OutgoingPaymentRequestWithIncoming(DeferredModel):
     walletAddress: WalletAddress
     incomingPayment: AnyUrl
     debitAmount: Amount
     metadata: Optional[Dict[str, Any]]
 
 
-class OutgoingPaymentRequest(
-    RootModel[Union[OutgoingPaymentRequestWithIncoming, OutgoingPaymentRequestWithQuote]]
-):
+def _outgoing_payment_request_tag(value: Any) -> str:
+    return "incoming" if field_is_set(value, "incomingPayment") else "quote"
+
+
+OutgoingPaymentRequestUnion = Annotated[
+    Union[
+        Annotated[OutgoingPaymentRequestWithIncoming, Tag("incoming")],
+        Annotated[OutgoingPaymentRequestWithQuote, Tag("quote")],
+    ],
+    Discriminator(_outgoing_payment_request_tag),
+]
+
+
+class OutgoingPaymentRequest(DeferredRootModel[OutgoingPaymentRequestUnion]):
     pass
 
 
-class PaginatedOutgoingPayments(BaseModel):
-    pagination: Pagination
+class PaginatedOutgoingPayments(DeferredModel):
+    pagination: PageInfo
     result: List[OutgoingPayment]
 
 
-class QuoteRequestBase(BaseModel):
+class QuoteRequestBase(DeferredModel):
     walletAddress: WalletAddress
     receiver: HttpUrl
     method: Literal["ilp"]
@@ -333,6 +350,7 @@ class QuoteRequestBase(BaseModel):
     @classmethod
     def check_path(cls, v):
         assert "/incoming-payments/" in v.path
+        return v
 
 
 class QuoteFixedReceive(QuoteRequestBase):
@@ -342,9 +360,21 @@ class QuoteFixedReceive(QuoteRequestBase):
 class QuoteFixedSent(QuoteRequestBase):
     debitAmount: Amount
 
+def _quote_request_tag(value: Any) -> str:
+    if field_is_set(value, "debitAmount"):
+        return "debit"
+    return "receive" if field_is_set(value, "receiveAmount") else "base"
+
+
+QuoteRequestUnion = Annotated[
+    Union[
+        Annotated[QuoteRequestBase, Tag("base")],
+        Annotated[QuoteFixedSent, Tag("debit")],
+        Annotated[QuoteFixedReceive, Tag("receive")],
+    ],
+    Discriminator(_quote_request_tag),
+]
 
 
-class QuoteRequest(
-    RootModel[Union[QuoteRequestBase, QuoteFixedSent, QuoteFixedReceive]]
-):
+class QuoteRequest(DeferredRootModel[QuoteRequestUnion]):
     pass
@@ -1,11 +1,12 @@
 from enum import Enum
 from typing import List, Optional
 
-from pydantic import (AnyUrl, BaseModel, ConfigDict, Field, RootModel, conint,
-                      constr)
+from pydantic import AnyUrl, ConfigDict, Field, conint, constr
 
+from open_payments_sdk.models.base import DeferredModel, DeferredRootModel
 
-class AssetCode(RootModel[str]):
+
+class AssetCode(DeferredRootModel[str]):
     root: str = Field(
         ...,
         description="The assetCode is a code that indicates the underlying asset. This SHOULD be an ISO4217 currency code.",
@@ -13,7 +14,7 @@ class AssetCode(RootModel[str]):
     )
 
 
-class AssetScale(RootModel[conint(ge=0, le=255)]):
+class AssetScale(DeferredRootModel[conint(ge=0, le=255)]):
     root: conint(ge=0, le=255) = Field(
         ...,
         description="The scale of amounts denoted in the corresponding asset code.",
@@ -21,7 +22,7 @@ class AssetScale(RootModel[conint(ge=0, le=255)]):
     )
 
 
-class Receiver(RootModel[AnyUrl]):
+class Receiver(DeferredRootModel[AnyUrl]):
     root: AnyUrl = Field(
         ...,
         description="The URL of the incoming payment that is being paid.",
@@ -50,7 +51,7 @@ class Crv(Enum):
     Ed25519 = "Ed25519"
 
 
-class JsonWebKey(BaseModel):
+class JsonWebKey(DeferredModel):
     kid: str
     alg: Alg = Field(
         ...,
@@ -64,11 +65,11 @@ class JsonWebKey(BaseModel):
     )
 
 
-class DidDocument(BaseModel):
+class DidDocument(DeferredModel):
     pass
 
 
-class WalletAddress(BaseModel):
+class WalletAddress(DeferredModel):
     model_config = ConfigDict(
         extra="allow",
     )
@@ -89,7 +90,7 @@ class WalletAddress(BaseModel):
     )
 
 
-class Amount(BaseModel):
+class Amount(DeferredModel):
     value: str = Field(
         ...,
         description="The value is an unsigned 64-bit integer amount, represented as a string.",
@@ -98,7 +99,7 @@ class Amount(BaseModel):
     assetScale: AssetScale
 
 
-class JsonWebKeySet(BaseModel):
+class JsonWebKeySet(DeferredModel):
     model_config = ConfigDict(
         extra="forbid",
     )
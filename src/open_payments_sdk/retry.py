@@ -0,0 +1,171 @@
+"""
+Retry and circuit breaker policies for the HTTP clients
+"""
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Iterable, Optional
+
+from httpx import ConnectError, ConnectTimeout, Request, Response, TransportError
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of sending a request to a host whose circuit is open
+    """
+    def __init__(self, host: str, retry_in: float):
+        super().__init__(f"Circuit open for {host}, retry in {retry_in:.1f}s")
+        self.host = host
+        self.retry_in = retry_in
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter for transient failures.
+
+    Idempotent methods are retried on transport errors and on the configured
+    status codes. Other methods, such as the POSTs that create resources, are
+    only retried when they carry an idempotency key header, or when the
+    connection could not be opened at all and nothing was sent.
+    """
+    def __init__(
+            self,
+            max_retries: int = 3,
+            backoff_factor: float = 0.2,
+            max_backoff: float = 10.0,
+            retry_statuses: Iterable[int] = (429, 502, 503, 504),
+            idempotent_methods: Iterable[str] = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE"),
+            idempotency_header: str = "Idempotency-Key",
+            respect_retry_after: bool = True
+    ):
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.retry_statuses = frozenset(retry_statuses)
+        self.idempotent_methods = frozenset(idempotent_methods)
+        self.idempotency_header = idempotency_header
+        self.respect_retry_after = respect_retry_after
+
+    def is_idempotent(self, request: Request) -> bool:
+        """
+        Whether sending the request twice is safe
+        """
+        return request.method in self.idempotent_methods or self.idempotency_header in request.headers
+
+    def should_retry(
+            self,
+            request: Request,
+            attempt: int,
+            response: Optional[Response] = None,
+            error: Optional[Exception] = None
+        ) -> bool:
+        """
+        Decide whether attempt (0-based) should be followed by another one
+        """
+        if attempt >= self.max_retries:
+            return False
+        if error is not None:
+            if isinstance(error, (ConnectError, ConnectTimeout)):
+                return True
+            return isinstance(error, TransportError) and self.is_idempotent(request)
+        return response is not None and response.status_code in self.retry_statuses and self.is_idempotent(request)
+
+    def backoff(self, attempt: int, response: Optional[Response] = None) -> float:
+        """
+        Seconds to wait before the next attempt
+        """
+        if self.respect_retry_after and response is not None:
+            retry_after = self._retry_after(response)
+            if retry_after is not None:
+                return min(retry_after, self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff_factor * (2 ** attempt)))
+
+    @staticmethod
+    def _retry_after(response: Response) -> Optional[float]:
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+        try:
+            return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+        except (TypeError, ValueError):
+            return None
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker.
+
+    After ``failure_threshold`` consecutive failures (transport errors or 5xx
+    responses) requests to the host fail fast with ``CircuitOpenError`` for
+    ``recovery_timeout`` seconds. A single trial request is then let through;
+    its outcome closes the circuit or opens it again.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._failures: Dict[str, int] = {}
+        self._opened_at: Dict[str, float] = {}
+        self._trial_in_flight: Dict[str, bool] = {}
+
+    def state(self, host: str) -> str:
+        """
+        Current state of the circuit for host
+        """
+        with self._lock:
+            return self._state(host)
+
+    def _state(self, host: str) -> str:
+        opened_at = self._opened_at.get(host)
+        if opened_at is None:
+            return self.CLOSED
+        if self.clock() - opened_at >= self.recovery_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def before_request(self, host: str) -> bool:
+        """
+        Raise CircuitOpenError unless a request to host may be sent.
+        Return True when the request is the half-open trial, which must end
+        with ``record_success``, ``record_failure`` or ``release_trial``
+        """
+        with self._lock:
+            state = self._state(host)
+            if state == self.CLOSED:
+                return False
+            if state == self.HALF_OPEN and not self._trial_in_flight.get(host):
+                self._trial_in_flight[host] = True
+                return True
+            retry_in = max(self._opened_at[host] + self.recovery_timeout - self.clock(), 0.0)
+        raise CircuitOpenError(host, retry_in)
+
+    def release_trial(self, host: str) -> None:
+        """
+        Free the trial slot of a trial request that ended without an outcome,
+        e.g. when it was cancelled, so the next request becomes the trial
+        """
+        with self._lock:
+            self._trial_in_flight.pop(host, None)
+
+    def record_success(self, host: str) -> None:
+        with self._lock:
+            self._failures.pop(host, None)
+            self._opened_at.pop(host, None)
+            self._trial_in_flight.pop(host, None)
+
+    def record_failure(self, host: str) -> None:
+        with self._lock:
+            failures = self._failures.get(host, 0) + 1
+            self._failures[host] = failures
+            if self._trial_in_flight.pop(host, None) or failures >= self.failure_threshold:
+                self._opened_at[host] = self.clock()
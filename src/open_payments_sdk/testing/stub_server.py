@@ -0,0 +1,629 @@
+"""
+In-process Open Payments stub server
+
+Implements the auth server, resource server and wallet address server APIs
+described in ``spec/`` closely enough to drive the SDK end to end without the
+public test network: grants with and without interaction, continuation, token
+rotation and revocation, incoming and outgoing payments, quotes, cursor
+pagination, wallet addresses and JWKS. Requests are checked for valid HTTP
+message signatures and content digests.
+
+The server can be used in process as an ``httpx.MockTransport`` handler, or
+started on a local port with ``serve()`` for load tests over real sockets.
+"""
+import base64
+import hashlib
+import hmac
+import json
+import random
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+from http_message_signatures import HTTPMessageVerifier, algorithms
+from http_message_signatures.exceptions import HTTPMessageSignaturesException
+from httpx import MockTransport, Request, Response
+
+from open_payments_sdk.gnap_utils.http_signatures import PatchedHTTPSignatureComponentResolver
+from open_payments_sdk.gnap_utils.verification import PublicKeyCache, verify_content_digest
+
+_RESOURCES = {"incoming-payments": "incoming-payment", "outgoing-payments": "outgoing-payment", "quotes": "quote"}
+
+
+class StubError(Exception):
+    """
+    Error response in the Open Payments ``{"error": {...}}`` format
+    """
+    def __init__(self, status: int, code: str, description: str = ""):
+        super().__init__(description or code)
+        self.status = status
+        self.code = code
+        self.description = description
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """
+    Adapt socket requests to ``StubOpenPaymentsServer.handle``
+    """
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    stub: "StubOpenPaymentsServer"
+
+    def _dispatch(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length) if length else b""
+        request = Request(
+            method=self.command,
+            url=f"{self.stub.base_url}{self.path}",
+            headers=list(self.headers.items()),
+            content=body
+        )
+        response = self.stub.handle(request)
+        self.send_response(response.status_code)
+        for name, value in response.headers.multi_items():
+            self.send_header(name, value)
+        if "Content-Length" not in response.headers and response.status_code not in (204, 304):
+            # bodiless responses such as redirects would otherwise keep the client reading
+            self.send_header("Content-Length", str(len(response.content)))
+        self.end_headers()
+        self.wfile.write(response.content)
+
+    do_GET = do_POST = do_DELETE = _dispatch
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _timestamp(value: datetime) -> str:
+    return value.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+class StubOpenPaymentsServer:
+    """
+    Stub Open Payments server for offline tests and load tests.
+
+    All three servers share one origin: wallet addresses live at
+    ``{base_url}/{name}``, the auth server at ``{base_url}/auth`` and the
+    resource server at ``{base_url}``. Client keys are registered by passing
+    their key set to ``add_wallet_address``; grants are bound to the key that
+    signed the grant request.
+
+    ``latency`` (plus up to ``jitter``) seconds are added to every response,
+    and a fraction ``error_rate`` of requests is answered with
+    ``error_status`` before being processed. ``fail_next`` injects a fixed
+    number of failures instead.
+    """
+    def __init__(
+            self,
+            base_url: str = "http://open-payments.test",
+            latency: float = 0.0,
+            jitter: float = 0.0,
+            error_rate: float = 0.0,
+            error_status: int = 503,
+            token_expires_in: int = 600,
+            continue_wait: int = 5,
+            verify_signatures: bool = True,
+            seed: Optional[int] = None
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.token_expires_in = token_expires_in
+        self.continue_wait = continue_wait
+        self.verify_signatures = verify_signatures
+        self.requests = 0
+        self.injected_errors = 0
+        self.rejected_requests = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._key_cache = PublicKeyCache()
+        self._verifier = HTTPMessageVerifier(
+            signature_algorithm=algorithms.ED25519,
+            key_resolver=self._key_cache,
+            component_resolver_class=PatchedHTTPSignatureComponentResolver
+        )
+        self._failures: List[int] = []
+        self._wallets: Dict[str, dict] = {}
+        self._grants: Dict[str, dict] = {}
+        self._tokens: Dict[str, dict] = {}
+        self._tokens_by_value: Dict[str, dict] = {}
+        self._resources: Dict[str, Dict[str, dict]] = {name: {} for name in _RESOURCES}
+        self._idempotent: Dict[Tuple[str, str], Response] = {}
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def auth_server(self) -> str:
+        return f"{self.base_url}/auth"
+
+    @property
+    def resource_server(self) -> str:
+        return self.base_url
+
+    def wallet_address_url(self, name: str) -> str:
+        return f"{self.base_url}/{name}"
+
+    def add_wallet_address(
+            self,
+            name: str,
+            jwks=None,
+            asset_code: str = "USD",
+            asset_scale: int = 2,
+            public_name: Optional[str] = None
+    ) -> str:
+        """
+        Host a wallet address, trusting the keys of its key set. Returns its URL
+        """
+        if hasattr(jwks, "model_dump"):
+            jwks = jwks.model_dump(mode="json")
+        keys = list((jwks or {}).get("keys", []))
+        with self._lock:
+            for jwk in keys:
+                self._key_cache.add_key(jwk)
+            self._wallets[name] = {
+                "keys": keys,
+                "assetCode": asset_code,
+                "assetScale": asset_scale,
+                "publicName": public_name or name
+            }
+        return self.wallet_address_url(name)
+
+    def approve_grant(self, grant: str) -> str:
+        """
+        Approve a pending interactive grant, given its id or continue URI.
+        Returns the interaction reference to continue it with
+        """
+        with self._lock:
+            record = self._pending_grant(grant)
+            record["status"] = "approved"
+            record["interact_ref"] = str(uuid.uuid4())
+            return record["interact_ref"]
+
+    def reject_grant(self, grant: str) -> None:
+        """
+        Reject a pending interactive grant, given its id or continue URI
+        """
+        with self._lock:
+            self._pending_grant(grant)["status"] = "rejected"
+
+    def fail_next(self, count: int = 1, status: int = 503) -> None:
+        """
+        Answer the next count requests with status
+        """
+        with self._lock:
+            self._failures.extend([status] * count)
+
+    def transport(self) -> MockTransport:
+        """
+        Transport routing requests to this server in process
+        """
+        return MockTransport(self.handle)
+
+    def serve(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """
+        Listen on a local port in a background thread, returning the new base URL
+        """
+        handler = type("StubHandler", (_Handler,), {"stub": self})
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+        self.base_url = f"http://{host}:{self._server.server_address[1]}"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self.base_url
+
+    def close(self) -> None:
+        """
+        Stop listening if ``serve()`` was called
+        """
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def handle(self, request: Request) -> Response:
+        """
+        Answer a single request
+        """
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            time.sleep(delay)
+        with self._lock:
+            self.requests += 1
+            status = self._failures.pop(0) if self._failures else None
+            if status is None and self.error_rate and self._random.random() < self.error_rate:
+                status = self.error_status
+            if status is not None:
+                self.injected_errors += 1
+        if status is not None:
+            return self._error(StubError(status, "injected_error", "Injected failure"))
+        try:
+            return self._route(request)
+        except StubError as exc:
+            if exc.status in (400, 401):
+                with self._lock:
+                    self.rejected_requests += 1
+            return self._error(exc)
+
+    def _error(self, exc: StubError) -> Response:
+        return Response(exc.status, json={"error": {"code": exc.code, "description": exc.description}})
+
+    def _route(self, request: Request) -> Response:
+        segments = [segment for segment in request.url.path.split("/") if segment]
+        method = request.method
+        if not segments:
+            raise StubError(404, "not_found")
+        if segments[0] == "auth":
+            return self._route_auth(request, method, segments[1:])
+        if segments[0] in _RESOURCES:
+            return self._route_resource(request, method, segments[0], segments[1:])
+        if method == "GET" and len(segments) == 1:
+            return self._get_wallet_address(segments[0], request)
+        if method == "GET" and len(segments) == 2 and segments[1] == "jwks.json":
+            return self._get_jwks(segments[0], request)
+        raise StubError(404, "not_found")
+
+    def _route_auth(self, request: Request, method: str, segments: List[str]) -> Response:
+        if not segments and method == "POST":
+            return self._post_grant(request)
+        if len(segments) == 2 and segments[0] == "continue" and method in ("POST", "DELETE"):
+            return self._continue_grant(request, segments[1])
+        if len(segments) == 2 and segments[0] == "token" and method in ("POST", "DELETE"):
+            return self._manage_token(request, segments[1])
+        if len(segments) == 2 and segments[0] == "interact" and method == "GET":
+            return self._interact(segments[1])
+        raise StubError(404, "not_found")
+
+    def _route_resource(self, request: Request, method: str, collection: str, segments: List[str]) -> Response:
+        resource_type = _RESOURCES[collection]
+        if not segments and method == "POST":
+            self._authorize(request, resource_type, "create")
+            return self._idempotent_create(request, collection)
+        if not segments and method == "GET" and collection != "quotes":
+            self._authorize(request, resource_type, "list")
+            return self._list(request, collection)
+        if len(segments) == 1 and method == "GET":
+            self._authorize(request, resource_type, "read")
+            return Response(200, json=self._render(collection, self._find(collection, segments[0])))
+        if len(segments) == 2 and segments[1] == "complete" and method == "POST" and collection == "incoming-payments":
+            self._authorize(request, resource_type, "complete")
+            with self._lock:
+                payment = self._find(collection, segments[0])
+                payment["completed"] = True
+                payment["updatedAt"] = _now()
+            return Response(200, json=self._render(collection, payment))
+        raise StubError(404, "not_found")
+
+    def _verify(self, request: Request) -> str:
+        """
+        Check the content digest and signature of request, returning the signing key id
+        """
+        if request.content:
+            try:
+                verify_content_digest(request)
+            except HTTPMessageSignaturesException as exc:
+                raise StubError(400, "invalid_request", str(exc)) from exc
+        if not self.verify_signatures:
+            return ""
+        try:
+            results = self._verifier.verify(request)
+        except HTTPMessageSignaturesException as exc:
+            raise StubError(401, "invalid_signature", str(exc)) from exc
+        return results[0].parameters["keyid"]
+
+    @staticmethod
+    def _bearer(request: Request) -> str:
+        scheme, _, value = request.headers.get("Authorization", "").partition(" ")
+        if scheme != "GNAP" or not value:
+            raise StubError(401, "invalid_token", "Missing GNAP access token")
+        return value
+
+    def _authorize(self, request: Request, resource_type: str, action: str) -> dict:
+        """
+        Check the access token and signature of a resource server request
+        """
+        keyid = self._verify(request)
+        with self._lock:
+            token = self._tokens_by_value.get(self._bearer(request))
+            if token is None or token["expires_at"] <= time.monotonic():
+                raise StubError(401, "invalid_token", "Unknown or expired access token")
+            if self.verify_signatures and keyid != token["keyid"]:
+                raise StubError(401, "invalid_signature", "Request not signed with the grant's key")
+            for item in token["access"]:
+                actions = item.get("actions", [])
+                if item.get("type") == resource_type and (action in actions or f"{action}-all" in actions):
+                    return token
+        raise StubError(403, "insufficient_grant", f"Token does not allow {action} on {resource_type}")
+
+    def _pending_grant(self, grant: str) -> dict:
+        record = self._grants.get(grant.rstrip("/").rpartition("/")[2])
+        if record is None or record["status"] != "pending":
+            raise KeyError(f"No pending grant {grant}")
+        return record
+
+    def _continue(self, grant: dict) -> dict:
+        return {
+            "access_token": {"value": grant["continue_token"]},
+            "uri": f"{self.auth_server}/continue/{grant['id']}",
+            "wait": self.continue_wait
+        }
+
+    def _issue_token(self, grant: dict) -> dict:
+        token = {
+            "id": str(uuid.uuid4()),
+            "value": uuid.uuid4().hex.upper(),
+            "grant_id": grant["id"],
+            "keyid": grant["keyid"],
+            "access": grant["access"],
+            "expires_at": time.monotonic() + self.token_expires_in
+        }
+        self._tokens[token["id"]] = token
+        self._tokens_by_value[token["value"]] = token
+        return {
+            "value": token["value"],
+            "manage": f"{self.auth_server}/token/{token['id']}",
+            "expires_in": self.token_expires_in,
+            "access": token["access"]
+        }
+
+    def _revoke_token(self, token: dict) -> None:
+        self._tokens.pop(token["id"], None)
+        self._tokens_by_value.pop(token["value"], None)
+
+    def _post_grant(self, request: Request) -> Response:
+        keyid = self._verify(request)
+        body = json.loads(request.content or b"{}")
+        access = body.get("access_token", {}).get("access")
+        if not access or not body.get("client"):
+            raise StubError(400, "invalid_request", "Grant request needs access_token.access and client")
+        grant = {
+            "id": str(uuid.uuid4()),
+            "continue_token": uuid.uuid4().hex.upper(),
+            "keyid": keyid,
+            "access": access,
+            "status": "pending" if body.get("interact") else "granted",
+            "finish": (body.get("interact") or {}).get("finish"),
+            "interact_nonce": uuid.uuid4().hex,
+            "interact_ref": None
+        }
+        with self._lock:
+            self._grants[grant["id"]] = grant
+            if grant["status"] == "pending":
+                return Response(200, json={
+                    "interact": {
+                        "redirect": f"{self.auth_server}/interact/{grant['id']}",
+                        "finish": grant["interact_nonce"]
+                    },
+                    "continue": self._continue(grant)
+                })
+            return Response(200, json={"access_token": self._issue_token(grant), "continue": self._continue(grant)})
+
+    def _interact(self, grant_id: str) -> Response:
+        """
+        Stand-in for the user consenting: approve the grant and redirect to the finish URI
+        """
+        interact_ref = self.approve_grant(grant_id)
+        finish = self._grants[grant_id]["finish"]
+        if not finish:
+            return Response(200, json={"interact_ref": interact_ref})
+        data = f"{finish['nonce']}\n{self._grants[grant_id]['interact_nonce']}\n{interact_ref}\n{self.auth_server}/"
+        digest = base64.b64encode(hashlib.sha256(data.encode("utf-8")).digest()).decode("utf-8")
+        location = f"{finish['uri']}?{urlencode({'hash': digest, 'interact_ref': interact_ref})}"
+        return Response(302, headers={"Location": location})
+
+    def _continue_grant(self, request: Request, grant_id: str) -> Response:
+        keyid = self._verify(request)
+        value = self._bearer(request)
+        with self._lock:
+            grant = self._grants.get(grant_id)
+            if grant is None or not hmac.compare_digest(grant["continue_token"], value):
+                raise StubError(401, "invalid_continuation", "Unknown grant or continuation token")
+            if self.verify_signatures and keyid != grant["keyid"]:
+                raise StubError(401, "invalid_client", "Request not signed with the grant's key")
+            if request.method == "DELETE":
+                del self._grants[grant_id]
+                for token in [token for token in self._tokens.values() if token["grant_id"] == grant_id]:
+                    self._revoke_token(token)
+                return Response(204)
+            if grant["status"] == "pending":
+                return Response(200, json={"continue": self._continue(grant)})
+            if grant["status"] == "rejected":
+                raise StubError(401, "request_denied", "Grant was rejected")
+            if grant["status"] != "approved":
+                raise StubError(401, "invalid_continuation", "Grant was already issued")
+            interact_ref = json.loads(request.content or b"{}").get("interact_ref")
+            if interact_ref is not None and interact_ref != grant["interact_ref"]:
+                raise StubError(401, "invalid_continuation", "Wrong interact_ref")
+            grant["status"] = "granted"
+            grant["continue_token"] = uuid.uuid4().hex.upper()
+            return Response(200, json={"access_token": self._issue_token(grant), "continue": self._continue(grant)})
+
+    def _manage_token(self, request: Request, token_id: str) -> Response:
+        keyid = self._verify(request)
+        value = self._bearer(request)
+        with self._lock:
+            token = self._tokens.get(token_id)
+            if token is None or not hmac.compare_digest(token["value"], value):
+                raise StubError(401, "invalid_token", "Unknown access token")
+            if self.verify_signatures and keyid != token["keyid"]:
+                raise StubError(401, "invalid_client", "Request not signed with the grant's key")
+            self._revoke_token(token)
+            if request.method == "DELETE":
+                return Response(204)
+            return Response(200, json={"access_token": self._issue_token(self._grants[token["grant_id"]])})
+
+    def _wallet(self, name: str) -> dict:
+        wallet = self._wallets.get(name)
+        if wallet is None:
+            raise StubError(404, "not_found", f"Unknown wallet address {name}")
+        return wallet
+
+    def _cacheable(self, payload: dict, request: Request) -> Response:
+        body = json.dumps(payload).encode("utf-8")
+        etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+        headers = {"Cache-Control": "max-age=60", "ETag": etag}
+        if request.headers.get("If-None-Match") == etag:
+            return Response(304, headers=headers)
+        return Response(200, content=body, headers={**headers, "Content-Type": "application/json"})
+
+    def _get_wallet_address(self, name: str, request: Request) -> Response:
+        wallet = self._wallet(name)
+        return self._cacheable({
+            "id": self.wallet_address_url(name),
+            "publicName": wallet["publicName"],
+            "assetCode": wallet["assetCode"],
+            "assetScale": wallet["assetScale"],
+            "authServer": self.auth_server,
+            "resourceServer": self.resource_server
+        }, request)
+
+    def _get_jwks(self, name: str, request: Request) -> Response:
+        return self._cacheable({"keys": self._wallet(name)["keys"]}, request)
+
+    def _idempotent_create(self, request: Request, collection: str) -> Response:
+        key = request.headers.get("Idempotency-Key")
+        if key is not None:
+            with self._lock:
+                cached = self._idempotent.get((collection, key))
+            if cached is not None:
+                return Response(cached.status_code, content=cached.content, headers=cached.headers)
+        body = json.loads(request.content or b"{}")
+        create = {
+            "incoming-payments": self._create_incoming_payment,
+            "outgoing-payments": self._create_outgoing_payment,
+            "quotes": self._create_quote
+        }[collection]
+        with self._lock:
+            resource = create(body)
+            resource["id"] = str(uuid.uuid4())
+            self._resources[collection][resource["id"]] = resource
+            response = Response(201, json=self._render(collection, resource))
+            if key is not None:
+                self._idempotent[(collection, key)] = response
+        return response
+
+    def _asset(self, wallet_address: str) -> dict:
+        wallet = self._wallets.get(wallet_address.rstrip("/").rpartition("/")[2], {})
+        return {"assetCode": wallet.get("assetCode", "USD"), "assetScale": wallet.get("assetScale", 2)}
+
+    def _create_incoming_payment(self, body: dict) -> dict:
+        if "walletAddress" not in body:
+            raise StubError(400, "invalid_request", "walletAddress is required")
+        now = _now()
+        return {
+            "walletAddress": body["walletAddress"],
+            "completed": False,
+            "incomingAmount": body.get("incomingAmount"),
+            "receivedAmount": {"value": "0", **self._asset(body["walletAddress"])},
+            "expiresAt": body.get("expiresAt"),
+            "metadata": body.get("metadata"),
+            "createdAt": now,
+            "updatedAt": now
+        }
+
+    def _create_quote(self, body: dict) -> dict:
+        if "walletAddress" not in body or "receiver" not in body:
+            raise StubError(400, "invalid_request", "walletAddress and receiver are required")
+        amount = body.get("debitAmount") or body.get("receiveAmount")
+        if amount is None:
+            receiver = self._resources["incoming-payments"].get(body["receiver"].rstrip("/").rpartition("/")[2])
+            amount = (receiver or {}).get("incomingAmount")
+        if amount is None:
+            raise StubError(400, "invalid_request", "Quote needs a debitAmount, receiveAmount or fixed incoming amount")
+        now = _now()
+        return {
+            "walletAddress": body["walletAddress"],
+            "receiver": body["receiver"],
+            "receiveAmount": body.get("receiveAmount") or amount,
+            "debitAmount": body.get("debitAmount") or amount,
+            "method": body.get("method", "ilp"),
+            "expiresAt": _timestamp(now + timedelta(minutes=5)),
+            "createdAt": now
+        }
+
+    def _create_outgoing_payment(self, body: dict) -> dict:
+        if "walletAddress" not in body:
+            raise StubError(400, "invalid_request", "walletAddress is required")
+        if "quoteId" in body:
+            quote = self._resources["quotes"].get(body["quoteId"].rstrip("/").rpartition("/")[2])
+            if quote is None:
+                raise StubError(400, "invalid_request", "Unknown quote")
+            receiver, debit_amount, receive_amount = quote["receiver"], quote["debitAmount"], quote["receiveAmount"]
+            quote_id = f"{self.resource_server}/quotes/{quote['id']}"
+        elif "incomingPayment" in body and "debitAmount" in body:
+            receiver, debit_amount, receive_amount = body["incomingPayment"], body["debitAmount"], body["debitAmount"]
+            quote_id = None
+        else:
+            raise StubError(400, "invalid_request", "Outgoing payment needs a quoteId or incomingPayment and debitAmount")
+        now = _now()
+        return {
+            "walletAddress": body["walletAddress"],
+            "quoteId": quote_id,
+            "failed": False,
+            "receiver": receiver,
+            "receiveAmount": receive_amount,
+            "debitAmount": debit_amount,
+            "sentAmount": {**debit_amount, "value": "0"},
+            "metadata": body.get("metadata"),
+            "createdAt": now,
+            "updatedAt": now
+        }
+
+    def _find(self, collection: str, resource_id: str) -> dict:
+        resource = self._resources[collection].get(resource_id)
+        if resource is None:
+            raise StubError(404, "not_found", f"Unknown {_RESOURCES[collection]} {resource_id}")
+        return resource
+
+    def _render(self, collection: str, resource: dict, listed: bool = False) -> dict:
+        payload = {"id": f"{self.resource_server}/{collection}/{resource['id']}"}
+        for name, value in resource.items():
+            if name == "id" or value is None:
+                continue
+            payload[name] = _timestamp(value) if isinstance(value, datetime) else value
+        if collection == "incoming-payments" and not listed:
+            payload["methods"] = [{
+                "type": "ilp",
+                "ilpAddress": f"test.stub.{resource['id']}",
+                "sharedSecret": base64.urlsafe_b64encode(resource["id"].encode("utf-8")).decode("utf-8").rstrip("=")
+            }]
+        return payload
+
+    def _list(self, request: Request, collection: str) -> Response:
+        params = {name: values[-1] for name, values in parse_qs(urlsplit(str(request.url)).query).items()}
+        wallet_address = params.get("wallet-address")
+        if not wallet_address:
+            raise StubError(400, "invalid_request", "wallet-address is required")
+        with self._lock:
+            items = [item for item in self._resources[collection].values() if item["walletAddress"] == wallet_address]
+        ids = [item["id"] for item in items]
+        cursor = params.get("cursor")
+        if cursor is not None and cursor not in ids:
+            raise StubError(400, "invalid_request", "Unknown cursor")
+        if "last" in params and "first" not in params:
+            end = ids.index(cursor) if cursor is not None else len(items)
+            start = max(end - int(params["last"]), 0)
+        else:
+            start = ids.index(cursor) + 1 if cursor is not None else 0
+            end = min(start + int(params.get("first", 10)), len(items))
+        page = items[start:end]
+        pagination = {"hasPreviousPage": start > 0, "hasNextPage": end < len(items)}
+        if page:
+            pagination.update(startCursor=page[0]["id"], endCursor=page[-1]["id"])
+        return Response(200, json={
+            "pagination": pagination,
+            "result": [self._render(collection, item, listed=True) for item in page]
+        })
@@ -0,0 +1,138 @@
+"""
+In-memory response cache
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+from httpx import Response
+
+from open_payments_sdk.models.http import CacheStats
+
+
+def parse_max_age(response: Response, default_ttl: float) -> Optional[float]:
+    """
+    Return how long a response may be served from cache, or None if it must not be stored.
+    ``no-cache`` responses are stored with a zero lifetime so they can be revalidated
+    """
+    directives = {}
+    for part in response.headers.get("Cache-Control", "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"')
+    if "no-store" in directives:
+        return None
+    if "no-cache" in directives:
+        return 0.0
+    if "max-age" in directives:
+        try:
+            return max(float(directives["max-age"]), 0.0)
+        except ValueError:
+            return 0.0
+    return default_ttl
+
+
+class CacheEntry:
+    """
+    Cached value with its validator and freshness deadline
+    """
+    __slots__ = ("value", "etag", "expires_at")
+
+    def __init__(self, value: Any, etag: Optional[str], expires_at: float):
+        self.value = value
+        self.etag = etag
+        self.expires_at = expires_at
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries expire after a per-entry lifetime.
+
+    Expired entries are kept until evicted so that they can be revalidated
+    with their ``ETag``.
+    """
+    def __init__(self, max_size: int = 1024, default_ttl: float = 60.0, clock: Callable[[], float] = time.monotonic):
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self.clock = clock
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._revalidations = 0
+        self._evictions = 0
+
+    def lookup(self, key: Hashable) -> Optional[CacheEntry]:
+        """
+        Return the entry for key if present, fresh or not, and count a hit when fresh
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            if entry.expires_at > self.clock():
+                self._hits += 1
+            else:
+                self._misses += 1
+            return entry
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """
+        Whether the entry can be served without contacting the server
+        """
+        return entry.expires_at > self.clock()
+
+    def store(self, key: Hashable, value: Any, response: Response) -> None:
+        """
+        Store a value parsed from response, honouring its caching headers
+        """
+        ttl = parse_max_age(response, self.default_ttl)
+        if ttl is None or self.max_size <= 0:
+            self.discard(key)
+            return
+        entry = CacheEntry(value, response.headers.get("ETag"), self.clock() + ttl)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def revalidated(self, entry: CacheEntry, response: Response) -> None:
+        """
+        Extend the lifetime of an entry after a ``304 Not Modified`` response
+        """
+        ttl = parse_max_age(response, self.default_ttl)
+        entry.expires_at = self.clock() + (ttl or 0.0)
+        with self._lock:
+            self._revalidations += 1
+
+    def discard(self, key: Hashable) -> None:
+        """
+        Remove key from the cache
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Remove every entry
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        """
+        Return hit/miss counters
+        """
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                revalidations=self._revalidations,
+                evictions=self._evictions,
+                size=len(self._entries)
+            )
@@ -0,0 +1,197 @@
+"""
+Grant cache
+"""
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Dict, Optional
+
+from open_payments_sdk.models.auth import Grant, GrantRequest, GrantResponse
+from open_payments_sdk.models.http import GrantCacheStats
+
+
+def grant_cache_key(grant_request: GrantRequest, auth_server_endpoint: str) -> Optional[str]:
+    """
+    Canonical hash of the requested access, client and authorization server.
+
+    Access items and their actions are sorted, so requests asking for the same
+    access in a different order share a key. Interactive requests are not
+    cacheable and return None.
+    """
+    if grant_request.interact is not None:
+        return None
+    access = []
+    for item in grant_request.access_token.access.model_dump(mode="json", exclude_none=True):
+        item["actions"] = sorted(item["actions"])
+        access.append(json.dumps(item, sort_keys=True, separators=(",", ":")))
+    canonical = json.dumps(
+        [auth_server_endpoint.rstrip("/"), grant_request.client.root, sorted(access)],
+        separators=(",", ":")
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class _GrantEntry:
+    __slots__ = ("grant", "expires_at")
+
+    def __init__(self, grant: Grant, expires_at: Optional[float]):
+        self.grant = grant
+        self.expires_at = expires_at
+
+
+class GrantCache:
+    """
+    Reuses non-interactive grants whose access token is still valid.
+
+    Identical requests in flight at the same time share one grant request.
+    Entries expire ``expiry_margin`` seconds before their access token does,
+    and are evicted when their access token or grant is revoked or rotated.
+    """
+    def __init__(self, max_size: int = 256, expiry_margin: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        self.max_size = max_size
+        self.expiry_margin = expiry_margin
+        self.clock = clock
+        self._entries: "OrderedDict[str, _GrantEntry]" = OrderedDict()
+        self._inflight: Dict[str, Future] = {}
+        self._async_inflight: Dict[str, asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._coalesced = 0
+        self._evictions = 0
+
+    def _lookup(self, key: str) -> Optional[Grant]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at is not None and entry.expires_at <= self.clock():
+            del self._entries[key]
+            self._evictions += 1
+            return None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return entry.grant
+
+    def _store(self, key: str, grant: Grant, issued_at: float) -> None:
+        if not isinstance(grant.root, GrantResponse) or self.max_size <= 0:
+            return
+        expires_in = grant.root.access_token.expires_in
+        expires_at = None if expires_in is None else issued_at + expires_in - min(self.expiry_margin, expires_in / 2)
+        with self._lock:
+            self._entries[key] = _GrantEntry(grant, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def get_or_request(self, key: Optional[str], request: Callable[[], Grant]) -> Grant:
+        """
+        Return the cached grant for key, or call request once for all concurrent callers
+        """
+        if key is None:
+            return request()
+        with self._lock:
+            grant = self._lookup(key)
+            if grant is not None:
+                return grant
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                self._misses += 1
+                future = self._inflight[key] = Future()
+            else:
+                self._coalesced += 1
+        if not owner:
+            return future.result()
+        issued_at = self.clock()
+        try:
+            grant = request()
+            self._store(key, grant, issued_at)
+            future.set_result(grant)
+            return grant
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    async def aget_or_request(self, key: Optional[str], request: Callable[[], Awaitable[Grant]]) -> Grant:
+        """
+        asyncio variant of ``get_or_request``; in-flight requests are shared within one event loop
+        """
+        if key is None:
+            return await request()
+        with self._lock:
+            grant = self._lookup(key)
+            if grant is not None:
+                return grant
+            future = self._async_inflight.get(key)
+            owner = future is None
+            if owner:
+                self._misses += 1
+                future = self._async_inflight[key] = asyncio.get_running_loop().create_future()
+            else:
+                self._coalesced += 1
+        if not owner:
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+            # the owner was cancelled, not this caller, so request the grant again
+            return await self.aget_or_request(key, request)
+        issued_at = self.clock()
+        try:
+            grant = await request()
+            self._store(key, grant, issued_at)
+            future.set_result(grant)
+            return grant
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # retrieve the exception so an unawaited future does not log it
+            future.exception()
+            raise
+        finally:
+            with self._lock:
+                self._async_inflight.pop(key, None)
+
+    def invalidate_token(self, token_value: str) -> None:
+        """
+        Evict grants whose access token or continuation token has the given value
+        """
+        with self._lock:
+            stale = [
+                key for key, entry in self._entries.items()
+                if token_value in (entry.grant.root.access_token.value, entry.grant.root.cont.access_token.value)
+            ]
+            for key in stale:
+                del self._entries[key]
+            self._evictions += len(stale)
+
+    def clear(self) -> None:
+        """
+        Remove every entry
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> GrantCacheStats:
+        """
+        Return hit/miss counters
+        """
+        with self._lock:
+            return GrantCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                coalesced=self._coalesced,
+                evictions=self._evictions,
+                size=len(self._entries)
+            )
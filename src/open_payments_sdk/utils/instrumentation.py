@@ -0,0 +1,193 @@
+"""
+Per-call instrumentation
+
+API methods decorated with ``instrumented`` record one ``CallMetrics`` per
+call when their object has an ``Instrumentation``. Phases are timed with
+``mark``: each mark adds the time since the previous one to a phase, so the
+phases of a call add up to its duration. Without an ``Instrumentation`` the
+decorator calls straight through and the marks reduce to a context variable
+lookup.
+"""
+import functools
+import inspect
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from logging import Logger
+from typing import Callable, Dict, List, Optional
+
+PHASES = ("build", "digest", "sign", "send", "parse")
+
+
+class CallMetrics:
+    """
+    Timings and outcome of one API call
+    """
+    __slots__ = ("endpoint", "method", "host", "status", "attempts", "phases", "start", "duration", "error", "_last")
+
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+        self.method: Optional[str] = None
+        self.host: Optional[str] = None
+        self.status: Optional[int] = None
+        self.attempts = 0
+        self.phases: Dict[str, float] = {}
+        self.error: Optional[BaseException] = None
+        self.duration = 0.0
+        self.start = self._last = time.perf_counter()
+
+    def mark(self, phase: str) -> None:
+        """
+        Add the time since the previous mark to phase
+        """
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + now - self._last
+        self._last = now
+
+    def as_dict(self) -> dict:
+        return {
+            "endpoint": self.endpoint,
+            "method": self.method,
+            "host": self.host,
+            "status": self.status,
+            "attempts": self.attempts,
+            "duration": self.duration,
+            "phases": dict(self.phases),
+            "error": type(self.error).__name__ if self.error is not None else None
+        }
+
+    def __repr__(self) -> str:
+        return f"CallMetrics({self.as_dict()})"
+
+
+CURRENT_CALL: ContextVar[Optional[CallMetrics]] = ContextVar("open_payments_call", default=None)
+
+
+def mark(phase: str) -> None:
+    """
+    Mark the end of phase for the call in progress, if it is instrumented
+    """
+    call = CURRENT_CALL.get()
+    if call is not None:
+        call.mark(phase)
+
+
+class Instrumentation:
+    """
+    Delivers the ``CallMetrics`` of every finished call to the registered hooks.
+
+    Hooks run on the calling thread after the call completes; exceptions they
+    raise are logged and swallowed.
+    """
+    def __init__(self, hooks: Optional[List[Callable[[CallMetrics], None]]] = None, logger: Optional[Logger] = None):
+        self.hooks = list(hooks or [])
+        self.logger = logger or logging.getLogger(__name__)
+
+    def add_hook(self, hook: Callable[[CallMetrics], None]) -> None:
+        self.hooks.append(hook)
+
+    def start(self, endpoint: str):
+        call = CallMetrics(endpoint)
+        return call, CURRENT_CALL.set(call)
+
+    @contextmanager
+    def resume(self, call: CallMetrics):
+        """
+        Make call, started earlier and set aside, the call in progress, and finish it on exit.
+        Used by batches that build, sign and send their calls in separate passes
+        """
+        token = CURRENT_CALL.set(call)
+        try:
+            yield call
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            self.finish(call, token)
+
+    def finish(self, call: CallMetrics, token) -> None:
+        CURRENT_CALL.reset(token)
+        if call.status is not None:
+            call.mark("parse")
+        call.duration = time.perf_counter() - call.start
+        for hook in self.hooks:
+            try:
+                hook(call)
+            except Exception:  # pylint: disable=broad-exception-caught
+                self.logger.exception("Instrumentation hook failed for %s", call.endpoint)
+
+
+def instrumented(endpoint: str):
+    """
+    Record the decorated API method as endpoint when its object has ``instrumentation``
+    """
+    def decorate(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(self, *args, **kwargs):
+                instrumentation = self.instrumentation
+                if instrumentation is None:
+                    return await func(self, *args, **kwargs)
+                call, token = instrumentation.start(endpoint)
+                try:
+                    return await func(self, *args, **kwargs)
+                except BaseException as exc:
+                    call.error = exc
+                    raise
+                finally:
+                    instrumentation.finish(call, token)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            instrumentation = self.instrumentation
+            if instrumentation is None:
+                return func(self, *args, **kwargs)
+            call, token = instrumentation.start(endpoint)
+            try:
+                return func(self, *args, **kwargs)
+            except BaseException as exc:
+                call.error = exc
+                raise
+            finally:
+                instrumentation.finish(call, token)
+        return wrapper
+    return decorate
+
+
+def log_hook(logger: Logger, level: int = logging.DEBUG) -> Callable[[CallMetrics], None]:
+    """
+    Hook logging one line per call
+    """
+    def hook(call: CallMetrics) -> None:
+        if logger.isEnabledFor(level):
+            phases = " ".join(f"{phase}={seconds * 1000:.2f}ms" for phase, seconds in call.phases.items())
+            logger.log(level, "%s %s %s -> %s in %.2fms %s", call.endpoint, call.method, call.host, call.status, call.duration * 1000, phases)
+    return hook
+
+
+def tracer_hook(tracer, prefix: str = "open_payments") -> Callable[[CallMetrics], None]:
+    """
+    Hook recording each call as a span on an OpenTelemetry-compatible tracer,
+    with phase timings as attributes
+    """
+    offset = time.time_ns() - time.perf_counter_ns()
+
+    def hook(call: CallMetrics) -> None:
+        start = int(call.start * 1e9) + offset
+        attributes = {
+            f"{prefix}.endpoint": call.endpoint,
+            "http.request.method": call.method or "",
+            "server.address": call.host or "",
+            f"{prefix}.attempts": call.attempts
+        }
+        if call.status is not None:
+            attributes["http.response.status_code"] = call.status
+        for phase, seconds in call.phases.items():
+            attributes[f"{prefix}.phase.{phase}_ms"] = seconds * 1000
+        span = tracer.start_span(f"{prefix}.{call.endpoint}", start_time=start, attributes=attributes)
+        if call.error is not None:
+            span.record_exception(call.error)
+        span.end(end_time=start + int(call.duration * 1e9))
+    return hook
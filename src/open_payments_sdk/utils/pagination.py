@@ -0,0 +1,79 @@
+"""
+Cursor pagination helpers
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Awaitable, Callable, Iterator, Optional
+
+from open_payments_sdk.models.resource import PaymentListQuery
+
+
+def _next_query(query: PaymentListQuery, page) -> Optional[PaymentListQuery]:
+    """
+    Return the query for the page following ``page``, or None on the last page.
+    Lists requested with only ``last`` are walked backwards
+    """
+    info = page.pagination
+    if query.last is not None and query.first is None:
+        if not info.hasPreviousPage or not info.startCursor:
+            return None
+        return query.model_copy(update={"cursor": info.startCursor})
+    if not info.hasNextPage or not info.endCursor:
+        return None
+    return query.model_copy(update={"cursor": info.endCursor})
+
+
+def iter_items(fetch_page: Callable, query: PaymentListQuery, prefetch: bool = True) -> Iterator:
+    """
+    Lazily yield the items of every page returned by ``fetch_page(query)``.
+
+    With ``prefetch`` the next page is requested on a worker thread while the
+    current one is consumed. At most two pages are held in memory.
+    """
+    if not prefetch:
+        while query is not None:
+            page = fetch_page(query)
+            query = _next_query(query, page)
+            yield from page.result
+        return
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="open-payments-prefetch")
+    try:
+        pending = executor.submit(fetch_page, query)
+        while pending is not None:
+            page = pending.result()
+            query = _next_query(query, page)
+            pending = executor.submit(fetch_page, query) if query is not None else None
+            yield from page.result
+            del page
+    finally:
+        # do not block a consumer that stops early on the in-flight prefetch
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def aiter_items(
+        fetch_page: Callable[[PaymentListQuery], Awaitable],
+        query: PaymentListQuery,
+        prefetch: bool = True
+    ) -> AsyncIterator:
+    """
+    asyncio variant of ``iter_items``; the next page is fetched in a task
+    """
+    if not prefetch:
+        while query is not None:
+            page = await fetch_page(query)
+            query = _next_query(query, page)
+            for item in page.result:
+                yield item
+        return
+    pending = asyncio.ensure_future(fetch_page(query))
+    try:
+        while pending is not None:
+            page = await pending
+            query = _next_query(query, page)
+            pending = asyncio.ensure_future(fetch_page(query)) if query is not None else None
+            for item in page.result:
+                yield item
+            del page
+    finally:
+        if pending is not None and not pending.done():
+            pending.cancel()
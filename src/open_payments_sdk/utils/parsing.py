@@ -0,0 +1,171 @@
+"""
+Response body parsing
+"""
+import threading
+import typing
+from collections.abc import Sequence
+from typing import Annotated, Any, Dict, List, Type, Union
+
+from httpx import Response
+from pydantic import AnyUrl, BaseModel, create_model, field_serializer
+
+from open_payments_sdk.models.base import DeferredModel
+from open_payments_sdk.models.resource import PageInfo
+
+
+class _RawPage(DeferredModel):
+    pagination: PageInfo
+    result: List[Dict[str, Any]]
+
+
+class LazyItems(Sequence):
+    """
+    Read-only sequence of page items, each validated into its model on first access
+    """
+    __slots__ = ("_model", "_raw", "_items")
+
+    def __init__(self, model: Type[BaseModel], raw: List[dict]):
+        self._model = model
+        self._raw = raw
+        self._items: List[Any] = [None] * len(raw)
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        item = self._items[index]
+        if item is None:
+            item = self._items[index] = self._model.model_validate(self._raw[index])
+            self._raw[index] = None
+        return item
+
+    def __repr__(self) -> str:
+        return f"LazyItems({self._model.__name__}, {len(self)} items)"
+
+
+_trusted_models: Dict[type, type] = {}
+_lazy_pages: Dict[type, type] = {}
+_trusted_lock = threading.Lock()
+
+
+def _is_url(annotation) -> bool:
+    return isinstance(annotation, type) and issubclass(annotation, AnyUrl)
+
+
+def _trusted_annotation(annotation):
+    """
+    Replace URL types in annotation with str, recursing into containers and models
+    """
+    if _is_url(annotation):
+        return str
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return trusted_model(annotation)
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+    if origin is Annotated:
+        # members of discriminated unions carry their Tag as metadata
+        return Annotated[(_trusted_annotation(args[0]), *annotation.__metadata__)]
+    if origin is Union:
+        return Union[tuple(_trusted_annotation(arg) for arg in args)]
+    if origin in (list, List):
+        return List[_trusted_annotation(args[0])]
+    return annotation
+
+
+def trusted_model(model: Type[BaseModel]) -> Type[BaseModel]:
+    """
+    Return a subclass of model whose URL fields are kept as plain ``str``.
+
+    URL validation is a large share of model validation, and it can be skipped
+    for servers that are trusted to return well-formed URLs. Nested models,
+    including root models such as ``Receiver``, are replaced by trusted
+    subclasses too, so every value is still an instance of its declared model
+    and only the URL values themselves are ``str`` instead of ``AnyUrl``.
+    """
+    with _trusted_lock:
+        trusted = _trusted_models.get(model)
+    if trusted is not None:
+        return trusted
+    fields = {}
+    for name, field in model.model_fields.items():
+        annotation = _trusted_annotation(field.annotation)
+        if annotation is not field.annotation:
+            fields[name] = (annotation, field)
+    trusted = create_model(f"Trusted{model.__name__}", __base__=model, **fields) if fields else model
+    with _trusted_lock:
+        return _trusted_models.setdefault(model, trusted)
+
+
+def _serialize_items(self, items: Sequence) -> list:  # pylint: disable=unused-argument
+    return list(items)
+
+
+def lazy_page_model(model: Type[BaseModel]) -> Type[BaseModel]:
+    """
+    Return a subclass of the paginated model whose ``result`` is a ``Sequence``.
+
+    Lazy pages hold their items in ``LazyItems``, which is a sequence of the
+    item model rather than a list. The subclass declares that, and serializes
+    the items like the original list.
+    """
+    with _trusted_lock:
+        lazy = _lazy_pages.get(model)
+    if lazy is not None:
+        return lazy
+    field = model.model_fields["result"]
+    item_model = typing.get_args(field.annotation)[0]
+    lazy = create_model(
+        f"Lazy{model.__name__}",
+        __base__=model,
+        __validators__={"_serialize_result": field_serializer("result")(_serialize_items)},
+        result=(typing.Sequence[item_model], field)
+    )
+    with _trusted_lock:
+        return _lazy_pages.setdefault(model, lazy)
+
+
+class ResponseParser:
+    """
+    Turns response bodies into models.
+
+    The default mode validates ``response.json()`` like previous releases. In
+    ``fast`` mode bodies are validated straight from bytes with
+    ``model_validate_json``. With ``lazy_pages`` the items of list pages are
+    only validated when first accessed, which pays off when pages are only
+    partially read; such pages are ``lazy_page_model`` subclasses whose
+    ``result`` is a ``LazyItems`` sequence. ``trust_urls`` additionally skips URL validation by
+    returning ``trusted_model`` subclasses whose URL fields are plain strings.
+    """
+    def __init__(self, fast: bool = False, lazy_pages: bool = False, trust_urls: bool = False):
+        self.fast = fast
+        self.lazy_pages = lazy_pages
+        self.trust_urls = trust_urls
+
+    def _model(self, model: Type[BaseModel]) -> Type[BaseModel]:
+        return trusted_model(model) if self.trust_urls else model
+
+    def parse(self, model: Type[BaseModel], response: Response):
+        """
+        Validate the response body into model
+        """
+        model = self._model(model)
+        if self.fast:
+            return model.model_validate_json(response.content)
+        return model.model_validate(response.json())
+
+    def parse_page(self, model: Type[BaseModel], response: Response):
+        """
+        Validate a paginated list body into model, deferring item validation with lazy_pages.
+        Lazy pages are always read from bytes, with or without ``fast``
+        """
+        if not self.lazy_pages:
+            return self.parse(model, response)
+        model = lazy_page_model(self._model(model))
+        item_model = typing.get_args(model.model_fields["result"].annotation)[0]
+        page = _RawPage.model_validate_json(response.content)
+        return model.model_construct(pagination=page.pagination, result=LazyItems(item_model, page.result))
+
+
+DEFAULT_PARSER = ResponseParser()
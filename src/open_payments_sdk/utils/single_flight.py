@@ -0,0 +1,154 @@
+"""
+Single-flight request coalescing
+
+API methods decorated with ``coalesced`` share one in-flight call among
+concurrent callers with identical arguments when their object has a
+``SingleFlight``. The first caller builds, signs and sends the request;
+callers arriving while it is in flight wait for it and receive a copy of its
+result, or its exception, instead of sending their own. Nothing is kept once
+the call completes, so later calls always reach the server.
+"""
+import asyncio
+import functools
+import inspect
+import threading
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+from pydantic import BaseModel
+
+from open_payments_sdk.models.http import SingleFlightStats
+
+T = TypeVar("T")
+
+
+def _share(result: T) -> T:
+    """
+    Copy of a shared result for a waiting caller, so callers cannot change each other's models
+    """
+    return result.model_copy(deep=True) if isinstance(result, BaseModel) else result
+
+
+class SingleFlight:
+    """
+    In-flight calls by key, shared by threads, or by the coroutines of the same event loop
+    """
+    def __init__(self):
+        self._inflight: Dict[Hashable, Future] = {}
+        self._async_inflight: Dict[Tuple[asyncio.AbstractEventLoop, Hashable], asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._coalesced = 0
+
+    def do(self, key: Hashable, call: Callable[[], T]) -> T:
+        """
+        Return the result of call, made once for all concurrent callers with key
+        """
+        with self._lock:
+            self._calls += 1
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+            else:
+                self._coalesced += 1
+        if not owner:
+            return _share(future.result())
+        try:
+            result = call()
+            future.set_result(result)
+            return result
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+    async def ado(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        """
+        asyncio variant of ``do``. Calls are only shared with callers on the same
+        event loop, since a future cannot be awaited from another loop
+        """
+        loop = asyncio.get_running_loop()
+        key = (loop, key)
+        with self._lock:
+            self._calls += 1
+            future = self._async_inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._async_inflight[key] = loop.create_future()
+            else:
+                self._coalesced += 1
+        if not owner:
+            try:
+                return _share(await asyncio.shield(future))
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+            # the owner was cancelled, not this caller, so make the call itself
+            return await call()
+        try:
+            result = await call()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # retrieve the exception so an unawaited future does not log it
+            future.exception()
+            raise
+        finally:
+            with self._lock:
+                del self._async_inflight[key]
+
+    def stats(self) -> SingleFlightStats:
+        """
+        Return call counters
+        """
+        with self._lock:
+            return SingleFlightStats(
+                calls=self._calls,
+                coalesced=self._coalesced,
+                in_flight=len(self._inflight) + len(self._async_inflight)
+            )
+
+
+def coalesced(func):
+    """
+    Share concurrent identical calls of the decorated API method when its object has ``single_flight``.
+    Calls are identical when they bind the same arguments, whether passed by position or keyword,
+    which for GETs are the URL and access token. Calls with unhashable arguments are not shared
+    """
+    signature = inspect.signature(func)
+
+    def call_key(self, args, kwargs):
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        key = (func.__qualname__, tuple(bound.arguments.items())[1:])
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(self, *args, **kwargs):
+            single_flight = self.single_flight
+            key = None if single_flight is None else call_key(self, args, kwargs)
+            if key is None:
+                return await func(self, *args, **kwargs)
+            return await single_flight.ado(key, lambda: func(self, *args, **kwargs))
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        single_flight = self.single_flight
+        key = None if single_flight is None else call_key(self, args, kwargs)
+        if key is None:
+            return func(self, *args, **kwargs)
+        return single_flight.do(key, lambda: func(self, *args, **kwargs))
+    return wrapper
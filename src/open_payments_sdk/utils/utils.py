@@ -15,4 +15,8 @@ def get_default_covered_components() -> tuple:
     """
     Return default covered components
     """
-    return ("@method","@target-uri")
\ No newline at end of file
+    return ("@method","@target-uri")
+
+BODY_COMPONENTS = ("content-type", "content-digest", "content-length", *get_default_covered_components())
+AUTHORIZED_COMPONENTS = ("authorization", *get_default_covered_components())
+AUTHORIZED_BODY_COMPONENTS = ("content-type", "content-digest", "content-length", "authorization", *get_default_covered_components())
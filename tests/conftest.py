@@ -1,6 +1,12 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
 import pytest
 from open_payments_sdk.client.client import OpenPaymentsClient
+from open_payments_sdk.gnap_utils.keys import KeyManager
 from open_payments_sdk.models.auth import GrantRequest
+from open_payments_sdk.testing.stub_server import StubOpenPaymentsServer
 
 @pytest.fixture
 def keyid_private_key() -> dict:
@@ -14,6 +20,83 @@ def keyid_private_key() -> dict:
         "keyid": "a96a5611-c5fa-49c0-8cb4-184763eca0b8"
     }
 
+class _EchoHandler(BaseHTTPRequestHandler):
+    """
+    Minimal keep-alive HTTP handler echoing the request back as JSON
+    """
+    protocol_version = "HTTP/1.1"
+
+    def _reply(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length).decode("utf-8") if length else ""
+        payload = json.dumps({"method": self.command, "path": self.path, "body": body}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = do_POST = do_DELETE = _reply
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+@pytest.fixture
+def http_server_factory():
+    """
+    Start local HTTP servers for a request handler class, returning their base URL
+    """
+    servers = []
+
+    def start(handler_class) -> str:
+        server = ThreadingHTTPServer(("127.0.0.1", 0), handler_class)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+@pytest.fixture
+def local_server(http_server_factory):
+    """
+    Local HTTP server for tests that must not reach the network
+    """
+    return http_server_factory(_EchoHandler)
+
+@pytest.fixture
+def stub_key_pair():
+    """
+    Client key pair trusted by the stub server
+    """
+    return KeyManager().generate_key_pair()
+
+@pytest.fixture
+def stub_server(stub_key_pair):
+    """
+    Stub Open Payments server on a local port hosting the client, alice and bob wallet addresses
+    """
+    with StubOpenPaymentsServer() as server:
+        server.serve()
+        server.add_wallet_address("client", jwks=stub_key_pair.jwks)
+        server.add_wallet_address("alice")
+        server.add_wallet_address("bob", asset_code="EUR")
+        yield server
+
+@pytest.fixture
+def stub_client(stub_server, stub_key_pair):
+    """
+    OP client talking to the stub server
+    """
+    with OpenPaymentsClient(
+        keyid=stub_key_pair.jwks.keys[0].kid,
+        private_key=stub_key_pair.private_key_pem,
+        client_wallet_address=stub_server.wallet_address_url("client")
+    ) as client:
+        yield client
+
 @pytest.fixture
 def op_client(keyid_private_key) -> OpenPaymentsClient:
     """
@@ -0,0 +1,128 @@
+"""
+Unit Tests for the asyncio OP Client
+"""
+import asyncio
+
+from open_payments_sdk.api.auth import AsyncAccessTokens, AsyncGrants
+from open_payments_sdk.api.resource import AsyncIncomingPayments, AsyncOutgoingPayments, AsyncQuotes
+from open_payments_sdk.api.wallet import AsyncWallet
+from open_payments_sdk.client.async_client import AsyncOpenPaymentsClient
+from open_payments_sdk.http import AsyncHttpClient
+from open_payments_sdk.models.auth import GrantRequest, InteractRef
+from open_payments_sdk.models.resource import (IncomingPaymentRequest,
+                                               OutgoingPaymentRequest,
+                                               PaymentListQuery, QuoteRequest)
+
+
+def test_create_async_op_client(keyid_private_key):
+    """
+    Test async OP client creation
+    """
+    client = AsyncOpenPaymentsClient(
+        keyid=keyid_private_key["keyid"],
+        private_key=keyid_private_key["private_key"],
+        client_wallet_address="https://ilp.interledger-test.dev/elijahokellosalary"
+    )
+    assert isinstance(client.http_client, AsyncHttpClient)
+    assert isinstance(client.grants, AsyncGrants)
+    assert isinstance(client.access_tokens, AsyncAccessTokens)
+    assert isinstance(client.wallet, AsyncWallet)
+    assert isinstance(client.incoming_payments, AsyncIncomingPayments)
+    assert isinstance(client.outgoing_payments, AsyncOutgoingPayments)
+    assert isinstance(client.quotes, AsyncQuotes)
+    asyncio.run(client.aclose())
+
+
+def test_async_signed_requests_share_pool(keyid_private_key, local_server, grant_req_dto):
+    """
+    Concurrent signed requests are multiplexed over one pooled async client
+    """
+    async def run():
+        async with AsyncOpenPaymentsClient(
+            keyid=keyid_private_key["keyid"],
+            private_key=keyid_private_key["private_key"],
+            client_wallet_address="https://ilp.interledger-test.dev/elijahokellosalary"
+        ) as client:
+            requests = [
+                client.grants._build_grant_request(grant_req_dto, f"{local_server}/grant")
+                for _ in range(10)
+            ]
+            responses = await asyncio.gather(*(client.http_client.send(request) for request in requests))
+            assert all(response.json()["method"] == "POST" for response in responses)
+            assert all("Signature" in request.headers for request in requests)
+            stats = client.pool_stats()
+            assert stats.requests_sent == 10
+            assert stats.pools["default"].connections <= 10
+
+    asyncio.run(run())
+
+
+def test_async_payment_flow_against_stub(stub_server, stub_key_pair):
+    """
+    Wallet lookups, grants, incoming payment, quote and interactive outgoing payment end to end
+    """
+    async def run():
+        async with AsyncOpenPaymentsClient(
+            keyid=stub_key_pair.jwks.keys[0].kid,
+            private_key=stub_key_pair.private_key_pem,
+            client_wallet_address=stub_server.wallet_address_url("client")
+        ) as client:
+            alice, bob = await asyncio.gather(
+                client.wallet.get_wallet_address(stub_server.wallet_address_url("alice")),
+                client.wallet.get_wallet_address(stub_server.wallet_address_url("bob"))
+            )
+            assert bob.assetCode.root == "EUR"
+
+            incoming_grant = await client.grants.post_grant_request(GrantRequest.model_validate({
+                "access_token": {"access": [{"type": "incoming-payment", "actions": ["create", "read", "list"]}]},
+                "client": client.client_wallet_address
+            }), stub_server.auth_server)
+            incoming_token = incoming_grant.root.access_token.value
+            incoming = await client.incoming_payments.post_create_payment(
+                IncomingPaymentRequest.model_validate({
+                    "walletAddress": str(bob.id),
+                    "incomingAmount": {"value": "500", "assetCode": "EUR", "assetScale": 2},
+                    "expiresAt": None,
+                    "metadata": None
+                }),
+                str(bob.resourceServer),
+                incoming_token
+            )
+            listed = [
+                payment async for payment in client.incoming_payments.iter_incoming_payments(
+                    PaymentListQuery(walletAddress=str(bob.id), first=1), str(bob.resourceServer), incoming_token
+                )
+            ]
+            assert [payment.id for payment in listed] == [incoming.id]
+
+            quote_grant = await client.grants.post_grant_request(GrantRequest.model_validate({
+                "access_token": {"access": [{"type": "quote", "actions": ["create", "read"]}]},
+                "client": client.client_wallet_address
+            }), stub_server.auth_server)
+            quote = await client.quotes.post_create_quote(
+                QuoteRequest.model_validate({"walletAddress": str(alice.id), "receiver": str(incoming.id), "method": "ilp"}),
+                str(alice.resourceServer),
+                quote_grant.root.access_token.value
+            )
+            assert quote.debitAmount.value == "500"
+
+            pending = (await client.grants.post_grant_request(GrantRequest.model_validate({
+                "access_token": {"access": [{
+                    "type": "outgoing-payment", "actions": ["create", "read"], "identifier": str(alice.id)
+                }]},
+                "client": client.client_wallet_address,
+                "interact": {"start": ["redirect"]}
+            }), stub_server.auth_server)).root
+            interact_ref = stub_server.approve_grant(str(pending.cont.uri))
+            granted = await client.grants.post_grant_continuation_request(
+                InteractRef(interact_ref=interact_ref), str(pending.cont.uri), pending.cont.access_token.value
+            )
+            payment = await client.outgoing_payments.post_create_payment(
+                OutgoingPaymentRequest.model_validate({"walletAddress": str(alice.id), "quoteId": str(quote.id), "metadata": None}),
+                str(alice.resourceServer),
+                granted.access_token.value
+            )
+            assert payment.receiver.root == incoming.id
+            assert payment.debitAmount == quote.debitAmount
+
+    asyncio.run(run())
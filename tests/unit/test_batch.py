@@ -0,0 +1,66 @@
+"""
+Unit Tests for the batch API
+"""
+import asyncio
+import threading
+import time
+
+from open_payments_sdk.api.batch import AsyncBatch, Batch
+
+
+class FakeQuotes:
+    """
+    Records concurrency instead of calling a resource server
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def post_create_quote(self, quote, resource_server_endpoint, access_token):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.01)
+        with self.lock:
+            self.in_flight -= 1
+        if quote % 5 == 0:
+            raise ValueError(f"bad quote {quote}")
+        return f"{resource_server_endpoint}/quotes/{quote}"
+
+
+def test_batch_preserves_order_and_bounds_concurrency():
+    """
+    Results come back in input order with per-item errors
+    """
+    quotes = FakeQuotes()
+    batch = Batch(quotes=quotes, outgoing_payments=None, max_concurrency=4)
+    result = batch.create_quotes(list(range(1, 21)), "https://rs.example", "token")
+
+    assert [item.index for item in result.items] == list(range(20))
+    assert result.results[0] == "https://rs.example/quotes/1"
+    assert [str(item.error) for item in result.errors] == ["bad quote 5", "bad quote 10", "bad quote 15", "bad quote 20"]
+    assert result.stats.items == 20
+    assert result.stats.failed == 4
+    assert result.stats.throughput > 0
+    assert 1 < quotes.max_in_flight <= 4
+
+
+def test_async_batch_bounds_concurrency():
+    """
+    The async batch limits in-flight coroutines with a semaphore
+    """
+    state = {"in_flight": 0, "max": 0}
+
+    class AsyncFakeQuotes:
+        async def post_create_quote(self, quote, resource_server_endpoint, access_token):
+            state["in_flight"] += 1
+            state["max"] = max(state["max"], state["in_flight"])
+            await asyncio.sleep(0.01)
+            state["in_flight"] -= 1
+            return quote * 2
+
+    batch = AsyncBatch(quotes=AsyncFakeQuotes(), outgoing_payments=None, max_concurrency=3)
+    result = asyncio.run(batch.create_quotes(list(range(10)), "https://rs.example", "token"))
+    assert result.results == [quote * 2 for quote in range(10)]
+    assert state["max"] == 3
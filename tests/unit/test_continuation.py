@@ -0,0 +1,91 @@
+"""
+Unit Tests for the grant continuation poller
+"""
+import asyncio
+import logging
+from concurrent.futures import CancelledError, Future
+
+import httpx
+import pytest
+
+from open_payments_sdk.api.continuation import (BaseContinuationPoller,
+                                                GrantRejectedError,
+                                                PendingContinuation)
+from open_payments_sdk.client.async_client import AsyncOpenPaymentsClient
+from open_payments_sdk.models.auth import Continue, GrantRequest
+
+
+def _interactive_grant(client, stub_server):
+    return client.grants.post_grant_request(
+        GrantRequest.model_validate({
+            "access_token": {"access": [{"type": "quote", "actions": ["create"]}]},
+            "client": client.client_wallet_address,
+            "interact": {"start": ["redirect"]}
+        }),
+        stub_server.auth_server
+    )
+
+
+def test_poller_resolves_approved_and_rejected(stub_client, stub_server):
+    """
+    Approved grants resolve with tokens, rejected ones fail and pending ones are cancelled on close
+    """
+    stub_server.continue_wait = 0
+    approved, rejected, pending = (_interactive_grant(stub_client, stub_server).root for _ in range(3))
+    poller = stub_client.continuation_poller
+    futures = [poller.poll(grant.cont, delay=0.05) for grant in (approved, rejected, pending)]
+    stub_server.approve_grant(str(approved.cont.uri))
+    stub_server.reject_grant(str(rejected.cont.uri))
+
+    assert futures[0].result(timeout=5).access_token.value
+    with pytest.raises(GrantRejectedError):
+        futures[1].result(timeout=5)
+    poller.close()
+    with pytest.raises(CancelledError):
+        futures[2].result(timeout=5)
+
+
+def test_poller_backs_off():
+    """
+    too_fast adds five seconds to the wait and Retry-After is honoured
+    """
+    poller = BaseContinuationPoller(logging.getLogger(__name__))
+    cont = Continue.model_validate({"access_token": {"value": "t"}, "uri": "https://auth.example/continue/1", "wait": 3})
+    pending = PendingContinuation(cont, None, Future())
+
+    def error(status, body, headers=None):
+        request = httpx.Request("POST", "https://auth.example/continue/1")
+        response = httpx.Response(status, json=body, headers=headers, request=request)
+        return httpx.HTTPStatusError("error", request=request, response=response)
+
+    assert poller._handle_error(pending, error(400, {"error": "too_fast"})) == 8.0
+    assert poller._handle_error(pending, error(503, {}, {"Retry-After": "7"})) == 7.0
+    assert 1.0 <= poller._handle_error(pending, httpx.ConnectError("down")) <= 4.0
+    assert poller._handle_error(pending, error(400, {"error": {"code": "invalid_request"}})) is None
+    assert isinstance(pending.future.exception(), httpx.HTTPStatusError)
+
+
+def test_async_poller_resolves_grants(stub_server, stub_key_pair):
+    """
+    Many pending grants are polled concurrently from one event loop; a closed poller refuses new grants
+    """
+    stub_server.continue_wait = 0
+
+    async def run():
+        async with AsyncOpenPaymentsClient(
+            keyid=stub_key_pair.jwks.keys[0].kid,
+            private_key=stub_key_pair.private_key_pem,
+            client_wallet_address=stub_server.wallet_address_url("client")
+        ) as client:
+            grants = [(await _interactive_grant(client, stub_server)).root for _ in range(5)]
+            futures = [client.continuation_poller.poll(grant.cont, delay=0.05) for grant in grants]
+            for grant in grants:
+                stub_server.approve_grant(str(grant.cont.uri))
+            responses = await asyncio.wait_for(asyncio.gather(*futures), 5)
+            await client.continuation_poller.aclose()
+            with pytest.raises(RuntimeError):
+                client.continuation_poller.poll(grants[0].cont)
+            return responses
+
+    responses = asyncio.run(run())
+    assert len({response.access_token.value for response in responses}) == 5
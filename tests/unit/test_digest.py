@@ -0,0 +1,129 @@
+"""
+Unit Tests for incremental Content-Digest computation
+"""
+import asyncio
+import io
+
+import httpx
+import pytest
+
+from open_payments_sdk.client.async_client import AsyncOpenPaymentsClient
+from open_payments_sdk.client.client import OpenPaymentsClient
+from open_payments_sdk.configuration import Configuration
+from open_payments_sdk.gnap_utils.digest import ContentDigest, digest_bytes, digest_file, encode_json
+from open_payments_sdk.gnap_utils.verification import verify_content_digest
+from open_payments_sdk.models.auth import GrantRequest
+from open_payments_sdk.models.resource import OutgoingPaymentRequest
+from open_payments_sdk.retry import RetryPolicy
+
+
+def test_incremental_digest_matches_buffered():
+    """
+    Chunked, file and buffered digests agree for sha-256 and sha-512
+    """
+    body = b"x" * 200_000
+    digest = ContentDigest(("sha-256", "sha-512"))
+    for i in range(0, len(body), 1000):
+        digest.update(body[i:i + 1000])
+    fileobj = io.BytesIO(body)
+    file_header, length = digest_file(fileobj, ("sha-256", "sha-512"))
+
+    assert digest.length == length == len(body)
+    assert file_header == digest.header() == digest_bytes(body, ("sha-256", "sha-512"))
+    assert fileobj.tell() == 0
+    verify_content_digest(httpx.Request("POST", "https://rs.example", content=body, headers={"Content-Digest": file_header}))
+    with pytest.raises(ValueError):
+        ContentDigest(("md5",))
+
+
+def test_streamed_bodies_against_stub(stub_server, stub_key_pair):
+    """
+    JSON and streamed file bodies carry Content-Length and a digest the stub server accepts
+    """
+    cfg = Configuration()
+    cfg.content_digest_algorithms = ("sha-256",)
+    with OpenPaymentsClient(
+        keyid=stub_key_pair.jwks.keys[0].kid,
+        private_key=stub_key_pair.private_key_pem,
+        client_wallet_address=stub_server.wallet_address_url("client"),
+        cfg=cfg
+    ) as client:
+        grant = client.grants.post_grant_request(
+            GrantRequest.model_validate({
+                "access_token": {"access": [{"type": "quote", "actions": ["create"]}]},
+                "client": client.client_wallet_address
+            }),
+            stub_server.auth_server
+        )
+        body = b'{"access_token":{"access":[{"type":"quote","actions":["read"]}]},"client":"%s"}' % client.client_wallet_address.encode()
+        template = client.grants._template("grant", stub_server.auth_server, "POST", "", ("content-type", "content-digest", "content-length", "@method", "@target-uri"))
+        request = template.build(client.grants, content=io.BytesIO(body))
+        response = client.http_client.send(request)
+
+    assert grant.root.access_token.value
+    assert response.status_code == 200
+    assert request.headers["Content-Length"] == str(len(body))
+    assert request.headers["Content-Digest"].startswith("sha-256=:") and "transfer-encoding" not in request.headers
+
+
+def test_model_bodies_are_encoded_once(stub_client):
+    """
+    Model bodies match httpx's encoding of their dict and the digest covers the sent bytes
+    """
+    payment = OutgoingPaymentRequest.model_validate({
+        "walletAddress": "https://wallet.example/a", "quoteId": "https://rs.example/quotes/1", "metadata": {"memo": "café"}
+    })
+    expected = httpx.Request("POST", "https://rs.example", json=payment.model_dump(exclude_unset=True, mode="json")).content
+    encoded = []
+    stub_client.signing_context.json_encoder = lambda data: encoded.append(data) or encode_json(data)
+
+    request = stub_client.outgoing_payments._build_create_payment(payment, "https://rs.example", "token")
+    assert encode_json(payment) == expected == request.content
+    assert encoded == [payment.model_dump(exclude_unset=True, mode="json")]
+    assert request.headers["Content-Type"] == "application/json"
+    assert request.headers["Content-Length"] == str(len(expected))
+    verify_content_digest(request)
+
+
+def test_file_bodies_from_async_client(stub_server, stub_key_pair):
+    """
+    The async client streams file bodies without blocking on a sync stream
+    """
+    body = b'{"access_token":{"access":[{"type":"quote","actions":["read"]}]},"client":"%s"}' % stub_server.wallet_address_url("client").encode()
+
+    async def main():
+        async with AsyncOpenPaymentsClient(
+            keyid=stub_key_pair.jwks.keys[0].kid,
+            private_key=stub_key_pair.private_key_pem,
+            client_wallet_address=stub_server.wallet_address_url("client")
+        ) as client:
+            template = client.grants._template("grant", stub_server.auth_server, "POST", "", ("content-type", "content-digest", "content-length", "@method", "@target-uri"))
+            return await client.http_client.send(template.build(client.grants, content=io.BytesIO(body)))
+
+    response = asyncio.run(main())
+    assert response.status_code == 200
+    assert response.json()["access_token"]["value"]
+
+
+def test_file_bodies_are_rewound_for_retries(stub_server, stub_key_pair):
+    """
+    A retried file upload sends the whole body again, not the rest after EOF
+    """
+    cfg = Configuration()
+    cfg.retry_policy = RetryPolicy(max_retries=1, backoff_factor=0)
+    with OpenPaymentsClient(
+        keyid=stub_key_pair.jwks.keys[0].kid,
+        private_key=stub_key_pair.private_key_pem,
+        client_wallet_address=stub_server.wallet_address_url("client"),
+        cfg=cfg
+    ) as client:
+        body = b'{"access_token":{"access":[{"type":"quote","actions":["read"]}]},"client":"%s"}' % client.client_wallet_address.encode()
+        template = client.grants._template("grant", stub_server.auth_server, "POST", "", ("content-type", "content-digest", "content-length", "@method", "@target-uri"))
+        request = template.build(client.grants, content=io.BytesIO(body), headers={"Idempotency-Key": "upload-1"})
+        sent = stub_server.requests
+        stub_server.fail_next(1)
+        response = client.http_client.send(request)
+
+    assert stub_server.requests - sent == 2
+    assert response.status_code == 200
+    assert response.json()["access_token"]["value"]
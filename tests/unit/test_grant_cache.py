@@ -0,0 +1,145 @@
+"""
+Unit Tests for the grant cache
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from open_payments_sdk.client.async_client import AsyncOpenPaymentsClient
+from open_payments_sdk.client.client import OpenPaymentsClient
+from open_payments_sdk.configuration import Configuration
+from open_payments_sdk.models.auth import Grant, GrantRequest
+from open_payments_sdk.utils.grant_cache import GrantCache, grant_cache_key
+
+
+def _grant_request(access, interact=False) -> GrantRequest:
+    request = {"access_token": {"access": access}, "client": "https://wallet.example/client"}
+    if interact:
+        request["interact"] = {"start": ["redirect"]}
+    return GrantRequest.model_validate(request)
+
+
+def _grant(value: str, expires_in=None) -> Grant:
+    return Grant.model_validate({
+        "access_token": {
+            "value": value,
+            "manage": f"https://auth.example/token/{value}",
+            "expires_in": expires_in,
+            "access": [{"type": "quote", "actions": ["create"]}]
+        },
+        "continue": {"access_token": {"value": f"continue-{value}"}, "uri": "https://auth.example/continue/1"}
+    })
+
+
+def _cached_client(stub_server, stub_key_pair, client_class=OpenPaymentsClient):
+    cfg = Configuration()
+    cfg.grant_cache_size = 16
+    return client_class(
+        keyid=stub_key_pair.jwks.keys[0].kid,
+        private_key=stub_key_pair.private_key_pem,
+        client_wallet_address=stub_server.wallet_address_url("client"),
+        cfg=cfg
+    )
+
+
+def test_cache_key_is_canonical():
+    """
+    Item and action order do not matter; interactive requests are not cached
+    """
+    quote = {"type": "quote", "actions": ["create", "read"]}
+    incoming = {"type": "incoming-payment", "actions": ["read", "create"]}
+    key = grant_cache_key(_grant_request([quote, incoming]), "https://auth.example/")
+
+    assert key == grant_cache_key(_grant_request([dict(incoming, actions=["create", "read"]), quote]), "https://auth.example")
+    assert key != grant_cache_key(_grant_request([quote]), "https://auth.example")
+    assert key != grant_cache_key(_grant_request([quote, incoming]), "https://other.example")
+    assert grant_cache_key(_grant_request([quote], interact=True), "https://auth.example") is None
+
+
+def test_cache_expires_and_invalidates():
+    """
+    Entries expire ahead of their access token and are evicted on revocation
+    """
+    now = [0.0]
+    cache = GrantCache(expiry_margin=10, clock=lambda: now[0])
+    issued = iter(["a", "b", "c"])
+
+    def request():
+        return _grant(next(issued), expires_in=100)
+
+    assert cache.get_or_request("k", request).root.access_token.value == "a"
+    now[0] = 89.0
+    assert cache.get_or_request("k", request).root.access_token.value == "a"
+    now[0] = 90.0
+    assert cache.get_or_request("k", request).root.access_token.value == "b"
+    cache.invalidate_token("continue-b")
+    assert cache.get_or_request("k", request).root.access_token.value == "c"
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.size) == (1, 3, 2, 1)
+
+
+def test_identical_grants_are_requested_once(stub_server, stub_key_pair):
+    """
+    Concurrent and repeated identical requests share one grant until its token is revoked
+    """
+    with _cached_client(stub_server, stub_key_pair) as client:
+        grant_request = _grant_request([{"type": "quote", "actions": ["create"]}])
+        grant_request.client.root = client.client_wallet_address
+        barrier = threading.Barrier(8)
+
+        def request(_):
+            barrier.wait()
+            return client.grants.post_grant_request(grant_request, stub_server.auth_server)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            grants = list(executor.map(request, range(8)))
+        token = grants[0].root.access_token
+        assert {grant.root.access_token.value for grant in grants} == {token.value}
+        assert client.grants.post_grant_request(grant_request, stub_server.auth_server) is grants[0]
+
+        client.access_tokens.delete_access_token(str(token.manage).rsplit("/", 1)[1], stub_server.auth_server, token.value)
+        renewed = client.grants.post_grant_request(grant_request, stub_server.auth_server)
+        stats = client.grant_cache.stats()
+
+    assert renewed.root.access_token.value != token.value
+    assert stats.misses == 2 and stats.hits + stats.coalesced == 8
+
+
+def test_async_grants_are_single_flighted(stub_server, stub_key_pair):
+    """
+    Concurrent coroutines requesting the same grant share one request
+    """
+    async def run():
+        async with _cached_client(stub_server, stub_key_pair, AsyncOpenPaymentsClient) as client:
+            grant_request = _grant_request([{"type": "quote", "actions": ["create"]}])
+            grant_request.client.root = client.client_wallet_address
+            grants = await asyncio.gather(*(
+                client.grants.post_grant_request(grant_request, stub_server.auth_server) for _ in range(5)
+            ))
+            return grants, client.grant_cache.stats()
+
+    grants, stats = asyncio.run(run())
+    assert len({grant.root.access_token.value for grant in grants}) == 1
+    assert (stats.misses, stats.coalesced) == (1, 4)
+
+
+def test_cancelled_owner_does_not_cancel_waiters():
+    """
+    When the coroutine requesting a grant is cancelled, a waiting coroutine requests it itself
+    """
+    cache = GrantCache()
+
+    async def request():
+        await asyncio.sleep(0.05)
+        return _grant("a")
+
+    async def main():
+        owner = asyncio.ensure_future(cache.aget_or_request("k", request))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(cache.aget_or_request("k", request))
+        await asyncio.sleep(0)
+        owner.cancel()
+        return await waiter
+
+    assert asyncio.run(main()).root.access_token.value == "a"
+    assert cache.stats().misses == 2
@@ -0,0 +1,92 @@
+"""
+Unit Tests for the pooled HTTP client
+"""
+import httpx
+
+from open_payments_sdk.client.client import OpenPaymentsClient
+from open_payments_sdk.configuration import Configuration
+from open_payments_sdk.http import HttpClient
+from open_payments_sdk.models.auth import GrantRequest
+from open_payments_sdk.testing.stub_server import StubOpenPaymentsServer
+
+
+def test_http_client_reuses_connections(local_server):
+    """
+    Consecutive requests to one host share a single pooled connection
+    """
+    with HttpClient(http_timeout=5.0) as http_client:
+        for _ in range(3):
+            request = http_client.build_request(method="GET", url=f"{local_server}/ping")
+            assert http_client.send(request=request).json()["path"] == "/ping"
+        stats = http_client.pool_stats()
+        assert stats.requests_sent == 3
+        assert stats.requests_in_flight == 0
+        assert stats.pools["default"].connections == 1
+    assert http_client.pool_stats().pools == {}
+
+
+def test_http_client_per_host_limits(local_server):
+    """
+    Hosts with their own limits get a dedicated pool
+    """
+    http_client = HttpClient(http_timeout=5.0, per_host_limits={"127.0.0.1": {"max_connections": 2}})
+    request = http_client.build_request(method="GET", url=local_server)
+    http_client.send(request=request)
+    stats = http_client.pool_stats()
+    assert stats.pools["127.0.0.1"].connections == 1
+    assert stats.pools["default"].connections == 0
+    http_client.close()
+
+
+def test_op_client_lifecycle(keyid_private_key):
+    """
+    The client builds its http client from configuration and closes it on exit
+    """
+    cfg = Configuration()
+    cfg.http_timeout = 3.0
+    with OpenPaymentsClient(
+        keyid=keyid_private_key["keyid"],
+        private_key=keyid_private_key["private_key"],
+        client_wallet_address="https://ilp.interledger-test.dev/elijahokellosalary",
+        cfg=cfg
+    ) as client:
+        assert client.http_client.http_timeout == 3.0
+        assert client.pool_stats().requests_sent == 0
+
+
+def test_op_client_with_mock_transport(stub_key_pair):
+    """
+    A configured transport carries all traffic, here straight into the stub server
+    """
+    with StubOpenPaymentsServer() as stub:
+        wallet_address = stub.add_wallet_address("client", jwks=stub_key_pair.jwks)
+        cfg = Configuration()
+        cfg.transport = stub.transport()
+        with OpenPaymentsClient(
+            keyid=stub_key_pair.jwks.keys[0].kid,
+            private_key=stub_key_pair.private_key_pem,
+            client_wallet_address=wallet_address,
+            cfg=cfg
+        ) as client:
+            grant = client.grants.post_grant_request(
+                GrantRequest.model_validate({
+                    "access_token": {"access": [{"type": "quote", "actions": ["create"]}]},
+                    "client": wallet_address
+                }),
+                stub.auth_server
+            )
+            assert grant.root.access_token.value
+            assert stub.requests == 1
+
+
+def test_http_client_per_host_transports(local_server):
+    """
+    Hosts mapped to a transport bypass the default pool
+    """
+    mock = httpx.MockTransport(lambda request: httpx.Response(200, json={"host": request.url.host}))
+    with HttpClient(http_timeout=5.0, per_host_transports={"rs.example": mock}, per_host_limits={"127.0.0.1": {"http2": False}}) as http_client:
+        assert http_client.send(http_client.build_request(method="GET", url="https://rs.example/quotes/1")).json() == {"host": "rs.example"}
+        assert http_client.send(http_client.build_request(method="GET", url=f"{local_server}/ping")).json()["path"] == "/ping"
+        stats = http_client.pool_stats()
+    assert stats.pools["127.0.0.1"].connections == 1
+    assert stats.pools["rs.example"].connections == 0
@@ -0,0 +1,30 @@
+"""
+Unit Tests for the HTTP signature helpers
+"""
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey, Ed25519PublicKey
+
+from open_payments_sdk.gnap_utils.http_signatures import OPKeyResolver
+from open_payments_sdk.gnap_utils.security import SigningContext
+
+
+def test_key_resolver_parses_pem_once(keyid_private_key):
+    """
+    The resolver hands out the same parsed key objects on every call
+    """
+    keyid = keyid_private_key["keyid"]
+    resolver = OPKeyResolver(keyid=keyid, private_key=keyid_private_key["private_key"])
+    private_key = resolver.resolve_private_key(keyid)
+    public_key = resolver.resolve_public_key(keyid)
+    assert isinstance(private_key, Ed25519PrivateKey)
+    assert isinstance(public_key, Ed25519PublicKey)
+    assert resolver.resolve_private_key(keyid) is private_key
+    assert resolver.resolve_public_key(keyid) is public_key
+    public_key.verify(private_key.sign(b"payload"), b"payload")
+
+
+def test_signing_context_resolver_reuses_parsed_key(keyid_private_key):
+    """
+    The signing context's resolver holds the key object the context parsed, not a second parse
+    """
+    context = SigningContext(keyid_private_key["keyid"], keyid_private_key["private_key"])
+    assert context.key_resolver.resolve_private_key(keyid_private_key["keyid"]) is context.private_key_object
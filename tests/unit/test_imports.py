@@ -0,0 +1,53 @@
+"""
+Unit Tests for import time: modules and models deferred until first use
+"""
+import subprocess
+import sys
+
+import pytest
+
+DEFERRED_MODULES = (
+    "http_message_signatures",
+    "multiprocessing",
+    "open_payments_sdk.api.batch",
+    "open_payments_sdk.api.continuation",
+    "open_payments_sdk.api.pipeline",
+    "open_payments_sdk.api.tokens",
+    "open_payments_sdk.gnap_utils.signing_pool",
+    "open_payments_sdk.gnap_utils.verification",
+)
+
+
+def _imported_modules(module: str) -> set:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True
+    )
+    return {line.rsplit("|", 1)[1].strip() for line in result.stderr.splitlines()[1:] if line.startswith("import time:")}
+
+
+@pytest.mark.parametrize("module", ["open_payments_sdk.client.client", "open_payments_sdk.models.auth"])
+def test_heavy_modules_are_not_imported(module):
+    """
+    Importing a client leaves optional components and their dependencies unloaded
+    """
+    imported = _imported_modules(module)
+    assert module in imported
+    assert not imported.intersection(DEFERRED_MODULES)
+
+
+def test_models_are_built_on_first_use(keyid_private_key):
+    """
+    Constructing a client builds no schema model; validating one builds it
+    """
+    script = f"""
+from open_payments_sdk.client.client import OpenPaymentsClient
+from open_payments_sdk.models import auth, resource
+OpenPaymentsClient(keyid="k", private_key={keyid_private_key["private_key"]!r}, client_wallet_address="https://wallet.example/a")
+built = [name for module in (auth, resource) for name, model in vars(module).items()
+         if getattr(model, "__pydantic_complete__", False) and model.__module__ == module.__name__]
+assert built == [], built
+auth.InteractRef.model_validate({{"interact_ref": "ref"}})
+assert auth.InteractRef.__pydantic_complete__
+"""
+    subprocess.run([sys.executable, "-c", script], check=True)
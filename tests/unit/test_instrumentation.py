@@ -0,0 +1,123 @@
+"""
+Unit Tests for per-call instrumentation
+"""
+import asyncio
+
+import httpx
+import pytest
+
+from open_payments_sdk.client.async_client import AsyncOpenPaymentsClient
+from open_payments_sdk.client.client import OpenPaymentsClient
+from open_payments_sdk.configuration import Configuration
+from open_payments_sdk.models.auth import GrantRequest
+from open_payments_sdk.models.resource import IncomingPaymentRequest
+from open_payments_sdk.utils.instrumentation import CURRENT_CALL, Instrumentation, tracer_hook
+
+
+def _instrumented_client(stub_server, stub_key_pair, calls, client_class=OpenPaymentsClient):
+    cfg = Configuration()
+    cfg.instrumentation = Instrumentation(hooks=[calls.append])
+    return client_class(
+        keyid=stub_key_pair.jwks.keys[0].kid,
+        private_key=stub_key_pair.private_key_pem,
+        client_wallet_address=stub_server.wallet_address_url("client"),
+        cfg=cfg
+    )
+
+
+def _grant_request(client) -> GrantRequest:
+    return GrantRequest.model_validate({
+        "access_token": {"access": [{"type": "incoming-payment", "actions": ["create", "read"]}]},
+        "client": client.client_wallet_address
+    })
+
+
+def _incoming_payment(stub_server) -> IncomingPaymentRequest:
+    return IncomingPaymentRequest(
+        walletAddress=stub_server.wallet_address_url("bob"), incomingAmount=None, expiresAt=None, metadata=None
+    )
+
+
+def test_calls_are_timed_by_phase(stub_server, stub_key_pair):
+    """
+    Every API call reports its endpoint, outcome and build/digest/sign/send/parse phases
+    """
+    calls = []
+    with _instrumented_client(stub_server, stub_key_pair, calls) as client:
+        client.wallet.get_wallet_address(stub_server.wallet_address_url("bob"))
+        grant = client.grants.post_grant_request(_grant_request(client), stub_server.auth_server)
+        client.incoming_payments.post_create_payment(
+            _incoming_payment(stub_server), stub_server.resource_server, grant.root.access_token.value
+        )
+        with pytest.raises(httpx.HTTPStatusError):
+            client.incoming_payments.get_incoming_payment("missing", stub_server.resource_server, grant.root.access_token.value)
+
+    assert [call.endpoint for call in calls] == [
+        "wallet.get_wallet_address", "grants.request", "incoming_payments.create", "incoming_payments.get"
+    ]
+    wallet, _, created, missing = calls
+    assert set(wallet.phases) == {"build", "send", "parse"}
+    assert (created.method, created.host, created.status, created.attempts) == ("POST", "127.0.0.1", 201, 1)
+    assert set(created.phases) == {"build", "digest", "sign", "send", "parse"}
+    assert sum(created.phases.values()) == pytest.approx(created.duration, rel=0.05)
+    assert missing.status == 404 and isinstance(missing.error, httpx.HTTPStatusError)
+    assert CURRENT_CALL.get() is None
+
+
+def test_async_calls_are_timed(stub_server, stub_key_pair):
+    """
+    Concurrent coroutines record separate calls
+    """
+    calls = []
+
+    async def run():
+        async with _instrumented_client(stub_server, stub_key_pair, calls, AsyncOpenPaymentsClient) as client:
+            grant = await client.grants.post_grant_request(_grant_request(client), stub_server.auth_server)
+            await asyncio.gather(*(
+                client.incoming_payments.post_create_payment(
+                    _incoming_payment(stub_server), stub_server.resource_server, grant.root.access_token.value
+                ) for _ in range(3)
+            ))
+
+    asyncio.run(run())
+    created = [call for call in calls if call.endpoint == "incoming_payments.create"]
+    assert len(created) == 3 and len(set(map(id, created))) == 3
+    assert all(call.status == 201 and "sign" in call.phases for call in created)
+
+
+def test_tracer_hook_and_failing_hooks(stub_server, stub_key_pair):
+    """
+    Spans carry phase attributes; a failing hook does not fail the call
+    """
+    class Span:
+        def __init__(self, name, start_time, attributes):
+            self.name, self.start_time, self.attributes = name, start_time, attributes
+            self.end_time = None
+
+        def record_exception(self, exc):
+            self.attributes["exception"] = exc
+
+        def end(self, end_time):
+            self.end_time = end_time
+
+    spans = []
+
+    class Tracer:
+        def start_span(self, name, start_time, attributes):
+            spans.append(Span(name, start_time, attributes))
+            return spans[-1]
+
+    def failing_hook(call):
+        raise RuntimeError("hook failed")
+
+    calls = []
+    with _instrumented_client(stub_server, stub_key_pair, calls) as client:
+        client.wallet.instrumentation.add_hook(failing_hook)
+        client.wallet.instrumentation.add_hook(tracer_hook(Tracer()))
+        client.wallet.get_keys(stub_server.wallet_address_url("alice"))
+
+    span, = spans
+    assert span.name == "open_payments.wallet.get_keys"
+    assert span.attributes["http.response.status_code"] == 200
+    assert "open_payments.phase.send_ms" in span.attributes
+    assert span.end_time >= span.start_time
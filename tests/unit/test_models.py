@@ -0,0 +1,55 @@
+"""
+Unit Tests for the discriminated union models
+"""
+import pytest
+from pydantic import ValidationError
+
+from open_payments_sdk.models.auth import AccessItem, Grant, GrantResponse, InteractionInstructionsResponse, LimitsOutgoing2
+from open_payments_sdk.models.resource import (OutgoingPaymentRequest, OutgoingPaymentRequestWithIncoming,
+                                               OutgoingPaymentRequestWithQuote, QuoteFixedReceive,
+                                               QuoteFixedSent, QuoteRequest, QuoteRequestBase)
+
+AMOUNT = {"value": "100", "assetCode": "USD", "assetScale": 2}
+CONTINUE = {"access_token": {"value": "c"}, "uri": "https://auth.example/continue/1"}
+QUOTE_REQUEST = {"walletAddress": "https://wallet.example/a", "receiver": "https://rs.example/incoming-payments/1", "method": "ilp"}
+
+
+def test_unions_select_member_by_fields():
+    """
+    Each union validates into the member its distinguishing fields select
+    """
+    interactive = Grant.model_validate({"interact": {"redirect": "https://auth.example/i", "finish": "n"}, "continue": CONTINUE})
+    granted = Grant.model_validate({
+        "access_token": {"value": "t", "manage": "https://auth.example/token/1", "access": [
+            {"type": "outgoing-payment", "actions": ["create"], "identifier": "https://wallet.example/a", "limits": {"debitAmount": AMOUNT}}
+        ]},
+        "continue": CONTINUE
+    })
+    assert isinstance(interactive.root, InteractionInstructionsResponse)
+    assert isinstance(granted.root, GrantResponse)
+    assert isinstance(granted.root.access_token.access.root[0].root.limits.root, LimitsOutgoing2)
+
+    assert type(QuoteRequest.model_validate(QUOTE_REQUEST).root) is QuoteRequestBase
+    assert type(QuoteRequest.model_validate(dict(QUOTE_REQUEST, debitAmount=AMOUNT)).root) is QuoteFixedSent
+    assert type(QuoteRequest.model_validate(dict(QUOTE_REQUEST, receiveAmount=AMOUNT)).root) is QuoteFixedReceive
+
+    by_quote = OutgoingPaymentRequest.model_validate({"walletAddress": "https://wallet.example/a", "quoteId": "https://rs.example/quotes/1", "metadata": None})
+    by_incoming = OutgoingPaymentRequest(root=OutgoingPaymentRequestWithIncoming(
+        walletAddress="https://wallet.example/a", incomingPayment="https://rs.example/incoming-payments/1", debitAmount=AMOUNT, metadata=None
+    ))
+    assert isinstance(by_quote.root, OutgoingPaymentRequestWithQuote)
+    assert by_incoming.model_dump(mode="json")["incomingPayment"] == "https://rs.example/incoming-payments/1"
+    assert OutgoingPaymentRequest.model_validate_json(by_incoming.model_dump_json()) == by_incoming
+
+
+def test_union_errors_come_from_one_member():
+    """
+    Invalid input is reported against the selected member only
+    """
+    with pytest.raises(ValidationError) as error:
+        QuoteRequest.model_validate(dict(QUOTE_REQUEST, receiveAmount={"value": "1"}))
+    assert {err["loc"][:2] for err in error.value.errors()} == {("receive", "receiveAmount")}
+
+    with pytest.raises(ValidationError) as error:
+        AccessItem.model_validate({"type": "payments", "actions": ["read"]})
+    assert error.value.errors()[0]["type"] == "union_tag_invalid"
@@ -25,3 +25,17 @@ def test_create_op_client(keyid_private_key):
     assert isinstance(client.outgoing_payments, OutgoingPayments)
     assert isinstance(client.quotes, Quotes)
 
+
+
+def test_op_client_shares_signing_context(keyid_private_key):
+    """
+    All signing API classes of a client use one signing context
+    """
+    client = OpenPaymentsClient(
+        keyid=keyid_private_key["keyid"],
+        private_key=keyid_private_key["private_key"],
+        client_wallet_address="https://ilp.interledger-test.dev/elijahokellosalary"
+    )
+    apis = [client.grants, client.access_tokens, client.incoming_payments, client.outgoing_payments, client.quotes]
+    assert all(api.signing_context is client.signing_context for api in apis)
+    assert all(api.http_signatures is client.signing_context.http_signatures for api in apis)
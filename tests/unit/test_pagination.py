@@ -0,0 +1,79 @@
+"""
+Unit Tests for paginated list iteration
+"""
+import asyncio
+
+from open_payments_sdk.models.resource import PageInfo, PaymentListQuery
+from open_payments_sdk.utils.pagination import aiter_items, iter_items
+
+
+class Page:
+    """
+    Stand-in for PaginatedIncomingPayments / PaginatedOutgoingPayments
+    """
+    def __init__(self, items, start, end, has_next, has_previous):
+        self.result = items
+        self.pagination = PageInfo(
+            startCursor=start, endCursor=end, hasNextPage=has_next, hasPreviousPage=has_previous
+        )
+
+
+PAGES = {
+    None: Page([1, 2], "c1", "c2", True, False),
+    "c2": Page([3, 4], "c3", "c4", True, True),
+    "c4": Page([5], "c5", "c5", False, True),
+}
+
+
+def fetch_page(query: PaymentListQuery) -> Page:
+    fetch_page.cursors.append(query.cursor)
+    return PAGES[query.cursor]
+
+
+def make_query() -> PaymentListQuery:
+    return PaymentListQuery(walletAddress="https://ilp.interledger-test.dev/alice", first=2)
+
+
+def test_iter_items_walks_all_pages():
+    """
+    Items of every page are yielded in order, following endCursor
+    """
+    for prefetch in (False, True):
+        fetch_page.cursors = []
+        assert list(iter_items(fetch_page, make_query(), prefetch=prefetch)) == [1, 2, 3, 4, 5]
+        assert fetch_page.cursors == [None, "c2", "c4"]
+
+
+def test_iter_items_is_lazy():
+    """
+    Without prefetch no page is requested before it is needed
+    """
+    fetch_page.cursors = []
+    items = iter_items(fetch_page, make_query(), prefetch=False)
+    assert next(items) == 1
+    assert fetch_page.cursors == [None]
+    items.close()
+
+
+def test_aiter_items_walks_all_pages():
+    """
+    The async iterator prefetches with tasks and yields every item
+    """
+    async def fetch(query):
+        return fetch_page(query)
+
+    async def collect():
+        return [item async for item in aiter_items(fetch, make_query())]
+
+    fetch_page.cursors = []
+    assert asyncio.run(collect()) == [1, 2, 3, 4, 5]
+
+
+def test_list_query_omits_unset_cursor():
+    """
+    Only the parameters given are sent as query string
+    """
+    assert make_query().model_dump(exclude_unset=True, exclude_none=True, mode="json") == {
+        "walletAddress": "https://ilp.interledger-test.dev/alice",
+        "first": 2
+    }
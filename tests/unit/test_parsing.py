@@ -0,0 +1,119 @@
+"""
+Unit Tests for response parsing modes
+"""
+import httpx
+import pytest
+from pydantic import ValidationError
+
+from open_payments_sdk.configuration import Configuration
+from open_payments_sdk.client.client import OpenPaymentsClient
+from open_payments_sdk.models.auth import Grant, GrantRequest
+from open_payments_sdk.models.resource import (IncomingPayment,
+                                               IncomingPaymentRequest,
+                                               PaginatedIncomingPayments,
+                                               PaymentListQuery, Quote,
+                                               Receiver)
+from open_payments_sdk.utils.parsing import LazyItems, ResponseParser, trusted_model
+
+
+def _page(count: int) -> dict:
+    return {
+        "pagination": {"startCursor": "0", "endCursor": str(count - 1), "hasNextPage": False, "hasPreviousPage": False},
+        "result": [{
+            "id": f"https://rs.example/incoming-payments/{i}",
+            "walletAddress": "https://rs.example/alice",
+            "completed": False,
+            "receivedAmount": {"value": "0", "assetCode": "USD", "assetScale": 2},
+            "createdAt": "2022-03-12T23:20:50.52Z",
+            "updatedAt": "2022-03-12T23:20:50.52Z"
+        } for i in range(count)]
+    }
+
+
+def test_fast_parsing_matches_default():
+    """
+    Validating from bytes gives the same models as validating response.json()
+    """
+    response = httpx.Response(200, json=_page(3))
+    default = ResponseParser().parse_page(PaginatedIncomingPayments, response)
+    fast = ResponseParser(fast=True).parse_page(PaginatedIncomingPayments, response)
+    assert fast == default
+
+
+def test_lazy_pages_validate_items_on_access():
+    """
+    Invalid items only fail when they are read, also without fast parsing; valid pages serialize like eager ones
+    """
+    body = _page(3)
+    parser = ResponseParser(fast=True, lazy_pages=True)
+    response = httpx.Response(200, json=body)
+    assert parser.parse_page(PaginatedIncomingPayments, response).model_dump() == ResponseParser().parse_page(PaginatedIncomingPayments, response).model_dump()
+    body["result"][2]["completed"] = "not a bool"
+    page = parser.parse_page(PaginatedIncomingPayments, httpx.Response(200, json=body))
+
+    assert isinstance(page, PaginatedIncomingPayments)
+    assert isinstance(page.result, LazyItems)
+    assert isinstance(ResponseParser(lazy_pages=True).parse_page(PaginatedIncomingPayments, response).result, LazyItems)
+    assert len(page.result) == 3
+    assert isinstance(page.result[0], IncomingPayment)
+    assert page.result[0] is page.result[0]
+    with pytest.raises(ValidationError):
+        page.result[2]
+
+
+def test_trusted_urls_are_plain_strings():
+    """
+    Trusted models subclass the originals and keep URLs as str, also inside root models
+    """
+    parser = ResponseParser(fast=True, trust_urls=True)
+    page = parser.parse_page(PaginatedIncomingPayments, httpx.Response(200, json=_page(2)))
+    quote = parser.parse(Quote, httpx.Response(200, json={
+        "id": "https://rs.example/quotes/1",
+        "walletAddress": "https://rs.example/alice",
+        "receiver": "https://rs.example/incoming-payments/1",
+        "receiveAmount": {"value": "100", "assetCode": "USD", "assetScale": 2},
+        "debitAmount": {"value": "100", "assetCode": "USD", "assetScale": 2},
+        "method": "ilp",
+        "createdAt": "2022-03-12T23:20:50.52Z"
+    }))
+    grant = parser.parse(Grant, httpx.Response(200, json={
+        "interact": {"redirect": "https://auth.example/interact/1", "finish": "nonce"},
+        "continue": {"access_token": {"value": "token"}, "uri": "https://auth.example/continue/1"}
+    }))
+
+    assert isinstance(page, PaginatedIncomingPayments)
+    assert isinstance(page.result[1], IncomingPayment)
+    assert page.result[1].id == "https://rs.example/incoming-payments/1"
+    assert grant.root.cont.uri == "https://auth.example/continue/1"
+    assert isinstance(quote.receiver, Receiver)
+    assert quote.receiver.root == "https://rs.example/incoming-payments/1"
+    assert trusted_model(IncomingPayment) is trusted_model(IncomingPayment)
+
+
+def test_client_fast_parsing_against_stub(stub_server, stub_key_pair):
+    """
+    A client configured for fast, lazy and trusted parsing walks every page
+    """
+    cfg = Configuration()
+    cfg.fast_parsing = cfg.lazy_pages = cfg.trust_server_urls = True
+    with OpenPaymentsClient(
+        keyid=stub_key_pair.jwks.keys[0].kid,
+        private_key=stub_key_pair.private_key_pem,
+        client_wallet_address=stub_server.wallet_address_url("client"),
+        cfg=cfg
+    ) as client:
+        grant = client.grants.post_grant_request(GrantRequest.model_validate({
+            "access_token": {"access": [{"type": "incoming-payment", "actions": ["create", "list"]}]},
+            "client": client.client_wallet_address
+        }), stub_server.auth_server)
+        token = grant.root.access_token.value
+        bob = stub_server.wallet_address_url("bob")
+        for _ in range(3):
+            client.incoming_payments.post_create_payment(
+                IncomingPaymentRequest(walletAddress=bob, incomingAmount=None, expiresAt=None, metadata=None),
+                stub_server.resource_server,
+                token
+            )
+        payments = list(client.incoming_payments.iter_incoming_payments(PaymentListQuery(walletAddress=bob, first=2), stub_server.resource_server, token))
+
+    assert [payment.walletAddress for payment in payments] == [bob] * 3
@@ -0,0 +1,135 @@
+"""
+Unit Tests for the payment pipeline
+"""
+import asyncio
+import threading
+
+import httpx
+import pytest
+
+from open_payments_sdk.api.pipeline import STAGES, InteractionHashError, PaymentPipeline
+from open_payments_sdk.client.async_client import AsyncOpenPaymentsClient
+from open_payments_sdk.client.client import OpenPaymentsClient
+from open_payments_sdk.configuration import Configuration
+from open_payments_sdk.models.pipeline import PaymentIntent
+
+
+def _config() -> Configuration:
+    cfg = Configuration()
+    cfg.grant_cache_size = 16
+    cfg.pipeline_stage_concurrency = {"quote": 2}
+    cfg.pipeline_max_in_flight = 4
+    return cfg
+
+
+def _intents(stub_server, count, bad=()):
+    return (
+        PaymentIntent(
+            sender=stub_server.wallet_address_url("alice"),
+            receiver=stub_server.wallet_address_url("nobody" if index in bad else "bob"),
+            amount={"value": str(100 + index), "assetCode": "EUR", "assetScale": 2},
+            metadata={"invoice": index}
+        )
+        for index in range(count)
+    )
+
+
+def test_pipeline_sends_intents_against_stub(stub_server, stub_key_pair):
+    """
+    Intents become outgoing payments in input order; grants are shared and failures report their stage
+    """
+    cfg = _config()
+    cfg.pipeline_finish_uri = "https://client.example/finish"
+
+    def interact(intent, grant):
+        # the user consents and is redirected to the finish URI
+        redirect = httpx.get(str(grant.interact.redirect)).headers["Location"]
+        return redirect.replace("hash=", "hash=x") if intent.metadata["invoice"] == 5 else redirect
+
+    with OpenPaymentsClient(
+        keyid=stub_key_pair.jwks.keys[0].kid,
+        private_key=stub_key_pair.private_key_pem,
+        client_wallet_address=stub_server.wallet_address_url("client"),
+        cfg=cfg
+    ) as client:
+        result = client.pipeline.run(_intents(stub_server, 10, bad={3}), interact)
+        grant_stats = client.grant_cache.stats()
+
+    assert [item.index for item in result.items] == list(range(10))
+    assert [item.stage for item in result.errors] == ["wallets", "continuation"]
+    assert isinstance(result.errors[1].error, InteractionHashError)
+    payments = [item for item in result.items if item.ok]
+    assert all(item.result.receiver.root == item.incoming_payment.id for item in payments)
+    assert [item.quote.receiveAmount.value for item in payments[:3]] == ["100", "101", "102"]
+    assert payments[0].result.metadata == {"invoice": 0}
+    # one incoming payment and one quote grant for all intents
+    assert grant_stats.misses == 2
+    stats = result.stats
+    assert (stats.items, stats.succeeded, stats.failed) == (10, 8, 2)
+    assert [stage.name for stage in stats.stages] == list(STAGES)
+    assert stats.stages[0].failed == 1 and stats.stages[-1].completed == 8
+    assert stats.stages[2].concurrency == 2 and stats.stages[2].throughput > 0
+
+
+def test_async_pipeline_against_stub(stub_server, stub_key_pair):
+    """
+    The async pipeline accepts async iterables and coroutine interaction callbacks, and polls without a finish URI
+    """
+    stub_server.continue_wait = 0
+
+    async def intents():
+        for intent in _intents(stub_server, 6):
+            yield intent
+
+    async def interact(intent, grant):
+        stub_server.approve_grant(str(grant.cont.uri))
+
+    async def main():
+        async with AsyncOpenPaymentsClient(
+            keyid=stub_key_pair.jwks.keys[0].kid,
+            private_key=stub_key_pair.private_key_pem,
+            client_wallet_address=stub_server.wallet_address_url("client"),
+            cfg=_config()
+        ) as client:
+            return await client.pipeline.run(intents(), interact)
+
+    result = asyncio.run(main())
+    assert result.stats.succeeded == 6
+    assert [item.result.debitAmount.value for item in result.items] == [item.quote.debitAmount.value for item in result.items]
+
+
+def test_interaction_does_not_hold_grant_slots(stub_server, stub_key_pair):
+    """
+    An intent waiting for consent does not keep others from requesting their grants
+    """
+    cfg = _config()
+    cfg.pipeline_stage_concurrency = {"outgoing_grant": 1}
+    stub_server.continue_wait = 0
+    # both users must be asked for consent at the same time
+    consenting = threading.Barrier(2, timeout=5)
+
+    def interact(intent, grant):
+        consenting.wait()
+        stub_server.approve_grant(str(grant.cont.uri))
+
+    with OpenPaymentsClient(
+        keyid=stub_key_pair.jwks.keys[0].kid,
+        private_key=stub_key_pair.private_key_pem,
+        client_wallet_address=stub_server.wallet_address_url("client"),
+        cfg=cfg
+    ) as client:
+        result = client.pipeline.run(_intents(stub_server, 2), interact)
+
+    assert result.stats.succeeded == 2, [str(item.error) for item in result.errors]
+
+
+def test_pipeline_rejects_unknown_stages():
+    """
+    Concurrency can only be set for known stages, to None or at least 1
+    """
+    with pytest.raises(ValueError):
+        PaymentPipeline(None, None, None, None, None, None, "https://wallet.example/client", stage_concurrency={"quotes": 2})
+    with pytest.raises(ValueError):
+        PaymentPipeline(None, None, None, None, None, None, "https://wallet.example/client", stage_concurrency={"quote": 0})
+    pipeline = PaymentPipeline(None, None, None, None, None, None, "https://wallet.example/client", stage_concurrency={"quote": None})
+    assert pipeline._stages(dict.fromkeys(STAGES), int)[2].semaphore is None
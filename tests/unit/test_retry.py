@@ -0,0 +1,177 @@
+"""
+Unit Tests for retries and the circuit breaker
+"""
+import asyncio
+import time
+from http.server import BaseHTTPRequestHandler
+
+import httpx
+import pytest
+
+from open_payments_sdk.client.client import OpenPaymentsClient
+from open_payments_sdk.configuration import Configuration
+from open_payments_sdk.http import AsyncHttpClient, HttpClient
+from open_payments_sdk.models.auth import GrantRequest
+from open_payments_sdk.models.resource import IncomingPaymentRequest
+from open_payments_sdk.retry import CircuitBreaker, CircuitOpenError, RetryPolicy
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    """
+    Answers 503 until ``failures`` requests have been seen
+    """
+    protocol_version = "HTTP/1.1"
+    failures = 2
+    seen = 0
+
+    def _reply(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        FlakyHandler.seen += 1
+        status = 503 if FlakyHandler.seen <= FlakyHandler.failures else 200
+        self.send_response(status)
+        self.send_header("Retry-After", "0")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    do_GET = do_POST = _reply
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+class SlowHandler(FlakyHandler):
+    """
+    Answers like FlakyHandler after ``delay`` seconds
+    """
+    delay = 0.0
+
+    def _reply(self):
+        time.sleep(SlowHandler.delay)
+        super()._reply()
+
+    do_GET = do_POST = _reply
+
+
+@pytest.fixture
+def flaky_server(http_server_factory):
+    FlakyHandler.seen = 0
+    return http_server_factory(FlakyHandler)
+
+
+def test_get_retried_until_success(flaky_server):
+    """
+    Idempotent requests are retried on 503
+    """
+    with HttpClient(http_timeout=5.0, retry_policy=RetryPolicy(max_retries=3)) as http_client:
+        response = http_client.send(http_client.build_request(method="GET", url=flaky_server))
+    assert response.status_code == 200
+    assert FlakyHandler.seen == 3
+
+
+def test_post_retried_only_with_idempotency_key(flaky_server):
+    """
+    Non-idempotent POSTs are not retried unless they carry an idempotency key
+    """
+    with HttpClient(http_timeout=5.0, retry_policy=RetryPolicy(max_retries=3)) as http_client:
+        with pytest.raises(httpx.HTTPStatusError):
+            http_client.send(http_client.build_request(method="POST", url=flaky_server, json={}))
+        assert FlakyHandler.seen == 1
+        request = http_client.build_request(
+            method="POST", url=flaky_server, json={}, headers={"Idempotency-Key": "abc"}
+        )
+        assert http_client.send(request).status_code == 200
+    assert FlakyHandler.seen == 3
+
+
+def test_client_retries_are_opt_in(stub_server, stub_key_pair):
+    """
+    Clients only retry with cfg.retry_policy; retried creates sign their idempotency key
+    """
+    def client(cfg):
+        return OpenPaymentsClient(
+            keyid=stub_key_pair.jwks.keys[0].kid,
+            private_key=stub_key_pair.private_key_pem,
+            client_wallet_address=stub_server.wallet_address_url("client"),
+            cfg=cfg
+        )
+
+    with client(Configuration()) as op_client:
+        stub_server.fail_next(1)
+        with pytest.raises(httpx.HTTPStatusError):
+            op_client.wallet.get_wallet_address(stub_server.wallet_address_url("bob"))
+
+    cfg = Configuration()
+    cfg.retry_policy = RetryPolicy(max_retries=1, backoff_factor=0)
+    with client(cfg) as op_client:
+        grant = op_client.grants.post_grant_request(
+            GrantRequest.model_validate({
+                "access_token": {"access": [{"type": "incoming-payment", "actions": ["create"]}]},
+                "client": op_client.client_wallet_address
+            }),
+            stub_server.auth_server
+        )
+        stub_server.fail_next(1)
+        sent = stub_server.requests
+        payment = op_client.incoming_payments.post_create_payment(
+            IncomingPaymentRequest(walletAddress=stub_server.wallet_address_url("bob"), incomingAmount=None, expiresAt=None, metadata=None),
+            stub_server.resource_server,
+            grant.root.access_token.value,
+            idempotency_key="create-1"
+        )
+    assert stub_server.requests - sent == 2
+    assert payment.id
+
+
+def test_backoff_honours_retry_after():
+    """
+    Retry-After seconds take precedence over the exponential backoff
+    """
+    policy = RetryPolicy(backoff_factor=1.0, max_backoff=8.0)
+    response = httpx.Response(429, headers={"Retry-After": "3"})
+    assert policy.backoff(0, response) == 3.0
+    assert 0 <= policy.backoff(2) <= 4.0
+
+
+def test_circuit_breaker_fails_fast_and_recovers(flaky_server):
+    """
+    The circuit opens after repeated failures and lets a trial request through later
+    """
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=10.0, clock=lambda: now[0])
+    FlakyHandler.failures = 2
+    with HttpClient(http_timeout=5.0, circuit_breaker=breaker) as http_client:
+        for _ in range(2):
+            with pytest.raises(httpx.HTTPStatusError):
+                http_client.send(http_client.build_request(method="GET", url=flaky_server))
+        with pytest.raises(CircuitOpenError):
+            http_client.send(http_client.build_request(method="GET", url=flaky_server))
+        assert FlakyHandler.seen == 2
+
+        now[0] += 10.0
+        assert http_client.send(http_client.build_request(method="GET", url=flaky_server)).status_code == 200
+        assert breaker.state("127.0.0.1") == CircuitBreaker.CLOSED
+
+
+def test_cancelled_trial_releases_half_open_circuit(http_server_factory, monkeypatch):
+    """
+    A trial request cancelled before its response lets the next request become the trial
+    """
+    monkeypatch.setattr(FlakyHandler, "failures", 0)
+    monkeypatch.setattr(SlowHandler, "delay", 0.5)
+    url = http_server_factory(SlowHandler)
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10.0, clock=lambda: now[0])
+    breaker.record_failure("127.0.0.1")
+    now[0] += 10.0
+
+    async def run():
+        async with AsyncHttpClient(http_timeout=5.0, circuit_breaker=breaker) as http_client:
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(http_client.send(http_client.build_request(method="GET", url=url)), 0.1)
+            assert breaker.state("127.0.0.1") == CircuitBreaker.HALF_OPEN
+            SlowHandler.delay = 0.0
+            return await http_client.send(http_client.build_request(method="GET", url=url))
+
+    assert asyncio.run(run()).status_code == 200
+    assert breaker.state("127.0.0.1") == CircuitBreaker.CLOSED
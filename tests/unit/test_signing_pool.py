@@ -0,0 +1,99 @@
+"""
+Unit Tests for the parallel signing pool
+"""
+import asyncio
+
+from open_payments_sdk.client.client import OpenPaymentsClient
+from open_payments_sdk.configuration import Configuration
+from open_payments_sdk.gnap_utils.signing_pool import SigningPool
+from open_payments_sdk.gnap_utils.verification import SignatureVerifier
+from open_payments_sdk.models.auth import GrantRequest
+from open_payments_sdk.models.resource import IncomingPaymentRequest, QuoteRequest
+from open_payments_sdk.utils.instrumentation import Instrumentation
+from open_payments_sdk.utils.utils import AUTHORIZED_COMPONENTS
+
+
+def test_pool_signatures_verify(stub_client, stub_key_pair):
+    """
+    Requests signed by worker processes verify and keep their order; one that cannot be signed fails alone
+    """
+    quotes = stub_client.quotes
+    requests = [quotes._build_get_quote(str(i), "https://rs.example", "token") for i in range(10)]
+    for request in requests:
+        request.headers["Authorization"] = "GNAP token"
+    del requests[4].headers["Authorization"]
+    verifier = SignatureVerifier()
+    verifier.key_cache.add_key_set(stub_key_pair.jwks)
+
+    with SigningPool(stub_client.signing_context, workers=2, chunk_size=3) as pool:
+        signed = pool.sign(requests, AUTHORIZED_COMPONENTS)
+        signed_async = asyncio.run(pool.sign_async(requests[:2], AUTHORIZED_COMPONENTS))
+
+    assert isinstance(signed[4], KeyError)
+    del signed[4]
+    assert [str(request.url) for request in signed] == [f"https://rs.example/quotes/{i}" for i in range(10) if i != 4]
+    for request in signed + signed_async:
+        verifier.verify(request)
+
+
+def test_batch_signs_on_pool(stub_server, stub_key_pair, monkeypatch):
+    """
+    The batch API builds, pool-signs and sends quotes the stub server accepts and records their calls;
+    a failed signature fails its item only
+    """
+    cfg = Configuration()
+    cfg.signing_workers = 2
+    calls = []
+    cfg.instrumentation = Instrumentation(hooks=[calls.append])
+    with OpenPaymentsClient(
+        keyid=stub_key_pair.jwks.keys[0].kid,
+        private_key=stub_key_pair.private_key_pem,
+        client_wallet_address=stub_server.wallet_address_url("client"),
+        cfg=cfg
+    ) as client:
+        alice = stub_server.wallet_address_url("alice")
+        grant = client.grants.post_grant_request(
+            GrantRequest.model_validate({
+                "access_token": {"access": [
+                    {"type": "incoming-payment", "actions": ["create"]},
+                    {"type": "quote", "actions": ["create"]}
+                ]},
+                "client": client.client_wallet_address
+            }),
+            stub_server.auth_server
+        ).root
+        incoming = client.incoming_payments.post_create_payment(
+            IncomingPaymentRequest.model_validate({
+                "walletAddress": stub_server.wallet_address_url("bob"), "incomingAmount": None, "expiresAt": None, "metadata": None
+            }),
+            stub_server.resource_server,
+            grant.access_token.value
+        )
+        quotes = [
+            QuoteRequest.model_validate({
+                "walletAddress": alice,
+                "receiver": str(incoming.id),
+                "method": "ilp",
+                "debitAmount": {"value": str(100 + i), "assetCode": "USD", "assetScale": 2}
+            })
+            for i in range(6)
+        ]
+        result = client.batch.create_quotes(quotes, stub_server.resource_server, grant.access_token.value)
+        sign = client.signing_pool.sign
+
+        def sign_without_digest(requests, covered_components):
+            del requests[2].headers["Content-Digest"]
+            return sign(requests, covered_components)
+
+        monkeypatch.setattr(client.signing_pool, "sign", sign_without_digest)
+        partial = client.batch.create_quotes(quotes, stub_server.resource_server, grant.access_token.value)
+
+    assert result.stats.succeeded == 6, result.errors
+    assert [quote.debitAmount.value for quote in result.results] == [str(100 + i) for i in range(6)]
+    assert [item.index for item in partial.errors] == [2]
+    assert isinstance(partial.errors[0].error, KeyError)
+    assert partial.stats.succeeded == 5
+    quote_calls = [call for call in calls if call.endpoint == "quotes.create"]
+    assert len(quote_calls) == 12
+    assert all(set(call.phases) == {"build", "digest", "sign", "send", "parse"} for call in quote_calls[:6])
+    assert sum(call.error is not None for call in quote_calls) == 1
@@ -0,0 +1,181 @@
+"""
+Unit Tests for single-flight coalescing of identical in-flight calls
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from open_payments_sdk.client.async_client import AsyncOpenPaymentsClient
+from open_payments_sdk.client.client import OpenPaymentsClient
+from open_payments_sdk.configuration import Configuration
+from open_payments_sdk.utils.single_flight import SingleFlight, coalesced
+
+
+class FakeQuotes:
+    """
+    Counts calls that reach the server
+    """
+    def __init__(self, single_flight):
+        self.single_flight = single_flight
+        self.sent = []
+
+    @coalesced
+    def get_quote(self, quote_id, resource_server_endpoint, access_token):
+        self.sent.append((quote_id, access_token))
+        time.sleep(0.05)
+        if quote_id == "bad":
+            raise ValueError(quote_id)
+        return {"id": quote_id}
+
+    @coalesced
+    async def aget_quote(self, quote_id, resource_server_endpoint, access_token):
+        self.sent.append((quote_id, access_token))
+        await asyncio.sleep(0.05)
+        return {"id": quote_id}
+
+
+def test_threads_share_identical_calls():
+    """
+    Concurrent identical calls share one call, result and error; other tokens do not
+    """
+    quotes = FakeQuotes(SingleFlight())
+    calls = [("q1", "t1")] * 6 + [("q1", "t2")] * 2 + [("bad", "t1")] * 3
+    barrier = threading.Barrier(len(calls))
+
+    def call(args):
+        barrier.wait()
+        try:
+            return quotes.get_quote(args[0], "https://rs.example", args[1])
+        except ValueError as exc:
+            return exc
+
+    with ThreadPoolExecutor(max_workers=len(calls)) as executor:
+        results = list(executor.map(call, calls))
+
+    assert sorted(quotes.sent) == [("bad", "t1"), ("q1", "t1"), ("q1", "t2")]
+    assert all(result is results[0] for result in results[:6])
+    assert len({id(result) for result in results[8:]}) == 1
+    stats = quotes.single_flight.stats()
+    assert (stats.calls, stats.coalesced, stats.in_flight) == (11, 8, 0)
+    quotes.get_quote("q1", "https://rs.example", "t1")
+    assert len(quotes.sent) == 4
+
+
+def test_coroutines_share_identical_calls():
+    """
+    Identical coroutines share one call; a cancelled owner does not fail the others
+    """
+    quotes = FakeQuotes(SingleFlight())
+
+    async def main():
+        results = await asyncio.gather(*(quotes.aget_quote("q1", "https://rs.example", "t1") for _ in range(5)))
+        owner = asyncio.ensure_future(quotes.aget_quote("q2", "https://rs.example", "t1"))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(quotes.aget_quote("q2", "https://rs.example", "t1"))
+        await asyncio.sleep(0)
+        owner.cancel()
+        return results, await follower
+
+    results, follower = asyncio.run(main())
+    assert all(result is results[0] for result in results)
+    assert follower == {"id": "q2"}
+    assert quotes.sent == [("q1", "t1"), ("q2", "t1"), ("q2", "t1")]
+    assert quotes.single_flight.stats().coalesced == 5
+
+
+def test_keys_bind_arguments():
+    """
+    Positional and keyword calls share a key; unhashable arguments are called directly
+    """
+    quotes = FakeQuotes(SingleFlight())
+    calls = [
+        lambda: quotes.get_quote("q1", "https://rs.example", "t1"),
+        lambda: quotes.get_quote("q1", resource_server_endpoint="https://rs.example", access_token="t1"),
+        lambda: quotes.get_quote(quote_id="q1", access_token="t1", resource_server_endpoint="https://rs.example"),
+        lambda: quotes.get_quote("q2", "https://rs.example", ["t1"]),
+    ]
+    barrier = threading.Barrier(len(calls))
+
+    def call(index):
+        barrier.wait()
+        return calls[index]()
+
+    with ThreadPoolExecutor(max_workers=len(calls)) as executor:
+        results = list(executor.map(call, range(len(calls))))
+
+    assert results[:3] == [{"id": "q1"}] * 3 and results[3] == {"id": "q2"}
+    assert sorted(call[0] for call in quotes.sent) == ["q1", "q2"]
+
+
+def test_event_loops_do_not_share_calls():
+    """
+    Coroutines on different event loops never wait for each other's futures
+    """
+    quotes = FakeQuotes(SingleFlight())
+    barrier = threading.Barrier(2)
+
+    def run(_):
+        async def main():
+            barrier.wait()
+            return await quotes.aget_quote("q1", "https://rs.example", "t1")
+        return asyncio.run(main())
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = list(executor.map(run, range(2)))
+
+    assert results == [{"id": "q1"}] * 2
+    assert len(quotes.sent) == 2
+    assert quotes.single_flight.stats().in_flight == 0
+
+
+@pytest.mark.parametrize("enabled", [False, True])
+def test_client_coalesces_gets_against_stub(stub_server, stub_key_pair, enabled):
+    """
+    With cfg.coalesce_requests, concurrent wallet and quote lookups are sent once
+    """
+    cfg = Configuration()
+    cfg.coalesce_requests = enabled
+    stub_server.latency = 0.05
+    with OpenPaymentsClient(
+        keyid=stub_key_pair.jwks.keys[0].kid,
+        private_key=stub_key_pair.private_key_pem,
+        client_wallet_address=stub_server.wallet_address_url("client"),
+        cfg=cfg
+    ) as client:
+        alice = stub_server.wallet_address_url("alice")
+        sent = stub_server.requests
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            wallets = list(executor.map(lambda _: client.wallet.get_wallet_address(alice), range(4)))
+        assert stub_server.requests - sent == (1 if enabled else 4)
+        assert len({str(wallet.id) for wallet in wallets}) == 1
+        # every caller gets its own model, so one caller cannot change another's result
+        assert len({id(wallet) for wallet in wallets}) == 4
+        assert (client.single_flight is not None) == enabled
+
+
+def test_async_client_coalesces_gets_against_stub(stub_server, stub_key_pair):
+    """
+    The async client coalesces concurrent identical lookups on its event loop
+    """
+    cfg = Configuration()
+    cfg.coalesce_requests = True
+    stub_server.latency = 0.05
+
+    async def main():
+        async with AsyncOpenPaymentsClient(
+            keyid=stub_key_pair.jwks.keys[0].kid,
+            private_key=stub_key_pair.private_key_pem,
+            client_wallet_address=stub_server.wallet_address_url("client"),
+            cfg=cfg
+        ) as client:
+            bob = stub_server.wallet_address_url("bob")
+            await asyncio.gather(*(client.wallet.get_wallet_address(bob) for _ in range(5)))
+            return client.single_flight.stats()
+
+    sent = stub_server.requests
+    stats = asyncio.run(main())
+    assert stub_server.requests - sent == 1
+    assert (stats.calls, stats.coalesced) == (5, 4)
@@ -0,0 +1,121 @@
+"""
+Unit Tests for the bundled stub Open Payments server
+"""
+import httpx
+import pytest
+
+from open_payments_sdk.models.auth import GrantRequest, InteractRef
+from open_payments_sdk.models.resource import (IncomingPaymentRequest,
+                                               OutgoingPaymentRequest,
+                                               PaymentListQuery, QuoteRequest)
+from open_payments_sdk.testing.stub_server import StubOpenPaymentsServer
+
+
+def _grant(stub_client, stub_server, access, interact=False):
+    request = {"access_token": {"access": access}, "client": stub_client.client_wallet_address}
+    if interact:
+        request["interact"] = {"start": ["redirect"]}
+    return stub_client.grants.post_grant_request(GrantRequest.model_validate(request), stub_server.auth_server).root
+
+
+def test_payment_flow_against_stub(stub_client, stub_server):
+    """
+    Incoming payment, quote and interactive outgoing payment grant end to end
+    """
+    alice = stub_client.wallet.get_wallet_address(stub_server.wallet_address_url("alice"))
+    bob = stub_client.wallet.get_wallet_address(stub_server.wallet_address_url("bob"))
+    assert bob.assetCode.root == "EUR"
+
+    incoming_token = _grant(stub_client, stub_server, [{"type": "incoming-payment", "actions": ["create", "read", "list"]}]).access_token.value
+    incoming = stub_client.incoming_payments.post_create_payment(
+        IncomingPaymentRequest.model_validate({
+            "walletAddress": str(bob.id),
+            "incomingAmount": {"value": "500", "assetCode": "EUR", "assetScale": 2},
+            "expiresAt": None,
+            "metadata": None
+        }),
+        str(bob.resourceServer),
+        incoming_token
+    )
+
+    quote_token = _grant(stub_client, stub_server, [{"type": "quote", "actions": ["create", "read"]}]).access_token.value
+    quote = stub_client.quotes.post_create_quote(
+        QuoteRequest.model_validate({"walletAddress": str(alice.id), "receiver": str(incoming.id), "method": "ilp"}),
+        str(alice.resourceServer),
+        quote_token
+    )
+    assert quote.debitAmount.value == "500"
+
+    pending = _grant(stub_client, stub_server, [{
+        "type": "outgoing-payment", "actions": ["create", "read"], "identifier": str(alice.id)
+    }], interact=True)
+    interact_ref = stub_server.approve_grant(str(pending.cont.uri))
+    granted = stub_client.grants.post_grant_continuation_request(
+        InteractRef(interact_ref=interact_ref), str(pending.cont.uri), pending.cont.access_token.value
+    )
+    payment = stub_client.outgoing_payments.post_create_payment(
+        OutgoingPaymentRequest.model_validate({"walletAddress": str(alice.id), "quoteId": str(quote.id), "metadata": None}),
+        str(alice.resourceServer),
+        granted.access_token.value
+    )
+    assert payment.receiver.root == incoming.id
+    assert payment.debitAmount == quote.debitAmount
+
+
+def test_stub_paginates_and_rotates_tokens(stub_client, stub_server):
+    """
+    Listing walks cursors with the spec's wallet-address parameter; rotated tokens replace the old value
+    """
+    access_token = _grant(stub_client, stub_server, [{"type": "incoming-payment", "actions": ["create", "list"]}]).access_token
+    bob = stub_server.wallet_address_url("bob")
+    for _ in range(5):
+        stub_client.incoming_payments.post_create_payment(
+            IncomingPaymentRequest(walletAddress=bob, incomingAmount=None, expiresAt=None, metadata=None),
+            stub_server.resource_server,
+            access_token.value
+        )
+    request = stub_client.incoming_payments._build_list_payments(PaymentListQuery(walletAddress=bob), stub_server.resource_server, access_token.value)
+    assert request.url.params["wallet-address"] == bob
+    token_id = str(access_token.manage).rpartition("/")[2]
+    rotated = stub_client.access_tokens.post_rotate_access_token(token_id, stub_server.auth_server, access_token.value)
+
+    payments = list(stub_client.incoming_payments.iter_incoming_payments(
+        PaymentListQuery(walletAddress=bob, first=2), stub_server.resource_server, rotated.value
+    ))
+    assert len({str(payment.id) for payment in payments}) == 5
+    with pytest.raises(httpx.HTTPStatusError) as exc_info:
+        stub_client.incoming_payments.get_incoming_payments(PaymentListQuery(walletAddress=bob), stub_server.resource_server, access_token.value)
+    assert exc_info.value.response.status_code == 401
+
+
+def test_stub_rejects_bad_signatures_and_digests(stub_client, stub_server):
+    """
+    Unsigned requests and tampered bodies are refused
+    """
+    grants = stub_client.grants
+    request = grants._build_grant_request(
+        GrantRequest.model_validate({"access_token": {"access": [{"type": "quote", "actions": ["create"]}]}, "client": "https://client.example"}),
+        stub_server.auth_server
+    )
+    tampered = httpx.Request("POST", request.url, headers=request.headers, content=request.content.replace(b"create", b"delete"))
+    headers = {name: value for name, value in request.headers.items() if not name.startswith("signature")}
+    unsigned = httpx.Request("POST", request.url, headers=headers, content=request.content)
+
+    with httpx.Client() as client:
+        assert client.send(tampered).status_code == 400
+        assert client.send(unsigned).status_code == 401
+    assert stub_server.rejected_requests == 2
+
+
+def test_stub_injects_errors_in_process(stub_key_pair):
+    """
+    The stub works as a MockTransport handler and injects failures on demand
+    """
+    stub = StubOpenPaymentsServer(seed=1)
+    stub.add_wallet_address("alice", jwks=stub_key_pair.jwks)
+    stub.fail_next(2, status=503)
+    with httpx.Client(transport=stub.transport()) as client:
+        statuses = [client.get(stub.wallet_address_url("alice")).status_code for _ in range(3)]
+        assert client.get(f"{stub.wallet_address_url('alice')}/jwks.json").json()["keys"][0]["kid"] == stub_key_pair.jwks.keys[0].kid
+    assert statuses == [503, 503, 200]
+    assert stub.injected_errors == 2
@@ -0,0 +1,62 @@
+"""
+Unit Tests for precompiled request templates
+"""
+from http_message_signatures import HTTPMessageVerifier, algorithms
+
+from open_payments_sdk.gnap_utils.http_signatures import PatchedHTTPSignatureComponentResolver
+from open_payments_sdk.models.resource import QuoteRequest
+
+
+def test_template_requests_verify(op_client, keyid_private_key):
+    """
+    Template-signed requests carry the same headers as before and verify with the library
+    """
+    quotes = op_client.quotes
+    request = quotes._build_create_quote(
+        QuoteRequest.model_validate({
+            "walletAddress": "https://rs.example/alice",
+            "receiver": "https://rs.example/incoming-payments/1",
+            "method": "ilp"
+        }),
+        "https://rs.example/",
+        "token",
+        idempotency_key="key-1"
+    )
+    verifier = HTTPMessageVerifier(
+        signature_algorithm=algorithms.ED25519,
+        key_resolver=op_client.signing_context.key_resolver,
+        component_resolver_class=PatchedHTTPSignatureComponentResolver
+    )
+
+    result = verifier.verify(request)[0]
+    assert str(request.url) == "https://rs.example/quotes"
+    assert request.headers["Authorization"] == "GNAP token"
+    assert request.headers["Idempotency-Key"] == "key-1"
+    assert request.headers["Content-Type"] == "application/json"
+    assert request.headers["Signature-Input"].startswith(
+        'sig1=("content-type" "content-digest" "content-length" "authorization" "@method" "@target-uri" "idempotency-key");created='
+    )
+    assert result.parameters["keyid"] == keyid_private_key["keyid"]
+
+
+def test_templates_are_compiled_once_per_endpoint(op_client):
+    """
+    Templates are reused per endpoint, with or without a trailing slash
+    """
+    quotes = op_client.quotes
+    first = quotes._build_get_quote("1", "https://rs.example", "token")
+    quotes._build_get_quote("2", "https://rs.example", "token")
+    quotes._build_get_quote("3", "https://other.example/", "token")
+
+    assert str(first.url) == "https://rs.example/quotes/1"
+    assert len(quotes._templates) == 2
+    assert quotes._templates[("get", "https://other.example/")].url == "https://other.example/quotes/"
+
+
+def test_grant_requests_use_the_advertised_url(op_client, grant_req_dto):
+    """
+    Grant requests go to the auth server URL exactly as advertised, trailing slash included
+    """
+    for auth_server in ("https://auth.example/tenant/", "https://auth.example"):
+        request = op_client.grants._build_grant_request(grant_req_dto, auth_server)
+        assert str(request.url) == auth_server
@@ -0,0 +1,148 @@
+"""
+Unit Tests for the access token manager
+"""
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from open_payments_sdk.api.tokens import AccessTokenManager, AsyncAccessTokenManager
+from open_payments_sdk.gnap_utils.security import SecurityBase
+from open_payments_sdk.models.auth import AccessToken
+
+ACCESS = [{"type": "quote", "actions": ["create", "read"]}]
+
+
+def make_token(value: str, expires_in: int = 600) -> AccessToken:
+    """
+    Build an access token as returned by the auth server
+    """
+    return AccessToken(
+        value=value,
+        manage=f"https://auth.example/token/{value}",
+        expires_in=expires_in,
+        access=ACCESS
+    )
+
+
+class FakeAccessTokens:
+    """
+    Records rotation calls instead of reaching an auth server
+    """
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def post_rotate_access_token(self, token_id, auth_server_endpoint, access_token):
+        with self.lock:
+            self.calls.append((token_id, auth_server_endpoint, access_token))
+            count = len(self.calls)
+        time.sleep(self.delay)
+        return make_token(f"rotated-{count}")
+
+
+class FakeAsyncAccessTokens(FakeAccessTokens):
+    async def post_rotate_access_token(self, token_id, auth_server_endpoint, access_token):
+        self.calls.append((token_id, auth_server_endpoint, access_token))
+        await asyncio.sleep(self.delay)
+        return make_token(f"rotated-{len(self.calls)}")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_expired_token_rotated_once_for_concurrent_callers():
+    """
+    Concurrent callers of an expired token share one rotation
+    """
+    access_tokens = FakeAccessTokens(delay=0.2)
+    clock = FakeClock()
+    manager = AccessTokenManager(access_tokens, logger=logging.getLogger(__name__), clock=clock)
+    handle = manager.register(make_token("initial"))
+    assert handle.value == "initial"
+
+    clock.now += 590
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        values = list(executor.map(lambda _: handle.value, range(8)))
+    manager.close()
+
+    assert values == ["rotated-1"] * 8
+    assert access_tokens.calls == [("initial", "https://auth.example", "initial")]
+
+
+def test_background_rotation_ahead_of_expiry():
+    """
+    Tokens are rotated in the background before they expire
+    """
+    access_tokens = FakeAccessTokens()
+    manager = AccessTokenManager(access_tokens, logger=logging.getLogger(__name__), rotate_before=30.0)
+    handle = manager.register(make_token("short", expires_in=0))
+    deadline = time.monotonic() + 2
+    while not access_tokens.calls and time.monotonic() < deadline:
+        time.sleep(0.01)
+    manager.close()
+    assert access_tokens.calls
+    assert handle.access_token.value.startswith("rotated-")
+
+
+def test_managed_token_in_auth_header(keyid_private_key):
+    """
+    Managed tokens can be passed where access token strings are expected
+    """
+    manager = AccessTokenManager(FakeAccessTokens(), logger=logging.getLogger(__name__))
+    handle = manager.register(make_token("abc"))
+    security = SecurityBase(
+        keyid=keyid_private_key["keyid"],
+        private_key=keyid_private_key["private_key"],
+        logger=logging.getLogger(__name__)
+    )
+    assert security.get_auth_header(access_token=handle) == {"Authorization": "GNAP abc"}
+    manager.close()
+
+
+def test_late_caller_does_not_rotate_again():
+    """
+    A caller that decided to rotate before another rotation finished gets the new token
+    """
+    access_tokens = FakeAccessTokens()
+    manager = AccessTokenManager(access_tokens, logger=logging.getLogger(__name__), clock=FakeClock())
+    handle = manager.register(make_token("initial"))
+    generation = handle.generation
+    manager.rotate(handle)
+
+    assert manager.rotate(handle, generation).value == "rotated-1"
+    assert len(access_tokens.calls) == 1
+    manager.close()
+
+
+def test_async_manager_rotates_once():
+    """
+    The async manager shares concurrent rotations and rotates in the background
+    """
+    access_tokens = FakeAsyncAccessTokens(delay=0.05)
+    clock = FakeClock()
+
+    async def main():
+        manager = AsyncAccessTokenManager(access_tokens, logger=logging.getLogger(__name__), clock=clock)
+        handle = manager.register(make_token("initial"))
+        clock.now += 590
+        values = await asyncio.gather(*(manager.get_value(handle) for _ in range(5)))
+        background = manager.register(make_token("short", expires_in=0))
+        for _ in range(100):
+            if background.generation:
+                break
+            await asyncio.sleep(0.01)
+        await manager.aclose()
+        return values, str(handle), str(background)
+
+    values, value, background = asyncio.run(main())
+    assert values == ["rotated-1"] * 5 and value == "rotated-1"
+    assert background == "rotated-2"
+    assert access_tokens.calls[0] == ("initial", "https://auth.example", "initial")
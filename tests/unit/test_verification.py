@@ -0,0 +1,139 @@
+"""
+Unit Tests for HTTP signature verification
+"""
+import asyncio
+import json
+
+import httpx
+import pytest
+from http_message_signatures import InvalidSignature
+
+from open_payments_sdk.client.async_client import AsyncOpenPaymentsClient
+from open_payments_sdk.gnap_utils.verification import PublicKeyCache, SignatureVerifier
+from open_payments_sdk.models.auth import GrantRequest
+
+
+def _signed_request(stub_client, stub_server) -> httpx.Request:
+    return stub_client.grants._build_grant_request(
+        GrantRequest.model_validate({
+            "access_token": {"access": [{"type": "quote", "actions": ["create"]}]},
+            "client": stub_client.client_wallet_address
+        }),
+        stub_server.auth_server
+    )
+
+
+def test_verifier_fetches_keys_once(stub_client, stub_server):
+    """
+    The sender's key set is fetched on the first miss, later messages verify offline
+    """
+    verifier = stub_client.signature_verifier
+    wallet_address = stub_server.wallet_address_url("client")
+    result = verifier.verify(_signed_request(stub_client, stub_server), wallet_address=wallet_address)
+    requests = stub_server.requests
+    for _ in range(5):
+        verifier.verify(_signed_request(stub_client, stub_server), wallet_address=wallet_address)
+
+    assert result.parameters["keyid"] == stub_client.keyid
+    assert stub_server.requests == requests
+
+
+def test_key_cache_is_scoped_by_wallet(stub_client, stub_server, stub_key_pair):
+    """
+    Keys of one wallet do not verify messages from another, expire and must be OKP/Ed25519
+    """
+    now = [0.0]
+    cache = PublicKeyCache(ttl=60, clock=lambda: now[0])
+    alice = stub_server.wallet_address_url("alice")
+    cache.add_key_set(stub_key_pair.jwks, wallet_address=alice)
+    request = _signed_request(stub_client, stub_server)
+    verifier = SignatureVerifier(key_cache=cache)
+
+    assert verifier.verify(request, wallet_address=alice).parameters["keyid"] == stub_client.keyid
+    with pytest.raises(InvalidSignature):
+        verifier.verify(request, wallet_address=stub_server.wallet_address_url("mallory"))
+    with pytest.raises(InvalidSignature):
+        verifier.verify(request)
+    now[0] = 61
+    assert (alice, stub_client.keyid) not in cache
+
+    jwk = stub_key_pair.jwks.keys[0].model_dump(mode="json")
+    with pytest.raises(ValueError):
+        cache.add_key({**jwk, "kty": "EC", "crv": "P-256"}, wallet_address=alice)
+    cache.add_key_set({"keys": [{**jwk, "crv": "X25519"}]}, wallet_address=alice)
+    assert (alice, stub_client.keyid) not in cache
+
+
+def test_verifier_rejects_tampering(stub_client, stub_server, stub_key_pair):
+    """
+    Changed bodies, unknown keys and uncovered digests fail verification
+    """
+    verifier = SignatureVerifier()
+    verifier.key_cache.add_key_set(stub_key_pair.jwks)
+    request = _signed_request(stub_client, stub_server)
+    verifier.verify(request)
+
+    tampered = httpx.Request("POST", request.url, headers=request.headers, content=request.content.replace(b"create", b"delete"))
+    with pytest.raises(InvalidSignature):
+        verifier.verify(tampered)
+    with pytest.raises(InvalidSignature):
+        SignatureVerifier().verify(request)
+
+    unsigned_digest = stub_client.grants.set_content_digest(httpx.Request("POST", request.url, json={"a": 1}))
+    stub_client.grants.sign_request(unsigned_digest, ("@method", "@target-uri"))
+    with pytest.raises(InvalidSignature):
+        verifier.verify(unsigned_digest)
+
+
+def test_verifier_checks_responses(stub_client, stub_key_pair):
+    """
+    Signed responses verify against the signer's public key
+    """
+    body = json.dumps({"ok": True}).encode("utf-8")
+    response = httpx.Response(200, content=body, request=httpx.Request("GET", "https://rs.example/quotes/1"))
+    stub_client.grants.set_content_digest(response)
+    stub_client.grants.sign_request(response, ("@status", "content-digest"))
+    verifier = SignatureVerifier()
+    verifier.key_cache.add_key_set(stub_key_pair.jwks)
+
+    assert verifier.verify(response).label == "sig1"
+
+
+def test_async_verifier_fetches_keys(stub_server, stub_key_pair):
+    """
+    The async client's verifier awaits the wallet key set lookup
+    """
+    async def run():
+        async with AsyncOpenPaymentsClient(
+            keyid=stub_key_pair.jwks.keys[0].kid,
+            private_key=stub_key_pair.private_key_pem,
+            client_wallet_address=stub_server.wallet_address_url("client")
+        ) as client:
+            request = client.grants._build_grant_request(
+                GrantRequest.model_validate({"access_token": {"access": [{"type": "quote", "actions": ["create"]}]}, "client": client.client_wallet_address}),
+                stub_server.auth_server
+            )
+            return await client.signature_verifier.verify(request, wallet_address=client.client_wallet_address)
+
+    assert asyncio.run(run()).parameters["keyid"] == stub_key_pair.jwks.keys[0].kid
+
+
+def test_unknown_keys_do_not_refetch_key_sets(stub_client, stub_server):
+    """
+    Messages naming an unknown key fetch the sender's key set at most once per refetch interval
+    """
+    now = [0.0]
+    verifier = SignatureVerifier(stub_client.wallet, PublicKeyCache(clock=lambda: now[0]), refetch_interval=30)
+    wallet_address = stub_server.wallet_address_url("client")
+    request = _signed_request(stub_client, stub_server)
+    request.headers["Signature-Input"] = request.headers["Signature-Input"].replace(stub_client.keyid, "unknown")
+    requests = stub_server.requests
+    for _ in range(5):
+        with pytest.raises(InvalidSignature):
+            verifier.verify(request, wallet_address=wallet_address)
+    assert stub_server.requests - requests == 1
+
+    now[0] = 30
+    with pytest.raises(InvalidSignature):
+        verifier.verify(request, wallet_address=wallet_address)
+    assert stub_server.requests - requests == 2
@@ -0,0 +1,126 @@
+"""
+Unit Tests for wallet address and JWKS caching
+"""
+import json
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from open_payments_sdk.api.wallet import Wallet
+from open_payments_sdk.client.client import OpenPaymentsClient
+from open_payments_sdk.configuration import Configuration
+from open_payments_sdk.http import HttpClient
+from open_payments_sdk.utils.cache import TTLCache
+
+
+class WalletHandler(BaseHTTPRequestHandler):
+    """
+    Wallet address server answering with caching headers
+    """
+    protocol_version = "HTTP/1.1"
+    requests = []
+    cache_control = "max-age=60"
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        WalletHandler.requests.append((self.path, self.headers.get("If-None-Match")))
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.send_header("ETag", '"v1"')
+            self.send_header("Cache-Control", self.cache_control)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        host = f"http://{self.headers['Host']}"
+        if self.path.endswith("/jwks.json"):
+            payload = {"keys": [{"kid": "k1", "alg": "EdDSA", "kty": "OKP", "crv": "Ed25519", "x": "abc"}]}
+        else:
+            payload = {
+                "id": f"{host}{self.path}",
+                "assetCode": "USD",
+                "assetScale": 2,
+                "authServer": f"{host}/auth",
+                "resourceServer": host
+            }
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", '"v1"')
+        self.send_header("Cache-Control", self.cache_control)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_wallet_address_served_from_cache_and_revalidated(http_server_factory):
+    """
+    Fresh entries skip the network; stale entries are revalidated with If-None-Match
+    """
+    WalletHandler.requests = []
+    base_url = http_server_factory(WalletHandler)
+    clock = FakeClock()
+    cache = TTLCache(max_size=10, clock=clock)
+    wallet = Wallet(HttpClient(http_timeout=5.0), cache=cache)
+
+    first = wallet.get_wallet_address(f"{base_url}/alice")
+    assert wallet.get_wallet_address(f"{base_url}/alice") is first
+    assert len(WalletHandler.requests) == 1
+
+    clock.now += 61
+    assert wallet.get_wallet_address(f"{base_url}/alice") is first
+    assert WalletHandler.requests[-1] == ("/alice", '"v1"')
+
+    wallet.get_keys(f"{base_url}/alice")
+    wallet.get_keys(f"{base_url}/alice")
+    stats = cache.stats()
+    assert stats.hits == 2
+    assert stats.misses == 3
+    assert stats.revalidations == 1
+    assert stats.size == 2
+    wallet.http_client.close()
+
+
+def test_cache_is_bounded():
+    """
+    Least recently used entries are evicted beyond max_size
+    """
+    class Response:
+        headers = {}
+
+    cache = TTLCache(max_size=2)
+    for key in ("a", "b", "c"):
+        cache.store(key, key, Response())
+    assert cache.lookup("a") is None
+    assert cache.lookup("c").value == "c"
+    assert cache.stats().evictions == 1
+
+
+@pytest.mark.parametrize("size", [0, 16])
+def test_client_wallet_cache_is_opt_in(stub_server, stub_key_pair, size):
+    """
+    Clients only cache wallet addresses when cfg.wallet_cache_size is set
+    """
+    cfg = Configuration()
+    cfg.wallet_cache_size = size
+    with OpenPaymentsClient(
+        keyid=stub_key_pair.jwks.keys[0].kid,
+        private_key=stub_key_pair.private_key_pem,
+        client_wallet_address=stub_server.wallet_address_url("client"),
+        cfg=cfg
+    ) as client:
+        alice = stub_server.wallet_address_url("alice")
+        sent = stub_server.requests
+        client.wallet.get_wallet_address(alice)
+        client.wallet.get_wallet_address(alice)
+        assert stub_server.requests - sent == (2 if size == 0 else 1)
+        assert (client.wallet_cache is not None) == bool(size)